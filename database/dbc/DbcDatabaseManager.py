@@ -1,4 +1,5 @@
 import os
+import threading
 from collections import defaultdict
 from typing import Optional
 
@@ -9,6 +10,7 @@ from database.dbc.DbcModels import *
 from game.world.managers.objects.locks.LockHolder import LockHolder
 from utils.ConfigManager import *
 from utils.constants.SpellCodes import SpellImplicitTargets
+from utils.constants.UnitCodes import UnitReaction
 
 
 DB_USER = os.getenv('MYSQL_USERNAME', config.Database.Connection.username)
@@ -21,17 +23,87 @@ dbc_db_engine = create_engine(f'mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST
 SessionHolder = scoped_session(sessionmaker(bind=dbc_db_engine, autoflush=True))
 
 
+# Secondary indexes built over cached DBC tables, as column names per model.
+DBC_INDEXES = {
+    AreaTable: [('AreaNumber', 'ContinentID'), ('AreaName_enUS',)],
+    CharStartOutfit: [('RaceID', 'ClassID', 'GenderID')],
+    ItemSubClass: [('ClassID', 'SubClassID')],
+    TaxiPath: [('FromTaxiNode', 'ToTaxiNode')],
+}
+
+
 # noinspection PyUnresolvedReferences
 class DbcDatabaseManager:
-    # ChrRaces
+    # DBC tables
+
+    # DBC data is read-only, every table is loaded once (at startup through WorldLoader, or lazily upon first access
+    # in processes not loading world data) and served from memory afterwards.
+    class DbcTableHolder:
+        # Rows by primary key, per model.
+        ROWS: dict[type, dict[int, Base]] = {}
+        # Secondary indexes by (model, columns), each key points to its first row by primary key.
+        INDEXES: dict[tuple[type, tuple], dict[tuple, Base]] = {}
+        LOAD_LOCK = threading.RLock()
+
+        @staticmethod
+        def load_table(model, rows):
+            holder = DbcDatabaseManager.DbcTableHolder
+            with holder.LOAD_LOCK:
+                table_rows = {row.ID: row for row in rows}
+                for columns in DBC_INDEXES.get(model, []):
+                    index = {}
+                    for row in table_rows.values():
+                        index.setdefault(tuple(getattr(row, column) for column in columns), row)
+                    holder.INDEXES[(model, columns)] = index
+                holder.ROWS[model] = table_rows
+
+        @staticmethod
+        def get_rows(model) -> dict:
+            holder = DbcDatabaseManager.DbcTableHolder
+            rows = holder.ROWS.get(model)
+            if rows is None:
+                with holder.LOAD_LOCK:
+                    if model not in holder.ROWS:
+                        holder.load_table(model, DbcDatabaseManager.dbc_table_get_all(model))
+                    rows = holder.ROWS[model]
+            return rows
+
+        @staticmethod
+        def get_by_id(model, id_):
+            return DbcDatabaseManager.DbcTableHolder.get_rows(model).get(id_)
+
+        @staticmethod
+        def get_by_index(model, columns, *key):
+            holder = DbcDatabaseManager.DbcTableHolder
+            holder.get_rows(model)
+            return holder.INDEXES[(model, columns)].get(key)
 
     @staticmethod
-    def chr_races_get_by_race(race):
+    def dbc_models_get_all():
+        return [mapper.class_ for mapper in Base.registry.mappers if mapper.class_ is not AppliedUpdates]
+
+    @staticmethod
+    def dbc_table_get_all(model):
         dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(ChrRaces).filter_by(ID=race).first()
+        res = dbc_db_session.query(model).order_by(model.ID).all()
         dbc_db_session.close()
         return res
 
+    # Updates
+
+    @staticmethod
+    def applied_updates_get_all():
+        dbc_db_session = SessionHolder()
+        res = dbc_db_session.query(AppliedUpdates.id).all()
+        dbc_db_session.close()
+        return [update_id[0] for update_id in res]
+
+    # ChrRaces
+
+    @staticmethod
+    def chr_races_get_by_race(race):
+        return DbcDatabaseManager.DbcTableHolder.get_by_id(ChrRaces, race)
+
     # CharBaseInfo
 
     class CharBaseInfoHolder:
@@ -53,65 +125,43 @@ class DbcDatabaseManager:
 
     @staticmethod
     def char_base_info_get_all():
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(CharBaseInfo).all()
-        dbc_db_session.close()
-        return res
+        return list(DbcDatabaseManager.DbcTableHolder.get_rows(CharBaseInfo).values())
 
     # AreaTrigger
 
     @staticmethod
     def area_trigger_get_by_id(trigger_id):
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(AreaTrigger).filter_by(ID=trigger_id).first()
-        dbc_db_session.close()
-        return res
+        return DbcDatabaseManager.DbcTableHolder.get_by_id(AreaTrigger, trigger_id)
 
     # AreaTable
 
     @staticmethod
     def area_get_by_id_and_map_id(area_id, map_id):
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(AreaTable).filter_by(ID=area_id, ContinentID=map_id).first()
-        dbc_db_session.close()
-        return res
+        area = DbcDatabaseManager.DbcTableHolder.get_by_id(AreaTable, area_id)
+        return area if area and area.ContinentID == map_id else None
 
     @staticmethod
     def area_get_by_area_number(area_number, map_id):
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(AreaTable).filter_by(AreaNumber=area_number, ContinentID=map_id).first()
-        dbc_db_session.close()
-        return res
+        return DbcDatabaseManager.DbcTableHolder.get_by_index(AreaTable, ('AreaNumber', 'ContinentID'), area_number,
+                                                             map_id)
 
     @staticmethod
     def area_get_by_id(area_id):
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(AreaTable).filter_by(ID=area_id).first()
-        dbc_db_session.close()
-        return res
+        return DbcDatabaseManager.DbcTableHolder.get_by_id(AreaTable, area_id)
 
     @staticmethod
     def area_get_by_name(area_name):
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(AreaTable).filter_by(AreaName_enUS=area_name).first()
-        dbc_db_session.close()
-        return res
+        return DbcDatabaseManager.DbcTableHolder.get_by_index(AreaTable, ('AreaName_enUS',), area_name)
 
     @staticmethod
     def area_get_all_ids():
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(AreaTable.ID).all()
-        dbc_db_session.close()
-        return [area_id[0] for area_id in res]
+        return list(DbcDatabaseManager.DbcTableHolder.get_rows(AreaTable).keys())
 
     # EmoteText
 
     @staticmethod
     def emote_text_get_by_id(emote_id):
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(EmotesText).filter_by(ID=emote_id).first()
-        dbc_db_session.close()
-        return res
+        return DbcDatabaseManager.DbcTableHolder.get_by_id(EmotesText, emote_id)
 
     # Spell
 
@@ -150,70 +200,43 @@ class DbcDatabaseManager:
 
             return DbcDatabaseManager.SpellHolder.spell_get_rank_by_spell(spell)
 
-    # TODO Caching for all spell database methods?
-
     @staticmethod
     def spell_get_all():
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(Spell).all()
-        dbc_db_session.close()
-        return res
+        return list(DbcDatabaseManager.DbcTableHolder.get_rows(Spell).values())
 
     @staticmethod
     def spell_get_by_name(spell_name):
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(Spell).filter(Spell.Name_enUS.like(f'%{spell_name}%')).all()
-        dbc_db_session.close()
-        return res
+        spell_name = spell_name.lower()
+        return [spell for spell in DbcDatabaseManager.DbcTableHolder.get_rows(Spell).values()
+                if spell_name in (spell.Name_enUS or '').lower()]
 
     @staticmethod
     def spell_cast_time_get_by_id(casting_time_index):
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(SpellCastTimes).filter_by(ID=casting_time_index).first()
-        dbc_db_session.close()
-        return res
+        return DbcDatabaseManager.DbcTableHolder.get_by_id(SpellCastTimes, casting_time_index)
 
     @staticmethod
     def spell_visual_get_by_id(spell_visual_id):
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(SpellVisual).filter_by(ID=spell_visual_id).first()
-        dbc_db_session.close()
-        return res
+        return DbcDatabaseManager.DbcTableHolder.get_by_id(SpellVisual, spell_visual_id)
 
     @staticmethod
     def spell_range_get_by_id(range_index):
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(SpellRange).filter_by(ID=range_index).first()
-        dbc_db_session.close()
-        return res
+        return DbcDatabaseManager.DbcTableHolder.get_by_id(SpellRange, range_index)
 
     @staticmethod
     def spell_duration_get_by_id(duration_index):
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(SpellDuration).filter_by(ID=duration_index).first()
-        dbc_db_session.close()
-        return res
+        return DbcDatabaseManager.DbcTableHolder.get_by_id(SpellDuration, duration_index)
 
     @staticmethod
     def spell_radius_get_by_id(radius_index):
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(SpellRadius).filter_by(ID=radius_index).first()
-        dbc_db_session.close()
-        return res
+        return DbcDatabaseManager.DbcTableHolder.get_by_id(SpellRadius, radius_index)
 
     @staticmethod
     def spell_get_item_enchantment(enchantment_id):
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(SpellItemEnchantment).filter_by(ID=enchantment_id).first()
-        dbc_db_session.close()
-        return res
+        return DbcDatabaseManager.DbcTableHolder.get_by_id(SpellItemEnchantment, enchantment_id)
 
     @staticmethod
     def spell_get_focus_by_id(spell_focus_id):
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(SpellFocusObject).filter_by(ID=spell_focus_id).first()
-        dbc_db_session.close()
-        return res
+        return DbcDatabaseManager.DbcTableHolder.get_by_id(SpellFocusObject, spell_focus_id)
 
     # Skill
 
@@ -231,24 +254,18 @@ class DbcDatabaseManager:
 
     @staticmethod
     def skill_get_all():
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(SkillLine).all()
-        dbc_db_session.close()
-        return res
+        return list(DbcDatabaseManager.DbcTableHolder.get_rows(SkillLine).values())
 
     @staticmethod
     def skill_get_by_type(skill_type):
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(SkillLine).filter_by(SkillType=skill_type).all()
-        dbc_db_session.close()
-        return res
+        return [skill for skill in DbcDatabaseManager.DbcTableHolder.get_rows(SkillLine).values()
+                if skill.SkillType == skill_type]
 
     @staticmethod
     def skill_get_by_name(skill_type):
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(SkillLine).filter(SkillLine.DisplayName_enUS.like(f'%{skill_type}%')).all()
-        dbc_db_session.close()
-        return res
+        skill_type = skill_type.lower()
+        return [skill for skill in DbcDatabaseManager.DbcTableHolder.get_rows(SkillLine).values()
+                if skill_type in (skill.DisplayName_enUS or '').lower()]
 
     class SkillLineAbilityHolder:
         SKILL_LINE_ABILITIES = defaultdict(list)
@@ -316,35 +333,27 @@ class DbcDatabaseManager:
 
     @staticmethod
     def skill_line_ability_get_by_skill_lines(skill_lines):
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(SkillLineAbility).filter(SkillLineAbility.SkillLine.in_(skill_lines)).all()
-        dbc_db_session.close()
-        return res
+        skill_lines = set(skill_lines)
+        return [skill_line_ability for skill_line_ability
+                in DbcDatabaseManager.DbcTableHolder.get_rows(SkillLineAbility).values()
+                if skill_line_ability.SkillLine in skill_lines]
 
     @staticmethod
     def skill_line_ability_get_all():
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(SkillLineAbility).all()
-        dbc_db_session.close()
-        return res
+        return list(DbcDatabaseManager.DbcTableHolder.get_rows(SkillLineAbility).values())
 
     # ItemSubClass
 
     @staticmethod
     def item_get_subclass_info_by_class_and_subclass(class_, subclass):
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(ItemSubClass).filter_by(ClassID=class_, SubClassID=subclass).first()
-        dbc_db_session.close()
-        return res
+        return DbcDatabaseManager.DbcTableHolder.get_by_index(ItemSubClass, ('ClassID', 'SubClassID'), class_, subclass)
 
     # CharStartOutfit
 
     @staticmethod
     def char_start_outfit_get(race, class_, gender):
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(CharStartOutfit).filter_by(RaceID=race, ClassID=class_, GenderID=gender).first()
-        dbc_db_session.close()
-        return res
+        return DbcDatabaseManager.DbcTableHolder.get_by_index(CharStartOutfit, ('RaceID', 'ClassID', 'GenderID'), race,
+                                                             class_, gender)
 
     # CreatureDisplayInfo
 
@@ -362,19 +371,13 @@ class DbcDatabaseManager:
 
     @staticmethod
     def creature_display_info_get_all():
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(CreatureDisplayInfo).all()
-        dbc_db_session.close()
-        return res
+        return list(DbcDatabaseManager.DbcTableHolder.get_rows(CreatureDisplayInfo).values())
 
     # GameObjectDisplayInfo
 
     @staticmethod
     def gameobject_display_info_get_by_id(display_id):
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(GameObjectDisplayInfo).filter_by(ID=display_id).first()
-        dbc_db_session.close()
-        return res
+        return DbcDatabaseManager.DbcTableHolder.get_by_id(GameObjectDisplayInfo, display_id)
 
     # CreatureFamily
 
@@ -391,44 +394,29 @@ class DbcDatabaseManager:
 
     @staticmethod
     def creature_family_get_all():
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(CreatureFamily).all()
-        dbc_db_session.close()
-        return res
+        return list(DbcDatabaseManager.DbcTableHolder.get_rows(CreatureFamily).values())
 
     # CinematicSequences
 
     @staticmethod
     def cinematic_sequences_get_by_id(cinematic_id):
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(CinematicSequence).filter_by(ID=cinematic_id).first()
-        dbc_db_session.close()
-        return res
+        return DbcDatabaseManager.DbcTableHolder.get_by_id(CinematicSequence, cinematic_id)
 
     # Map
 
     @staticmethod
     def map_get_by_id(map_id):
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(Map).filter_by(ID=map_id).first()
-        dbc_db_session.close()
-        return res
+        return DbcDatabaseManager.DbcTableHolder.get_by_id(Map, map_id)
 
     @staticmethod
     def map_get_all_ids():
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(Map.ID).all()
-        dbc_db_session.close()
-        return [map_id[0] for map_id in res]
+        return list(DbcDatabaseManager.DbcTableHolder.get_rows(Map).keys())
 
     # Bank
 
     @staticmethod
     def bank_get_slot_cost(slot):
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(BankBagSlotPrices).filter_by(ID=slot).first()
-        dbc_db_session.close()
-        return res.Cost
+        return DbcDatabaseManager.DbcTableHolder.get_by_id(BankBagSlotPrices, slot).Cost
 
     # Taxi
 
@@ -476,24 +464,17 @@ class DbcDatabaseManager:
 
     @staticmethod
     def taxi_nodes_get_all():
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(TaxiNode).all()
-        dbc_db_session.close()
-        return res
+        return list(DbcDatabaseManager.DbcTableHolder.get_rows(TaxiNode).values())
 
     @staticmethod
     def taxi_path_get(from_node, to_node):
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(TaxiPath).filter_by(FromTaxiNode=from_node, ToTaxiNode=to_node).first()
-        dbc_db_session.close()
-        return res
+        return DbcDatabaseManager.DbcTableHolder.get_by_index(TaxiPath, ('FromTaxiNode', 'ToTaxiNode'), from_node,
+                                                             to_node)
 
     @staticmethod
     def taxi_path_nodes_get_all():
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(TaxiPathNode).order_by(TaxiPathNode.NodeIndex.asc()).all()
-        dbc_db_session.close()
-        return res
+        return sorted(DbcDatabaseManager.DbcTableHolder.get_rows(TaxiPathNode).values(),
+                      key=lambda taxi_path_node: taxi_path_node.NodeIndex)
 
     # Locks
     class LocksHolder:
@@ -511,10 +492,7 @@ class DbcDatabaseManager:
 
     @staticmethod
     def locks_get_all():
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(Lock).all()
-        dbc_db_session.close()
-        return res
+        return list(DbcDatabaseManager.DbcTableHolder.get_rows(Lock).values())
 
     # Transports
 
@@ -533,10 +511,7 @@ class DbcDatabaseManager:
 
     @staticmethod
     def transport_animation_get_all():
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(TransportAnimation).all()
-        dbc_db_session.close()
-        return res
+        return list(DbcDatabaseManager.DbcTableHolder.get_rows(TransportAnimation).values())
 
     # Faction
 
@@ -562,15 +537,17 @@ class DbcDatabaseManager:
 
     @staticmethod
     def faction_get_all():
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(Faction).all()
-        dbc_db_session.close()
-        return res
+        return list(DbcDatabaseManager.DbcTableHolder.get_rows(Faction).values())
 
     # FactionTemplate
 
     class FactionTemplateHolder:
         FACTION_TEMPLATES = {}
+        # Dense index per faction template id, used to address the reaction matrix.
+        FACTION_TEMPLATE_INDEXES = {}
+        # Reaction of template A towards template B at [index_a * count + index_b], filled upon first lookup.
+        REACTIONS = bytearray()
+        UNKNOWN_REACTION = 0xFF
 
         @staticmethod
         def load_faction_template(faction_template):
@@ -582,9 +559,58 @@ class DbcDatabaseManager:
                 return DbcDatabaseManager.FactionTemplateHolder.FACTION_TEMPLATES[faction_template_id]
             return None
 
+        # Must be called once all templates are loaded, or whenever they change.
+        @staticmethod
+        def build_reactions():
+            holder = DbcDatabaseManager.FactionTemplateHolder
+            holder.FACTION_TEMPLATE_INDEXES = {template_id: index for index, template_id
+                                               in enumerate(holder.FACTION_TEMPLATES.keys())}
+            count = len(holder.FACTION_TEMPLATE_INDEXES)
+            holder.REACTIONS = bytearray([holder.UNKNOWN_REACTION]) * (count * count)
+
+        # Returns the reaction of own template towards target template, None if any of them is invalid.
+        @staticmethod
+        def get_reaction(own_template_id, target_template_id):
+            holder = DbcDatabaseManager.FactionTemplateHolder
+            own_index = holder.FACTION_TEMPLATE_INDEXES.get(own_template_id, None)
+            target_index = holder.FACTION_TEMPLATE_INDEXES.get(target_template_id, None)
+            if own_index is None or target_index is None:
+                return None
+
+            matrix_index = own_index * len(holder.FACTION_TEMPLATE_INDEXES) + target_index
+            reaction = holder.REACTIONS[matrix_index]
+            if reaction == holder.UNKNOWN_REACTION:
+                reaction = holder._calculate_reaction(holder.FACTION_TEMPLATES[own_template_id],
+                                                      holder.FACTION_TEMPLATES[target_template_id])
+                holder.REACTIONS[matrix_index] = reaction
+            return reaction
+
+        @staticmethod
+        def _calculate_reaction(own_faction, target_faction):
+            if target_faction.FactionGroup & own_faction.EnemyGroup != 0:
+                return UnitReaction.UNIT_REACTION_HOSTILE
+
+            own_enemies = {own_faction.Enemies_1, own_faction.Enemies_2, own_faction.Enemies_3, own_faction.Enemies_4}
+            if target_faction.Faction > 0 and target_faction.Faction in own_enemies:
+                return UnitReaction.UNIT_REACTION_HOSTILE
+
+            if target_faction.FactionGroup & own_faction.FriendGroup != 0:
+                return UnitReaction.UNIT_REACTION_FRIENDLY
+
+            own_friends = {own_faction.Friend_1, own_faction.Friend_2, own_faction.Friend_3, own_faction.Friend_4}
+            if target_faction.Faction > 0 and target_faction.Faction in own_friends:
+                return UnitReaction.UNIT_REACTION_FRIENDLY
+
+            if target_faction.FriendGroup & own_faction.FactionGroup != 0:
+                return UnitReaction.UNIT_REACTION_FRIENDLY
+
+            other_friends = {target_faction.Friend_1, target_faction.Friend_2, target_faction.Friend_3,
+                             target_faction.Friend_4}
+            if own_faction.Faction > 0 and own_faction.Faction in other_friends:
+                return UnitReaction.UNIT_REACTION_FRIENDLY
+
+            return UnitReaction.UNIT_REACTION_NEUTRAL
+
     @staticmethod
     def faction_template_get_all():
-        dbc_db_session = SessionHolder()
-        res = dbc_db_session.query(FactionTemplate).all()
-        dbc_db_session.close()
-        return res
+        return list(DbcDatabaseManager.DbcTableHolder.get_rows(FactionTemplate).values())
@@ -8,6 +8,12 @@ Base = declarative_base()
 metadata = Base.metadata
 
 
+class AppliedUpdates(Base):
+    __tablename__ = 'applied_updates'
+
+    id = Column(Text, primary_key=True)
+
+
 class AreaTable(Base):
     __tablename__ = 'AreaTable'
 
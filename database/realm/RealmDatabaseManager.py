@@ -1,7 +1,7 @@
 import hashlib
 import os
 
-from sqlalchemy import create_engine
+from sqlalchemy import and_, create_engine, inspect
 from sqlalchemy.orm import sessionmaker, scoped_session
 
 from database.realm.RealmModels import *
@@ -20,6 +20,21 @@ realm_db_engine = create_engine(f'mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HO
                                 pool_pre_ping=True)
 SessionHolder = scoped_session(sessionmaker(bind=realm_db_engine, autoflush=False))
 
+# Fingerprints of the last persisted state of character rows, by owner guid and then by (model, primary key). Used to
+# skip UPDATEs of rows that did not change since they were last written.
+PERSISTED_FINGERPRINTS: dict[int, dict[tuple, int]] = {}
+# Attribute holding the owner character guid of each tracked model.
+FINGERPRINT_OWNERS = {
+    Character: 'guid',
+    CharacterInventory: 'owner',
+    CharacterSkill: 'guid',
+    CharacterSpell: 'guid',
+    CharacterQuestState: 'guid',
+    CharacterReputation: 'guid',
+    CharacterButton: 'owner',
+    CharacterPet: 'owner_guid'
+}
+
 
 class RealmDatabaseManager(object):
     # Realm.
@@ -66,6 +81,13 @@ class RealmDatabaseManager(object):
         realm_db_session.close()
         return AccountManager(account)
 
+    @staticmethod
+    def account_get_by_id(account_id):
+        realm_db_session = SessionHolder()
+        account = realm_db_session.query(Account).filter_by(id=account_id).first()
+        realm_db_session.close()
+        return AccountManager(account) if account else None
+
     @staticmethod
     def account_try_update_password(username, old_password, new_password):
         realm_db_session = SessionHolder()
@@ -100,6 +122,29 @@ class RealmDatabaseManager(object):
         realm_db_session.close()
         return characters if characters else []
 
+    # Character screen data of every account character, as (characters, equipment). Characters are rows of
+    # (Character, guild_id, active pet creature_id, active pet level), equipment rows are (owner, slot, item_template)
+    # of the items equipped in the visible slots.
+    @staticmethod
+    def account_get_characters_enum_data(account_id):
+        realm_db_session = SessionHolder()
+        characters = realm_db_session.query(Character, GuildMember.guild_id, CharacterPet.creature_id,
+                                            CharacterPet.level)\
+            .outerjoin(GuildMember, GuildMember.guid == Character.guid)\
+            .outerjoin(CharacterPet, and_(CharacterPet.owner_guid == Character.guid, CharacterPet.is_active == 1))\
+            .filter(Character.account_id == account_id,
+                    Character.realm_id == config.Server.Connection.Realm.local_realm_id).all()
+        equipment = realm_db_session.query(CharacterInventory.owner, CharacterInventory.slot,
+                                           CharacterInventory.item_template)\
+            .join(Character, Character.guid == CharacterInventory.owner)\
+            .filter(Character.account_id == account_id,
+                    Character.realm_id == config.Server.Connection.Realm.local_realm_id,
+                    CharacterInventory.bag == InventorySlots.SLOT_INBACKPACK.value,
+                    CharacterInventory.slot >= InventorySlots.SLOT_HEAD.value,
+                    CharacterInventory.slot < InventorySlots.SLOT_BAG2.value).all()
+        realm_db_session.close()
+        return characters, equipment
+
     # Character.
 
     @staticmethod
@@ -124,6 +169,16 @@ class RealmDatabaseManager(object):
         realm_db_session.close()
         return character
 
+    # Name query data (guid, name, race, gender, class_, realm_id) of the given characters.
+    @staticmethod
+    def character_get_names(guids):
+        realm_db_session = SessionHolder()
+        characters = realm_db_session.query(Character.guid, Character.name, Character.race, Character.gender,
+                                            Character.class_, Character.realm_id)\
+            .filter(Character.guid.in_([guid & ~HighGuid.HIGHGUID_PLAYER for guid in guids])).all()
+        realm_db_session.close()
+        return characters
+
     @staticmethod
     def character_get_by_name(name):
         realm_db_session = SessionHolder()
@@ -150,11 +205,99 @@ class RealmDatabaseManager(object):
 
     @staticmethod
     def character_update(character):
+        fingerprint = RealmDatabaseManager.get_row_fingerprint(character)
+        if RealmDatabaseManager.is_persisted(fingerprint):
+            return
         realm_db_session = SessionHolder()
         realm_db_session.merge(character)
         realm_db_session.flush()
         realm_db_session.commit()
         realm_db_session.close()
+        RealmDatabaseManager.set_persisted(fingerprint)
+
+    # Loaded column attribute values of a model instance as a plain dict, so they can be written from another thread.
+    # Attributes expired by a previous commit are left out, primary keys are taken from the instance identity.
+    @staticmethod
+    def get_row_mapping(row):
+        state = inspect(row)
+        mapper = state.mapper
+        mapping = {attribute.key: state.dict[attribute.key] for attribute in mapper.column_attrs
+                   if attribute.key in state.dict}
+        if state.identity:
+            for column, value in zip(mapper.primary_key, state.identity):
+                mapping.setdefault(mapper.get_property_by_column(column).key, value)
+        return mapping
+
+    # Fingerprint (owner, key, hash) of a row mapping, None if the row can't be tracked (e.g. unknown owner).
+    @staticmethod
+    def get_fingerprint(model, mapping):
+        owner_attribute = FINGERPRINT_OWNERS.get(model)
+        owner = mapping.get(owner_attribute) if owner_attribute else None
+        if owner is None:
+            return None
+        primary_key = tuple(mapping.get(inspect(model).get_property_by_column(column).key)
+                            for column in inspect(model).primary_key)
+        try:
+            return owner, (model, primary_key), hash(tuple(mapping.items()))
+        except TypeError:
+            return None
+
+    @staticmethod
+    def get_row_fingerprint(row):
+        return RealmDatabaseManager.get_fingerprint(type(row), RealmDatabaseManager.get_row_mapping(row))
+
+    @staticmethod
+    def is_persisted(fingerprint):
+        if not fingerprint:
+            return False
+        owner, key, value = fingerprint
+        return PERSISTED_FINGERPRINTS.get(owner, {}).get(key) == value
+
+    @staticmethod
+    def set_persisted(fingerprint):
+        if fingerprint:
+            owner, key, value = fingerprint
+            PERSISTED_FINGERPRINTS.setdefault(owner, {})[key] = value
+
+    # Must be called whenever a character is loaded from db, its rows might have been written by another process, and
+    # once it leaves the world or is deleted, so fingerprints are only kept for characters in world.
+    @staticmethod
+    def forget_fingerprints(character_guid):
+        PERSISTED_FINGERPRINTS.pop(character_guid & ~HighGuid.HIGHGUID_PLAYER, None)
+
+    # Returns the mappings that changed since they were last persisted, along with their fingerprints.
+    @staticmethod
+    def _get_changed_mappings(model, mappings):
+        changed_mappings = []
+        fingerprints = []
+        for mapping in mappings:
+            fingerprint = RealmDatabaseManager.get_fingerprint(model, mapping)
+            if not RealmDatabaseManager.is_persisted(fingerprint):
+                changed_mappings.append(mapping)
+                fingerprints.append(fingerprint)
+        return changed_mappings, fingerprints
+
+    # Batched UPDATEs of already persisted characters, quest statuses and pets, all within a single transaction.
+    # Rows which did not change since they were last written are skipped.
+    @staticmethod
+    def character_bulk_update(characters, quest_statuses, pets):
+        fingerprints = []
+        updates = []
+        for model, mappings in ((Character, characters), (CharacterQuestState, quest_statuses), (CharacterPet, pets)):
+            changed_mappings, changed_fingerprints = RealmDatabaseManager._get_changed_mappings(model, mappings)
+            if changed_mappings:
+                updates.append((model, changed_mappings))
+                fingerprints.extend(changed_fingerprints)
+        if not updates:
+            return
+
+        realm_db_session = SessionHolder()
+        for model, mappings in updates:
+            realm_db_session.bulk_update_mappings(model, mappings)
+        realm_db_session.flush()
+        realm_db_session.commit()
+        realm_db_session.close()
+        [RealmDatabaseManager.set_persisted(fingerprint) for fingerprint in fingerprints]
 
     @staticmethod
     def character_inventory_get(character_guid):
@@ -201,6 +344,7 @@ class RealmDatabaseManager(object):
         realm_db_session = SessionHolder()
         char_to_delete = RealmDatabaseManager.character_get_by_guid(guid)
         if char_to_delete:
+            RealmDatabaseManager.forget_fingerprints(guid)
             realm_db_session.delete(char_to_delete)
             realm_db_session.flush()
             realm_db_session.commit()
@@ -217,24 +361,35 @@ class RealmDatabaseManager(object):
             realm_db_session.commit()
             realm_db_session.refresh(item)
             realm_db_session.close()
+            RealmDatabaseManager.set_persisted(RealmDatabaseManager.get_row_fingerprint(item))
 
     @staticmethod
     def character_inventory_update_item(item):
         if item:
+            fingerprint = RealmDatabaseManager.get_row_fingerprint(item)
+            if RealmDatabaseManager.is_persisted(fingerprint):
+                return
             realm_db_session = SessionHolder()
             realm_db_session.merge(item)
             realm_db_session.flush()
             realm_db_session.commit()
             realm_db_session.close()
+            RealmDatabaseManager.set_persisted(fingerprint)
 
     @staticmethod
     def character_inventory_update_container_contents(container):
+        fingerprints = []
         realm_db_session = SessionHolder()
         for item in container.sorted_slots.values():
+            fingerprint = RealmDatabaseManager.get_row_fingerprint(item.item_instance)
+            if RealmDatabaseManager.is_persisted(fingerprint):
+                continue
             realm_db_session.merge(item.item_instance)
+            fingerprints.append(fingerprint)
         realm_db_session.flush()
         realm_db_session.commit()
         realm_db_session.close()
+        [RealmDatabaseManager.set_persisted(fingerprint) for fingerprint in fingerprints]
 
     @staticmethod
     def character_inventory_delete(item):
@@ -347,15 +502,20 @@ class RealmDatabaseManager(object):
             realm_db_session.commit()
             realm_db_session.refresh(skill)
             realm_db_session.close()
+            RealmDatabaseManager.set_persisted(RealmDatabaseManager.get_row_fingerprint(skill))
 
     @staticmethod
     def character_update_skill(skill):
         if skill:
+            fingerprint = RealmDatabaseManager.get_row_fingerprint(skill)
+            if RealmDatabaseManager.is_persisted(fingerprint):
+                return
             realm_db_session = SessionHolder()
             realm_db_session.merge(skill)
             realm_db_session.flush()
             realm_db_session.commit()
             realm_db_session.close()
+            RealmDatabaseManager.set_persisted(fingerprint)
 
     @staticmethod
     def character_get_spells(guid):
@@ -380,15 +540,20 @@ class RealmDatabaseManager(object):
             realm_db_session.commit()
             realm_db_session.refresh(spell)
             realm_db_session.close()
+            RealmDatabaseManager.set_persisted(RealmDatabaseManager.get_row_fingerprint(spell))
 
     @staticmethod
     def character_update_spell(spell):
         if spell:
+            fingerprint = RealmDatabaseManager.get_row_fingerprint(spell)
+            if RealmDatabaseManager.is_persisted(fingerprint):
+                return
             realm_db_session = SessionHolder()
             realm_db_session.merge(spell)
             realm_db_session.flush()
             realm_db_session.commit()
             realm_db_session.close()
+            RealmDatabaseManager.set_persisted(fingerprint)
 
     @staticmethod
     def character_delete_spell(guid, spell_id):
@@ -453,6 +618,7 @@ class RealmDatabaseManager(object):
             realm_db_session.commit()
             realm_db_session.refresh(quest_status)
             realm_db_session.close()
+            RealmDatabaseManager.set_persisted(RealmDatabaseManager.get_row_fingerprint(quest_status))
 
     @staticmethod
     def character_delete_quest(guid, quest_id):
@@ -469,11 +635,15 @@ class RealmDatabaseManager(object):
     @staticmethod
     def character_update_quest_status(quest_status):
         if quest_status:
+            fingerprint = RealmDatabaseManager.get_row_fingerprint(quest_status)
+            if RealmDatabaseManager.is_persisted(fingerprint):
+                return
             realm_db_session = SessionHolder()
             realm_db_session.merge(quest_status)
             realm_db_session.flush()
             realm_db_session.commit()
             realm_db_session.close()
+            RealmDatabaseManager.set_persisted(fingerprint)
 
     @staticmethod
     def character_get_reputations(character_guid):
@@ -485,11 +655,15 @@ class RealmDatabaseManager(object):
     @staticmethod
     def character_update_reputation(reputation):
         if reputation:
+            fingerprint = RealmDatabaseManager.get_row_fingerprint(reputation)
+            if RealmDatabaseManager.is_persisted(fingerprint):
+                return
             realm_db_session = SessionHolder()
             realm_db_session.merge(reputation)
             realm_db_session.flush()
             realm_db_session.commit()
             realm_db_session.close()
+            RealmDatabaseManager.set_persisted(fingerprint)
 
     @staticmethod
     def character_add_reputation(reputation):
@@ -499,6 +673,7 @@ class RealmDatabaseManager(object):
         realm_db_session.commit()
         realm_db_session.refresh(reputation)
         realm_db_session.close()
+        RealmDatabaseManager.set_persisted(RealmDatabaseManager.get_row_fingerprint(reputation))
 
     # Action Buttons
 
@@ -521,11 +696,15 @@ class RealmDatabaseManager(object):
 
     @staticmethod
     def character_update_button(character_button):
+        fingerprint = RealmDatabaseManager.get_row_fingerprint(character_button)
+        if RealmDatabaseManager.is_persisted(fingerprint):
+            return
         realm_db_session = SessionHolder()
         realm_db_session.merge(character_button)
         realm_db_session.flush()
         realm_db_session.commit()
         realm_db_session.close()
+        RealmDatabaseManager.set_persisted(fingerprint)
 
     @staticmethod
     def character_add_button(character_button):
@@ -535,6 +714,7 @@ class RealmDatabaseManager(object):
         realm_db_session.commit()
         realm_db_session.refresh(character_button)
         realm_db_session.close()
+        RealmDatabaseManager.set_persisted(RealmDatabaseManager.get_row_fingerprint(character_button))
 
     @staticmethod
     def character_delete_button(character_button):
@@ -599,11 +779,15 @@ class RealmDatabaseManager(object):
 
     @staticmethod
     def character_update_pet(pet):
+        fingerprint = RealmDatabaseManager.get_row_fingerprint(pet)
+        if RealmDatabaseManager.is_persisted(fingerprint):
+            return
         realm_db_session = SessionHolder()
         realm_db_session.merge(pet)
         realm_db_session.flush()
         realm_db_session.commit()
         realm_db_session.close()
+        RealmDatabaseManager.set_persisted(fingerprint)
 
     @staticmethod
     def character_add_pet(character_pet):
@@ -631,6 +815,18 @@ class RealmDatabaseManager(object):
         realm_db_session.close()
         return spells
 
+    # Spell ids of every pet of the given character, by pet id.
+    @staticmethod
+    def character_get_all_pet_spells(guid):
+        realm_db_session = SessionHolder()
+        spells = realm_db_session.query(CharacterPetSpell.pet_id, CharacterPetSpell.spell_id)\
+            .filter_by(guid=guid & ~HighGuid.HIGHGUID_PLAYER).all()
+        realm_db_session.close()
+        spells_by_pet = {}
+        for pet_id, spell_id in spells:
+            spells_by_pet.setdefault(pet_id, []).append(spell_id)
+        return spells_by_pet
+
     @staticmethod
     def character_add_pet_spell(pet_spell):
         realm_db_session = SessionHolder()
@@ -137,6 +137,22 @@ class WorldDatabaseManager(object):
                 best_matching_location = location
         return best_matching_location
 
+    # Updates.
+
+    @staticmethod
+    def applied_updates_get_all():
+        world_db_session = SessionHolder()
+        res = world_db_session.query(AppliedUpdates.id).all()
+        world_db_session.close()
+        return [update_id[0] for update_id in res]
+
+    @staticmethod
+    def item_applied_updates_get_all():
+        world_db_session = SessionHolder()
+        res = world_db_session.query(AppliedItemUpdates.entry, AppliedItemUpdates.version).all()
+        world_db_session.close()
+        return [(item_update.entry, item_update.version) for item_update in res]
+
     # Item.
 
     @staticmethod
@@ -0,0 +1,293 @@
+import multiprocessing
+import threading
+import traceback
+from struct import pack, unpack
+from sys import platform
+
+from database.realm.RealmDatabaseManager import RealmDatabaseManager
+from game.world.WorldSessionStateHandler import WorldSessionStateHandler
+from network.packet.PacketReader import PacketReader
+from network.packet.PacketWriter import PacketWriter
+from utils.ConfigManager import config
+from utils.Logger import Logger
+from utils.constants.OpCodes import OpCode
+
+# Each entry of map_shards is a list of map ids served by its own worker process, maps not listed in any shard are
+# served by the world process itself.
+SHARD_BY_MAP: dict[int, int] = {}
+for _shard_id, _shard_maps in enumerate(config.Server.Connection.WorldServer.map_shards or []):
+    for _map_id in _shard_maps:
+        SHARD_BY_MAP[_map_id] = _shard_id
+
+# Shard owned by the current process, None for the world process.
+LOCAL_SHARD = None
+# Worker side, the MapShardWorker talking to the world process.
+LOCAL_WORKER = None
+# World process side, worker connections by shard id.
+SHARD_CONNECTIONS = {}
+SHARD_LOCKS = {}
+# World process side, sessions currently playing on a worker by session id.
+SHARD_SESSIONS = {}
+SESSION_ID_LOCK = threading.Lock()
+
+
+class MapShardManager:
+    ENABLED = len(SHARD_BY_MAP) > 0
+    LAST_SESSION_ID = 0
+
+    @staticmethod
+    def get_shard_for_map(map_id):
+        return SHARD_BY_MAP.get(map_id, None)
+
+    @staticmethod
+    def is_local_map(map_id):
+        return SHARD_BY_MAP.get(map_id, None) == LOCAL_SHARD
+
+    @staticmethod
+    def is_worker():
+        return LOCAL_SHARD is not None
+
+    @staticmethod
+    def get_local_shard():
+        return LOCAL_SHARD
+
+    @staticmethod
+    def set_local_shard(shard_id, worker=None):
+        global LOCAL_SHARD, LOCAL_WORKER
+        LOCAL_SHARD = shard_id
+        LOCAL_WORKER = worker
+
+    # Process wide state (online players, character names, etc.) lives in each process. Changes are exchanged as
+    # messages with session id 0, which is never given to a session.
+
+    # Worker side, lets the world process know about a change, no-op in any other process.
+    @staticmethod
+    def notify_world(message):
+        if LOCAL_WORKER:
+            LOCAL_WORKER.send(message)
+
+    # Lets every other process know about a change.
+    @staticmethod
+    def share_state(message):
+        if not MapShardManager.ENABLED:
+            return
+        if LOCAL_WORKER:
+            LOCAL_WORKER.send(message)
+        elif LOCAL_SHARD is None:
+            for shard_id in SHARD_CONNECTIONS:
+                MapShardManager._send_to_shard(shard_id, message)
+
+    @staticmethod
+    def apply_shared_state(message):
+        action = message[0]
+        if action == 'who_add':
+            from game.world.managers.objects.units.player.WhoManager import WhoManager
+            WhoManager.add_remote_player(message[2])
+        elif action == 'who_remove':
+            from game.world.managers.objects.units.player.WhoManager import WhoManager
+            WhoManager.remove_remote_player(message[2])
+        elif action == 'name_add':
+            from game.world.managers.objects.units.player.CharacterNameCache import CharacterNameCache, \
+                CharacterName
+            CharacterNameCache.add(CharacterName(*message[2]))
+        elif action == 'name_remove':
+            from game.world.managers.objects.units.player.CharacterNameCache import CharacterNameCache
+            CharacterNameCache.remove(message[2])
+        elif action == 'char_enum_invalidate':
+            from game.world.opcode_handling.handlers.interface.CharEnumHandler import CharEnumHandler
+            CharEnumHandler.invalidate(message[2])
+        elif action == 'char_enum_invalidate_character':
+            from game.world.opcode_handling.handlers.interface.CharEnumHandler import CharEnumHandler
+            CharEnumHandler.invalidate_character(message[2])
+
+    # World process.
+
+    @staticmethod
+    def start_workers():
+        if not MapShardManager.ENABLED:
+            return
+
+        from game.world.MapShardWorker import MapShardWorker
+        # Same as main.py, semaphore objects are leaked on shutdown in macOS if using spawn.
+        context = multiprocessing.get_context('fork' if platform == 'darwin' else 'spawn')
+        for shard_id in sorted(set(SHARD_BY_MAP.values())):
+            router_connection, worker_connection = context.Pipe()
+            worker_process = context.Process(name=f'Map shard {shard_id} process', target=MapShardWorker.run,
+                                             args=(shard_id, worker_connection))
+            worker_process.daemon = True
+            worker_process.start()
+
+            SHARD_CONNECTIONS[shard_id] = router_connection
+            SHARD_LOCKS[shard_id] = threading.Lock()
+            router_thread = threading.Thread(target=MapShardManager._route_worker_messages, args=(shard_id,),
+                                             name=f'Map shard {shard_id} router')
+            router_thread.daemon = True
+            router_thread.start()
+
+            shard_maps = ', '.join(str(map_id) for map_id, shard in SHARD_BY_MAP.items() if shard == shard_id)
+            Logger.success(f'[MapShard] Started shard {shard_id} (maps {shard_maps}).')
+
+    # Forwards the packet to the worker owning the session player if needed, returns True if the packet was routed.
+    @staticmethod
+    def route_packet(world_session, reader):
+        if LOCAL_SHARD is not None:
+            return False
+
+        # Online players of every process are only known by the world process.
+        if world_session.map_shard is not None and reader.opcode == OpCode.CMSG_WHO:
+            return False
+
+        if world_session.map_shard is not None:
+            MapShardManager._send_to_shard(world_session.map_shard, ('packet', world_session.map_shard_session_id,
+                                                                      PacketWriter.get_packet(reader.opcode,
+                                                                                              reader.data)))
+            return True
+
+        if reader.opcode != OpCode.CMSG_PLAYER_LOGIN or len(reader.data) < 8:
+            return False
+
+        guid = unpack('<Q', reader.data[:8])[0]
+        character = RealmDatabaseManager.character_get_by_guid(guid)
+        if not character or MapShardManager.is_local_map(character.map):
+            return False
+
+        MapShardManager._login_on_shard(world_session, MapShardManager.get_shard_for_map(character.map), guid)
+        return True
+
+    # A player left its map towards one served by another process, log it in there.
+    @staticmethod
+    def route_transfer(world_session, guid, map_id):
+        shard_id = MapShardManager.get_shard_for_map(map_id)
+        if shard_id is None:
+            MapShardManager._release_shard_session(world_session)
+            MapShardManager._login_local(world_session, guid)
+        else:
+            MapShardManager._login_on_shard(world_session, shard_id, guid)
+
+    # The session is going away, let the worker log out its player.
+    @staticmethod
+    def release_session(world_session):
+        if world_session.map_shard is None:
+            return
+        shard_id = world_session.map_shard
+        session_id = world_session.map_shard_session_id
+        MapShardManager._release_shard_session(world_session)
+        MapShardManager._send_to_shard(shard_id, ('disconnect', session_id))
+
+    @staticmethod
+    def _login_on_shard(world_session, shard_id, guid):
+        MapShardManager._release_shard_session(world_session)
+        with SESSION_ID_LOCK:
+            MapShardManager.LAST_SESSION_ID += 1
+            session_id = MapShardManager.LAST_SESSION_ID
+        world_session.map_shard = shard_id
+        world_session.map_shard_session_id = session_id
+        world_session.map_shard_guid = guid
+        SHARD_SESSIONS[session_id] = world_session
+        MapShardManager._send_to_shard(shard_id, ('login', session_id, world_session.account_mgr.account.id,
+                                                  world_session.client_address, guid))
+
+    @staticmethod
+    def _login_local(world_session, guid):
+        from game.world.opcode_handling.handlers.player.PlayerLoginHandler import PlayerLoginHandler
+        reader = PacketReader(PacketWriter.get_packet(OpCode.CMSG_PLAYER_LOGIN, pack('<Q', guid)))
+        if PlayerLoginHandler.handle(world_session, world_session.request, reader) < 0:
+            world_session.disconnect()
+
+    @staticmethod
+    def _release_shard_session(world_session):
+        SHARD_SESSIONS.pop(world_session.map_shard_session_id, None)
+        world_session.map_shard = None
+        world_session.map_shard_session_id = 0
+        world_session.map_shard_guid = 0
+
+    @staticmethod
+    def _send_to_shard(shard_id, message):
+        try:
+            with SHARD_LOCKS[shard_id]:
+                SHARD_CONNECTIONS[shard_id].send(message)
+        except (OSError, EOFError):
+            Logger.error(f'[MapShard] Unable to reach shard {shard_id}.')
+
+    # noinspection PyBroadException
+    @staticmethod
+    def _route_worker_messages(shard_id):
+        connection = SHARD_CONNECTIONS[shard_id]
+        while True:
+            try:
+                message = connection.recv()
+            except (OSError, EOFError):
+                Logger.error(f'[MapShard] Lost connection with shard {shard_id}.')
+                break
+
+            try:
+                action, session_id = message[0], message[1]
+                if session_id == 0:
+                    MapShardManager.apply_shared_state(message)
+                    # Names are relevant to the other workers too.
+                    if action.startswith('name_'):
+                        for other_shard_id in SHARD_CONNECTIONS:
+                            if other_shard_id != shard_id:
+                                MapShardManager._send_to_shard(other_shard_id, message)
+                    continue
+
+                world_session = SHARD_SESSIONS.get(session_id, None)
+                if not world_session:
+                    continue
+                if action == 'send':
+                    world_session.enqueue_packet(message[2])
+                # Player went back to the character screen.
+                elif action == 'logout':
+                    MapShardManager._release_shard_session(world_session)
+                # Worker already released its player, end the session.
+                elif action == 'disconnect':
+                    MapShardManager._release_shard_session(world_session)
+                    world_session.disconnect()
+                elif action == 'transfer':
+                    MapShardManager.route_transfer(world_session, message[2], message[3])
+            except:
+                Logger.error(traceback.format_exc())
+
+        # Worker is gone, drop every session it was serving.
+        from game.world.managers.objects.units.player.WhoManager import WhoManager
+        WhoManager.remove_remote_players(shard_id)
+        for world_session in [session for session in SHARD_SESSIONS.values() if session.map_shard == shard_id]:
+            MapShardManager._release_shard_session(world_session)
+            world_session.disconnect()
+
+    # Both sides.
+
+    # Called upon MSG_MOVE_WORLDPORT_ACK, hands the player over to the process owning the destination map if it is
+    # not served by this one. Returns True if the player was transferred.
+    @staticmethod
+    def transfer_if_remote(world_session):
+        player_mgr = world_session.player_mgr
+        if not MapShardManager.ENABLED or not player_mgr or not player_mgr.pending_teleport_data:
+            return False
+
+        pending_teleport = player_mgr.pending_teleport_data[0]
+        if MapShardManager.is_local_map(pending_teleport.destination_map):
+            return False
+
+        from game.world.managers.objects.units.player.ChannelManager import ChannelManager
+        player_mgr.pending_teleport_data.clear()
+        player_mgr.online = False
+        player_mgr.map_id = pending_teleport.destination_map
+        player_mgr.location = pending_teleport.destination_location.copy()
+        player_mgr.mirror_timers_manager.stop_all()
+        player_mgr.spell_manager.remove_casts()
+        player_mgr.pet_manager.detach_active_pets(is_logout=True)
+        # Channels live in each process, the destination process will join them again.
+        ChannelManager.leave_all_channels(player_mgr, logout=True)
+        # The destination process loads the character from db.
+        world_session.save_character()
+        WorldSessionStateHandler.pop_active_player(player_mgr)
+        player_mgr.session = None
+
+        guid = player_mgr.guid
+        if MapShardManager.is_worker():
+            world_session.request_transfer(guid, pending_teleport.destination_map)
+        else:
+            world_session.player_mgr = None
+            MapShardManager.route_transfer(world_session, guid, pending_teleport.destination_map)
+        return True
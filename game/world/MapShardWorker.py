@@ -0,0 +1,149 @@
+import threading
+import traceback
+from struct import pack
+
+from database.realm.RealmDatabaseManager import RealmDatabaseManager
+from game.world import WorldManager
+from game.world.MapShardManager import MapShardManager
+from game.world.WorldLoader import WorldLoader
+from game.world.WorldManager import WorldServerSessionHandler
+from game.world.WorldSessionStateHandler import WorldSessionStateHandler
+from game.world.opcode_handling.handlers.player.PlayerLoginHandler import PlayerLoginHandler
+from network.packet.PacketReader import PacketReader
+from network.packet.PacketWriter import PacketWriter
+from utils.Logger import Logger
+from utils.constants.OpCodes import OpCode
+
+
+# Stands for a client session inside a map worker, the real socket lives in the world process which relays packets
+# through the shard pipe.
+class MapShardSession(WorldServerSessionHandler):
+    def __init__(self, worker, session_id, account_mgr, client_address):
+        self._player_mgr = None
+        super().__init__(None, client_address)
+        self.worker = worker
+        self.session_id = session_id
+        self.account_mgr = account_mgr
+        self.keep_alive = True
+
+    # The player manager clears itself from its session upon logout, which means the client is back on the character
+    # screen and the world process has to handle its packets again.
+    @property
+    def player_mgr(self):
+        return self._player_mgr
+
+    @player_mgr.setter
+    def player_mgr(self, player_mgr):
+        logged_out = self._player_mgr and not player_mgr
+        self._player_mgr = player_mgr
+        if logged_out and self.keep_alive:
+            self.keep_alive = False
+            WorldSessionStateHandler.remove(self)
+            self.worker.release(self, ('logout', self.session_id))
+
+    def enqueue_packets(self, packets):
+        if self.keep_alive:
+            data = b''.join(packets)
+            if data:
+                self.worker.send(('send', self.session_id, data))
+
+    def enqueue_packet(self, data):
+        if self.keep_alive and data:
+            self.worker.send(('send', self.session_id, data))
+
+    def request_transfer(self, guid, map_id):
+        self.keep_alive = False
+        self._player_mgr = None
+        WorldSessionStateHandler.remove(self)
+        self.worker.release(self, ('transfer', self.session_id, guid, map_id))
+
+    # Connection was closed on the world process or a handler asked to end the session.
+    def disconnect(self, notify=False):
+        if not self.keep_alive:
+            return
+        self.keep_alive = False
+        try:
+            if self.player_mgr and self.player_mgr.online:
+                self.player_mgr.logout()
+        except AttributeError:
+            pass
+        WorldSessionStateHandler.remove(self)
+        self.worker.release(self, ('disconnect', self.session_id) if notify else None)
+
+    def close_socket(self):
+        pass
+
+
+class MapShardWorker:
+    def __init__(self, shard_id, connection):
+        self.shard_id = shard_id
+        self.connection = connection
+        self.send_lock = threading.Lock()
+        self.sessions: dict[int, MapShardSession] = {}
+
+    @staticmethod
+    def run(shard_id, connection):
+        worker = MapShardWorker(shard_id, connection)
+        MapShardManager.set_local_shard(shard_id, worker)
+        WorldLoader.load_data()
+        WorldServerSessionHandler.schedule_background_tasks()
+        Logger.success(f'[MapShard] Shard {shard_id} ready.')
+        worker.serve()
+
+    def send(self, message):
+        try:
+            with self.send_lock:
+                self.connection.send(message)
+        except (OSError, EOFError):
+            pass
+
+    def release(self, session, message):
+        self.sessions.pop(session.session_id, None)
+        if message:
+            self.send(message)
+
+    # noinspection PyBroadException
+    def serve(self):
+        while WorldManager.WORLD_ON:
+            try:
+                message = self.connection.recv()
+            except (OSError, EOFError):
+                break
+
+            try:
+                action, session_id = message[0], message[1]
+                if session_id == 0:
+                    MapShardManager.apply_shared_state(message)
+                    continue
+                if action == 'login':
+                    self._handle_login(session_id, message[2], message[3], message[4])
+                    continue
+
+                session = self.sessions.get(session_id, None)
+                if not session:
+                    continue
+                if action == 'packet':
+                    if not session.handle_packet(PacketReader(message[2])):
+                        session.disconnect(notify=True)
+                elif action == 'disconnect':
+                    session.disconnect()
+            except:
+                # Can be multiple since it includes handlers execution.
+                Logger.error(traceback.format_exc())
+
+        # World process is gone, save and release everyone.
+        for session in list(self.sessions.values()):
+            session.disconnect()
+
+    def _handle_login(self, session_id, account_id, client_address, guid):
+        account_mgr = RealmDatabaseManager.account_get_by_id(account_id)
+        if not account_mgr:
+            self.send(('disconnect', session_id))
+            return
+
+        session = MapShardSession(self, session_id, account_mgr, client_address)
+        self.sessions[session_id] = session
+        WorldSessionStateHandler.add(session)
+        reader = PacketReader(PacketWriter.get_packet(OpCode.CMSG_PLAYER_LOGIN, pack('<Q', guid)))
+        if PlayerLoginHandler.handle(session, None, reader) < 0:
+            session.disconnect(notify=True)
@@ -6,6 +6,7 @@ from database.world.WorldDatabaseManager import WorldDatabaseManager
 from game.world.managers.maps.MapManager import MapManager
 from game.world.managers.objects.units.player.GroupManager import GroupManager
 from game.world.managers.objects.units.player.guild.GuildManager import GuildManager
+from game.world.WorldSnapshot import WorldSnapshot
 from utils.ConfigManager import config
 from utils.Logger import Logger
 
@@ -14,7 +15,27 @@ class WorldLoader:
 
     @staticmethod
     def load_data():
+        # Template data, restored from the world snapshot if enabled and up-to-date.
+        if config.Server.Settings.use_world_snapshot:
+            version_key = WorldSnapshot.get_version_key()
+            if not WorldSnapshot.load(version_key):
+                WorldLoader.load_templates()
+                WorldSnapshot.save(version_key)
+        else:
+            WorldLoader.load_templates()
+
+        # Character related data
+        WorldLoader.load_groups()
+        WorldLoader.load_guilds()
+
+        # Maps.
+        MapManager.initialize_world_and_pvp_maps()
+        MapManager.initialize_area_tables()
+
+    @staticmethod
+    def load_templates():
         # Below order matters.
+        WorldLoader.load_dbc_tables()
         WorldLoader.load_creature_templates()
         WorldLoader.load_gameobject_templates()
 
@@ -81,15 +102,21 @@ class WorldLoader:
         WorldLoader.load_locks()
         WorldLoader.load_conditions()
 
-        # Character related data
-        WorldLoader.load_groups()
-        WorldLoader.load_guilds()
+    # World data holders
 
-        # Maps.
-        MapManager.initialize_world_and_pvp_maps()
-        MapManager.initialize_area_tables()
+    @staticmethod
+    def load_dbc_tables():
+        dbc_models = DbcDatabaseManager.dbc_models_get_all()
+        length = len(dbc_models)
+        count = 0
 
-    # World data holders
+        for dbc_model in dbc_models:
+            DbcDatabaseManager.DbcTableHolder.load_table(dbc_model, DbcDatabaseManager.dbc_table_get_all(dbc_model))
+
+            count += 1
+            Logger.progress('Loading DBC tables...', count, length)
+
+        return length
 
     @staticmethod
     def load_gameobject_scripts():
@@ -472,6 +499,7 @@ class WorldLoader:
             count += 1
             Logger.progress('Loading faction templates...', count, length)
 
+        DbcDatabaseManager.FactionTemplateHolder.build_reactions()
         return length
 
     @staticmethod
@@ -1,4 +1,5 @@
 import _queue
+import os
 import socket
 import threading
 import traceback
@@ -7,8 +8,10 @@ from time import time
 from apscheduler.schedulers.background import BackgroundScheduler
 
 from database.world.WorldDatabaseManager import *
+from game.world.MapShardManager import MapShardManager
 from game.world.WorldLoader import WorldLoader
 from game.world.WorldSessionStateHandler import WorldSessionStateHandler
+from game.world.WorldTickManager import WorldTickManager
 from game.world.managers.maps.MapManager import MapManager
 from game.world.managers.objects.units.player.PlayerManager import PlayerManager
 from game.world.opcode_handling.Definitions import Definitions
@@ -19,9 +22,14 @@ from utils.ChatLogManager import ChatLogManager
 from utils.constants.AuthCodes import AuthCode
 
 STARTUP_TIME = time()
+HAS_SENDMSG = hasattr(socket.socket, 'sendmsg')
 WORLD_ON = True
 
 MAX_PACKET_BYTES = 4096
+# Outgoing packets are coalesced into a single send call until this amount of bytes is reached.
+MAX_OUTGOING_BATCH_BYTES = config.Server.Connection.WorldServer.max_outgoing_batch_bytes
+# sendmsg fails with EMSGSIZE above IOV_MAX buffers, so batches are also capped by packet count.
+MAX_OUTGOING_BATCH_PACKETS = os.sysconf('SC_IOV_MAX') if 'SC_IOV_MAX' in getattr(os, 'sysconf_names', {}) else 1024
 
 
 def get_seconds_since_startup():
@@ -36,10 +44,19 @@ class WorldServerSessionHandler:
         self.account_mgr = None
         self.player_mgr: Optional[PlayerManager] = None
         self.keep_alive = False
+        # Shard serving this session player when its map is handled by a map worker process.
+        self.map_shard = None
+        self.map_shard_session_id = 0
+        self.map_shard_guid = 0
 
         self.incoming_pending = _queue.SimpleQueue()
         self.outgoing_pending = _queue.SimpleQueue()
 
+        # Outgoing batching statistics.
+        self.flush_count = 0
+        self.flushed_packets = 0
+        self.flushed_bytes = 0
+
     def handle(self):
         try:
             if not WORLD_ON:
@@ -76,6 +93,10 @@ class WorldServerSessionHandler:
         if self.keep_alive:
             self.outgoing_pending.put_nowait(data)
 
+    # Sent directly through the socket, skipping queue model, the outgoing thread might not be running yet.
+    def send_auth_response(self, data):
+        self.request.sendall(data)
+
     def process_outgoing(self):
         while self.keep_alive:
             try:
@@ -83,10 +104,47 @@ class WorldServerSessionHandler:
                 # We've been blocking, by now keep_alive might be false.
                 # data can be None if we shutdown the thread.
                 if data and self.keep_alive:
-                    self.request.sendall(data)
+                    buffers, size = self._drain_outgoing(data)
+                    self._send_buffers(buffers, size)
+                    self.record_flush(len(buffers), size)
             except OSError:
                 self.disconnect()
 
+    # Collect every packet currently queued (up to MAX_OUTGOING_BATCH_BYTES or MAX_OUTGOING_BATCH_PACKETS) so they can
+    # be sent at once.
+    def _drain_outgoing(self, data):
+        buffers = [data]
+        size = len(data)
+        while size < MAX_OUTGOING_BATCH_BYTES and len(buffers) < MAX_OUTGOING_BATCH_PACKETS \
+                and not self.outgoing_pending.empty():
+            data = self.outgoing_pending.get_nowait()
+            # Session is shutting down.
+            if not data:
+                break
+            buffers.append(data)
+            size += len(data)
+        return buffers, size
+
+    def _send_buffers(self, buffers, size):
+        if len(buffers) == 1:
+            self.request.sendall(buffers[0])
+        # Vectored send, avoids joining the buffers unless the kernel takes a partial write.
+        elif HAS_SENDMSG:
+            sent = self.request.sendmsg(buffers)
+            if sent < size:
+                self.request.sendall(b''.join(buffers)[sent:])
+        else:
+            self.request.sendall(b''.join(buffers))
+
+    def record_flush(self, packets, size):
+        self.flush_count += 1
+        self.flushed_packets += packets
+        self.flushed_bytes += size
+
+    # Returns flushes, packets and bytes sent by this session.
+    def get_outgoing_stats(self):
+        return self.flush_count, self.flushed_packets, self.flushed_bytes
+
     # noinspection PyBroadException
     def process_incoming(self):
         try:
@@ -94,19 +152,8 @@ class WorldServerSessionHandler:
                 reader = self.incoming_pending.get(block=True, timeout=None)
                 # We've been blocking, by now keep_alive might be false.
                 if reader and self.keep_alive:  # Can be None if we shut down the thread.
-                    if not reader.opcode:
-                        continue
-                    handler, found = Definitions.get_handler_from_packet(self, reader.opcode)
-                    if handler:
-                        res = handler(self, self.request, reader)
-                        if res == 0:
-                            Logger.debug(f'[{self.client_address[0]}] Handling {reader.opcode_str()}')
-                        elif res == 1:
-                            Logger.debug(f'[{self.client_address[0]}] Ignoring {reader.opcode_str()}')
-                        elif res < 0:
-                            break
-                    elif not found:
-                        Logger.warning(f'[{self.client_address[0]}] Received unknown data: {reader.data}')
+                    if not self.handle_packet(reader):
+                        break
                 else:
                     break
         except:
@@ -116,6 +163,25 @@ class WorldServerSessionHandler:
         # End this session.
         self.disconnect()
 
+    # Dispatches a single client packet to its opcode handler, returns False if the session should be ended.
+    def handle_packet(self, reader):
+        if not reader.opcode:
+            return True
+        if MapShardManager.ENABLED and MapShardManager.route_packet(self, reader):
+            return True
+        handler, found = Definitions.get_handler_from_packet(self, reader.opcode)
+        if handler:
+            res = handler(self, self.request, reader)
+            if res == 0:
+                Logger.debug(f'[{self.client_address[0]}] Handling {reader.opcode_str()}')
+            elif res == 1:
+                Logger.debug(f'[{self.client_address[0]}] Ignoring {reader.opcode_str()}')
+            elif res < 0:
+                return False
+        elif not found:
+            Logger.warning(f'[{self.client_address[0]}] Received unknown data: {reader.data}')
+        return True
+
     def disconnect(self):
         # Avoid multiple calls.
         if not self.keep_alive:
@@ -127,6 +193,7 @@ class WorldServerSessionHandler:
                 self.player_mgr.logout()
         except AttributeError:
             pass
+        MapShardManager.release_session(self)
 
         # Unblock and flush queues.
         self.incoming_pending.put_nowait(None)
@@ -137,6 +204,9 @@ class WorldServerSessionHandler:
             self.outgoing_pending.get(block=False, timeout=None)
 
         WorldSessionStateHandler.remove(self)
+        self.close_socket()
+
+    def close_socket(self):
         try:
             self.request.shutdown(socket.SHUT_RDWR)
             self.request.close()
@@ -215,62 +285,12 @@ class WorldServerSessionHandler:
 
     @staticmethod
     def schedule_background_tasks():
-        # Save characters.
-        realm_saving_scheduler = BackgroundScheduler()
-        realm_saving_scheduler._daemon = True
-        realm_saving_scheduler.add_job(WorldSessionStateHandler.save_characters, 'interval',
-                                       seconds=config.Server.Settings.realm_saving_interval_seconds, max_instances=1)
-        realm_saving_scheduler.start()
-
-        # Player updates.
-        player_update_scheduler = BackgroundScheduler()
-        player_update_scheduler._daemon = True
-        player_update_scheduler.add_job(WorldSessionStateHandler.update_players, 'interval', seconds=0.1,
-                                        max_instances=1)
-        player_update_scheduler.start()
-
-        # Player updates.
-        player_update_known_object_scheduler = BackgroundScheduler()
-        player_update_known_object_scheduler._daemon = True
-        player_update_known_object_scheduler.add_job(WorldSessionStateHandler.update_known_players_objects, 'interval',
-                                                     seconds=0.5, max_instances=1)
-        player_update_known_object_scheduler.start()
-
-        # Creature updates.
-        creature_update_scheduler = BackgroundScheduler()
-        creature_update_scheduler._daemon = True
-        creature_update_scheduler.add_job(MapManager.update_creatures, 'interval', seconds=0.2, max_instances=1)
-        creature_update_scheduler.start()
-
-        # Gameobject updates.
-        gameobject_update_scheduler = BackgroundScheduler()
-        gameobject_update_scheduler._daemon = True
-        gameobject_update_scheduler.add_job(MapManager.update_gameobjects, 'interval', seconds=1.0, max_instances=1)
-        gameobject_update_scheduler.start()
-
-        # Dynamicobject updates.
-        dynobject_update_scheduler = BackgroundScheduler()
-        dynobject_update_scheduler._daemon = True
-        dynobject_update_scheduler.add_job(MapManager.update_dynobjects, 'interval', seconds=1.0, max_instances=1)
-        dynobject_update_scheduler.start()
-
-        # Creature and Gameobject spawn updates (mostly to handle respawn logic).
-        spawn_update_scheduler = BackgroundScheduler()
-        spawn_update_scheduler._daemon = True
-        spawn_update_scheduler.add_job(MapManager.update_spawns, 'interval', seconds=1.0, max_instances=1)
-        spawn_update_scheduler.start()
-
-        # Corpses updates.
-        corpses_update_scheduler = BackgroundScheduler()
-        corpses_update_scheduler._daemon = True
-        corpses_update_scheduler.add_job(MapManager.update_corpses, 'interval', seconds=10.0, max_instances=1)
-        corpses_update_scheduler.start()
-
-        # Map events updates.
-        map_events_update_scheduler = BackgroundScheduler()
-        map_events_update_scheduler._daemon = True
-        map_events_update_scheduler.add_job(MapManager.update_map_events, 'interval', seconds=1.0, max_instances=1)
-        map_events_update_scheduler.start()
+        # Save characters, snapshots are taken within the world tick and written by this thread.
+        WorldSessionStateHandler.start_character_writer()
+
+        # World updates (players, creatures, gameobjects, spawns, map events, etc.) run sequentially in a single
+        # fixed timestep loop.
+        WorldTickManager.start()
 
         # MapManager tile loading.
         tile_loading_scheduler = BackgroundScheduler()
@@ -278,12 +298,6 @@ class WorldServerSessionHandler:
         tile_loading_scheduler.add_job(MapManager.initialize_pending_tiles, 'interval', seconds=1.0, max_instances=4)
         tile_loading_scheduler.start()
 
-        # Cell deactivation.
-        cell_unloading_scheduler = BackgroundScheduler()
-        cell_unloading_scheduler._daemon = True
-        cell_unloading_scheduler.add_job(MapManager.deactivate_cells, 'interval', seconds=120.0, max_instances=1)
-        cell_unloading_scheduler.start()
-
         # Chat logging queue.
         if config.Server.Logging.log_player_chat:
             logging_thread = threading.Thread(target=ChatLogManager.process_logs)
@@ -292,8 +306,18 @@ class WorldServerSessionHandler:
 
     @staticmethod
     def start():
+        # Map worker processes load their own data, spawn them first so they boot in parallel.
+        MapShardManager.start_workers()
         WorldLoader.load_data()
 
+        if config.Server.Connection.WorldServer.use_selector_server:
+            from game.world.WorldSelectorServer import WorldSelectorServer
+            WorldServerSessionHandler.schedule_background_tasks()
+            WorldSelectorServer(config.Server.Connection.WorldServer.host,
+                                config.Server.Connection.WorldServer.port,
+                                config.Server.Connection.WorldServer.selector_worker_threads).serve()
+            return
+
         server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         try:
             server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
@@ -0,0 +1,335 @@
+import _queue
+import selectors
+import socket
+import threading
+import traceback
+from struct import pack, unpack
+from time import time
+
+from game.world import WorldManager
+from game.world.WorldManager import WorldServerSessionHandler, MAX_PACKET_BYTES, MAX_OUTGOING_BATCH_BYTES
+from game.world.opcode_handling.Definitions import Definitions
+from network.packet.PacketReader import PacketReader
+from network.packet.PacketWriter import PacketWriter
+from utils.Logger import Logger
+from utils.constants.OpCodes import OpCode
+
+HEADER_SIZE = 6
+RECV_SIZE = 65536
+AUTH_TIMEOUT = 10  # Seconds a client has to answer the auth challenge.
+IDLE_TIMEOUT = 120  # Same as the socket timeout used by threaded sessions.
+IDLE_CHECK_INTERVAL = 5
+# Maximum packets a dispatch thread handles for a session before yielding to others.
+MAX_PACKETS_PER_DISPATCH = 32
+
+
+class WorldSelectorSessionHandler(WorldServerSessionHandler):
+    def __init__(self, server, request, client_address):
+        super().__init__(request, client_address)
+        self.server = server
+        self.keep_alive = True
+        self.authenticated = False
+        self.last_activity = time()
+        self.receive_buffer = bytearray()
+        self.send_buffer = bytearray()
+        self.send_buffer_packets = 0
+        self.send_lock = threading.Lock()
+        self.flush_requested = False
+        self.dispatch_lock = threading.Lock()
+        self.dispatch_scheduled = False
+
+    def enqueue_packets(self, packets):
+        if not self.keep_alive:
+            return
+        with self.send_lock:
+            for packet in packets:
+                self.send_buffer += packet
+                self.send_buffer_packets += 1
+        self._request_flush()
+
+    def enqueue_packet(self, data):
+        if not self.keep_alive or not data:
+            return
+        with self.send_lock:
+            self.send_buffer += data
+            self.send_buffer_packets += 1
+        self._request_flush()
+
+    # The socket is non-blocking and written by the selector thread only, queue it like any other packet.
+    def send_auth_response(self, data):
+        self.enqueue_packet(data)
+
+    def _request_flush(self):
+        if not self.flush_requested:
+            self.flush_requested = True
+            self.server.request_flush(self)
+
+    # Called from the selector thread, returns True if there is still data waiting to be written.
+    def flush(self):
+        self.flush_requested = False
+        with self.send_lock:
+            if not self.send_buffer:
+                return False
+            try:
+                with memoryview(self.send_buffer) as view:
+                    sent = self.request.send(view[:MAX_OUTGOING_BATCH_BYTES])
+            except (BlockingIOError, InterruptedError):
+                return True
+            del self.send_buffer[:sent]
+            # Packets might be split across sends, count them once the buffer is fully drained.
+            if not self.send_buffer:
+                self.record_flush(self.send_buffer_packets, sent)
+                self.send_buffer_packets = 0
+            else:
+                self.record_flush(0, sent)
+            return len(self.send_buffer) > 0
+
+    # Called from the selector thread with freshly received bytes, returns False on malformed data.
+    def feed(self, data):
+        self.last_activity = time()
+        self.receive_buffer += data
+        buffer = self.receive_buffer
+        offset = 0
+        while len(buffer) - offset >= HEADER_SIZE:
+            size = unpack('>H', buffer[offset:offset + 2])[0] - 4
+            if size > MAX_PACKET_BYTES:
+                return False
+            size = max(size, 0)
+            end = offset + HEADER_SIZE + size
+            if len(buffer) < end:
+                break
+            reader = PacketReader(bytes(buffer[offset:offset + HEADER_SIZE]))
+            reader.data = bytes(buffer[offset + HEADER_SIZE:end])
+            self.incoming_pending.put_nowait(reader)
+            offset = end
+        if offset:
+            del buffer[:offset]
+            self.server.schedule_dispatch(self)
+        return True
+
+    # Called from a dispatch thread, handles up to MAX_PACKETS_PER_DISPATCH queued packets in order.
+    # noinspection PyBroadException
+    def dispatch(self):
+        try:
+            for _ in range(MAX_PACKETS_PER_DISPATCH):
+                if not self.keep_alive or self.incoming_pending.empty():
+                    break
+                reader = self.incoming_pending.get_nowait()
+                if not reader:
+                    break
+                if not self.authenticated:
+                    if not self._handle_auth_session(reader):
+                        self.disconnect()
+                        break
+                elif not self.handle_packet(reader):
+                    self.disconnect()
+                    break
+        except:
+            # Can be multiple since it includes handlers execution.
+            Logger.error(traceback.format_exc())
+            self.disconnect()
+
+        with self.dispatch_lock:
+            self.dispatch_scheduled = False
+            reschedule = self.keep_alive and not self.incoming_pending.empty()
+        if reschedule:
+            self.server.schedule_dispatch(self)
+
+    def _handle_auth_session(self, reader):
+        if reader.opcode != OpCode.CMSG_AUTH_SESSION:
+            return False
+        handler, found = Definitions.get_handler_from_packet(self, reader.opcode)
+        self.authenticated = handler(self, self.request, reader) == 0
+        return self.authenticated
+
+    def is_timed_out(self, now):
+        timeout = IDLE_TIMEOUT if self.authenticated else AUTH_TIMEOUT
+        return now - self.last_activity > timeout
+
+    # The socket is owned by the selector thread, let it unregister and close it.
+    def close_socket(self):
+        self.server.request_close(self)
+
+    def close_socket_now(self):
+        super().close_socket()
+
+
+class WorldSelectorServer:
+    def __init__(self, host, port, worker_threads):
+        self.host = host
+        self.port = port
+        self.worker_threads = max(1, worker_threads)
+        self.selector = selectors.DefaultSelector()
+        self.sessions = set()
+        self.dispatch_queue = _queue.SimpleQueue()
+        self.pending_lock = threading.Lock()
+        self.pending_flush = set()
+        self.pending_close = set()
+        self.wakeup_requested = False
+        self.wakeup_reader, self.wakeup_writer = socket.socketpair()
+        self.wakeup_reader.setblocking(False)
+        self.wakeup_writer.setblocking(False)
+        self.last_idle_check = time()
+
+    def serve(self):
+        server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        # Use SO_REUSEADDR if SO_REUSEPORT doesn't exist.
+        except AttributeError:
+            server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server_socket.bind((self.host, self.port))
+        server_socket.listen()
+        server_socket.setblocking(False)
+
+        self.selector.register(server_socket, selectors.EVENT_READ, None)
+        self.selector.register(self.wakeup_reader, selectors.EVENT_READ, None)
+
+        for index in range(self.worker_threads):
+            worker_thread = threading.Thread(target=self._process_dispatch_queue, name=f'World dispatch {index}')
+            worker_thread.daemon = True
+            worker_thread.start()
+
+        real_binding = server_socket.getsockname()
+        Logger.success(f'World server started (selector mode, {self.worker_threads} dispatch threads), '
+                       f'listening on {real_binding[0]}:{real_binding[1]}\a')
+
+        while WorldManager.WORLD_ON:
+            # noinspection PyBroadException
+            try:
+                for key, events in self.selector.select(timeout=1.0):
+                    if key.fileobj is server_socket:
+                        self._accept(server_socket)
+                    elif key.fileobj is self.wakeup_reader:
+                        self._drain_wakeup()
+                    else:
+                        self._handle_session_events(key.data, events)
+                self._process_pending()
+                self._check_idle_sessions()
+            except:
+                Logger.error(traceback.format_exc())
+                break
+
+        # Unblock dispatch threads.
+        for _ in range(self.worker_threads):
+            self.dispatch_queue.put_nowait(None)
+
+    def schedule_dispatch(self, session):
+        with session.dispatch_lock:
+            if session.dispatch_scheduled:
+                return
+            session.dispatch_scheduled = True
+        self.dispatch_queue.put_nowait(session.dispatch)
+
+    def request_flush(self, session):
+        with self.pending_lock:
+            self.pending_flush.add(session)
+            self._wakeup()
+
+    def request_close(self, session):
+        with self.pending_lock:
+            self.pending_close.add(session)
+            self._wakeup()
+
+    # Must be called holding pending_lock, so the flag can't be checked in between a drain and its reset.
+    def _wakeup(self):
+        if self.wakeup_requested:
+            return
+        self.wakeup_requested = True
+        try:
+            self.wakeup_writer.send(b'\x00')
+        except (BlockingIOError, InterruptedError):
+            pass
+
+    # The flag is only reset once every byte has been consumed, pending work queued meanwhile is handled by the
+    # _process_pending call following this select round.
+    def _drain_wakeup(self):
+        with self.pending_lock:
+            try:
+                while self.wakeup_reader.recv(4096):
+                    continue
+            except (BlockingIOError, InterruptedError):
+                pass
+            self.wakeup_requested = False
+
+    def _process_dispatch_queue(self):
+        while WorldManager.WORLD_ON:
+            task = self.dispatch_queue.get(block=True, timeout=None)
+            if not task:
+                break
+            task()
+
+    def _accept(self, server_socket):
+        try:
+            client_socket, client_address = server_socket.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+        client_socket.setblocking(False)
+        session = WorldSelectorSessionHandler(self, client_socket, client_address)
+        self.sessions.add(session)
+        self.selector.register(client_socket, selectors.EVENT_READ, session)
+        # Request challenge, auth session is handled upon the first received packet.
+        session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_AUTH_CHALLENGE, pack('<I', 0)))
+
+    def _handle_session_events(self, session, events):
+        if events & selectors.EVENT_READ:
+            try:
+                data = session.request.recv(RECV_SIZE)
+            except (BlockingIOError, InterruptedError):
+                data = None
+            except OSError:
+                data = b''
+            # Connection closed or malformed packet, ending the session might involve a logout, so let a dispatch
+            # thread take care of it.
+            if data == b'' or (data and not session.feed(data)):
+                self._unregister(session)
+                self.dispatch_queue.put_nowait(session.disconnect)
+                return
+
+        if events & selectors.EVENT_WRITE:
+            self._flush(session)
+
+    def _flush(self, session):
+        if session not in self.sessions:
+            return
+        try:
+            pending = session.flush()
+        except OSError:
+            self._unregister(session)
+            self.dispatch_queue.put_nowait(session.disconnect)
+            return
+        events = selectors.EVENT_READ | selectors.EVENT_WRITE if pending else selectors.EVENT_READ
+        if self.selector.get_key(session.request).events != events:
+            self.selector.modify(session.request, events, session)
+
+    def _process_pending(self):
+        with self.pending_lock:
+            pending_flush = self.pending_flush
+            pending_close = self.pending_close
+            self.pending_flush = set()
+            self.pending_close = set()
+
+        for session in pending_flush:
+            self._flush(session)
+
+        for session in pending_close:
+            self._unregister(session)
+            session.close_socket_now()
+
+    def _unregister(self, session):
+        if session in self.sessions:
+            self.sessions.discard(session)
+            try:
+                self.selector.unregister(session.request)
+            except (KeyError, ValueError):
+                pass
+
+    def _check_idle_sessions(self):
+        now = time()
+        if now - self.last_idle_check < IDLE_CHECK_INTERVAL:
+            return
+        self.last_idle_check = now
+        for session in list(self.sessions):
+            if session.is_timed_out(now):
+                self._unregister(session)
+                self.dispatch_queue.put_nowait(session.disconnect)
@@ -1,9 +1,22 @@
+import threading
 import time
+import traceback
+from queue import SimpleQueue
+
 from database.realm.RealmDatabaseManager import *
+from game.world.managers.objects.units.player.CharacterNameCache import CharacterNameCache
+from game.world.managers.objects.units.player.WhoManager import WhoManager
+from game.world.opcode_handling.handlers.interface.CharEnumHandler import CharEnumHandler
 from utils.Logger import Logger
 
 WORLD_SESSIONS = []
 
+# Character saves are snapshotted into plain mappings by the caller and written in order by a single writer thread,
+# each entry is (characters, quest_statuses, pets, saved_pets, done_event). saved_pets are the (pet, changes) to confirm
+# once the entry is committed.
+CHARACTER_SAVE_QUEUE = SimpleQueue()
+CHARACTER_WRITER = None
+
 # Storing players and sessions by different parameters to keep searches O(1)
 # TODO Find better way to do this?
 PLAYERS_BY_GUID = {}
@@ -28,6 +41,8 @@ class WorldSessionStateHandler(object):
         PLAYER_BY_NAME[lowercase_name] = session.player_mgr
         SESSION_BY_GUID[session.player_mgr.guid] = session
         SESSION_BY_NAME[lowercase_name] = session
+        CharacterNameCache.add_shared(session.player_mgr.player)
+        WhoManager.add_player(session.player_mgr)
 
     @staticmethod
     def pop_active_player(player_mgr):
@@ -44,6 +59,12 @@ class WorldSessionStateHandler(object):
         if player_mgr.guid in SESSION_BY_GUID:
             SESSION_BY_GUID.pop(player_mgr.guid)
 
+        WhoManager.remove_player(player_mgr)
+        # Character was saved right before leaving the world, its fingerprints are only needed while in world.
+        RealmDatabaseManager.forget_fingerprints(player_mgr.guid)
+        # Level, location, equipment, etc. might have changed while in world.
+        CharEnumHandler.invalidate(player_mgr.player.account_id)
+
     @staticmethod
     def remove(session):
         if session in WORLD_SESSIONS:
@@ -106,20 +127,73 @@ class WorldSessionStateHandler(object):
             session.player_mgr.update_known_world_objects()
 
     @staticmethod
-    def save_characters():
-        try:
-            for session in WorldSessionStateHandler.get_world_sessions():
-                if session.player_mgr and session.player_mgr.online:
-                    WorldSessionStateHandler.save_character(session.player_mgr)
-        except AttributeError as ae:
-            Logger.error(f'Error while saving all active characters into db: {ae}.')
+    def start_character_writer():
+        global CHARACTER_WRITER
+        if CHARACTER_WRITER:
+            return
+        CHARACTER_WRITER = threading.Thread(target=WorldSessionStateHandler._process_character_saves,
+                                            name='Character writer')
+        CHARACTER_WRITER.daemon = True
+        CHARACTER_WRITER.start()
 
+    # Called from the world tick, only snapshots player state, the database work happens on the writer thread.
+    @staticmethod
+    def save_characters():
+        characters, quest_statuses, pets, saved_pets = [], [], [], []
+        for session in WorldSessionStateHandler.get_world_sessions():
+            if session.player_mgr and session.player_mgr.online:
+                WorldSessionStateHandler._snapshot_character(session.player_mgr, characters, quest_statuses, pets,
+                                                             saved_pets)
+        if characters:
+            WorldSessionStateHandler._write_characters(characters, quest_statuses, pets, saved_pets, wait=False)
+
+    # Blocks until the character is persisted, so callers can rely on the db state right after (logout, transfers).
     @staticmethod
     def save_character(player_mgr):
+        characters, quest_statuses, pets, saved_pets = [], [], [], []
+        WorldSessionStateHandler._snapshot_character(player_mgr, characters, quest_statuses, pets, saved_pets)
+        if characters:
+            WorldSessionStateHandler._write_characters(characters, quest_statuses, pets, saved_pets, wait=True)
+
+    @staticmethod
+    def _snapshot_character(player_mgr, characters, quest_statuses, pets, saved_pets):
         try:
             player_mgr.synchronize_db_player()
-            RealmDatabaseManager.character_update(player_mgr.player)
-            player_mgr.pet_manager.save()
-            player_mgr.quest_manager.save()
+            character = RealmDatabaseManager.get_row_mapping(player_mgr.player)
+            pets.extend(player_mgr.pet_manager.get_save_mappings(saved_pets))
+            quest_statuses.extend(player_mgr.quest_manager.get_save_mappings())
+            characters.append(character)
         except AttributeError as ae:
             Logger.error(f'Error while saving {player_mgr.get_name()} ({player_mgr.player.guid}) into db: {ae}.')
+
+    @staticmethod
+    def _write_characters(characters, quest_statuses, pets, saved_pets, wait):
+        # No writer running (e.g. tools or shutdown), write synchronously.
+        if not CHARACTER_WRITER or not CHARACTER_WRITER.is_alive():
+            WorldSessionStateHandler._flush_characters(characters, quest_statuses, pets, saved_pets)
+            return
+
+        done_event = threading.Event() if wait else None
+        CHARACTER_SAVE_QUEUE.put((characters, quest_statuses, pets, saved_pets, done_event))
+        if done_event:
+            done_event.wait()
+
+    @staticmethod
+    def _process_character_saves():
+        while True:
+            characters, quest_statuses, pets, saved_pets, done_event = CHARACTER_SAVE_QUEUE.get()
+            WorldSessionStateHandler._flush_characters(characters, quest_statuses, pets, saved_pets)
+            if done_event:
+                done_event.set()
+
+    # noinspection PyBroadException
+    @staticmethod
+    def _flush_characters(characters, quest_statuses, pets, saved_pets):
+        try:
+            RealmDatabaseManager.character_bulk_update(characters, quest_statuses, pets)
+        except:
+            Logger.error(f'Error while saving {len(characters)} character(s) into db:\n{traceback.format_exc()}')
+            return
+        # Pets are only considered saved once committed, otherwise they stay dirty and are written again next time.
+        for pet, changes in saved_pets:
+            pet.mark_saved(changes)
@@ -0,0 +1,98 @@
+import hashlib
+import os
+import pickle
+
+from database.dbc.DbcDatabaseManager import DbcDatabaseManager
+from database.world.WorldDatabaseManager import WorldDatabaseManager
+from utils.ConfigManager import config
+from utils.Logger import Logger
+from utils.PathManager import PathManager
+
+# Must be increased whenever any holder changes the layout of its data, invalidates existing snapshots.
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+# Binary snapshot of the world and DBC template holders as filled by WorldLoader. The file contains two pickles, the
+# version key the data was built for, followed by the holders data, so stale snapshots are detected without reading
+# the whole file.
+class WorldSnapshot:
+
+    @staticmethod
+    def load(version_key) -> bool:
+        snapshot_path = PathManager.get_world_snapshot_path()
+        if not os.path.isfile(snapshot_path):
+            return False
+
+        try:
+            with open(snapshot_path, 'rb') as snapshot_file:
+                if pickle.load(snapshot_file) != version_key:
+                    Logger.info('[WorldSnapshot] Databases were updated, rebuilding world snapshot.')
+                    return False
+                holders_data = pickle.load(snapshot_file)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError) as e:
+            Logger.warning(f'[WorldSnapshot] Unable to read world snapshot: {e}')
+            return False
+
+        holders = WorldSnapshot._get_holders()
+        for holder_name, holder_data in holders_data.items():
+            holder = holders.get(holder_name)
+            if not holder:
+                continue
+            for attribute, value in holder_data.items():
+                WorldSnapshot._restore_attribute(holder, attribute, value)
+
+        Logger.success(f'[WorldSnapshot] Loaded world data from {snapshot_path}.')
+        return True
+
+    @staticmethod
+    def save(version_key):
+        holders_data = {}
+        for holder_name, holder in WorldSnapshot._get_holders().items():
+            holders_data[holder_name] = {attribute: value for attribute, value in vars(holder).items()
+                                         if attribute.isupper() and isinstance(value, (dict, list, bytearray))}
+
+        snapshot_path = PathManager.get_world_snapshot_path()
+        temporary_path = f'{snapshot_path}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+            with open(temporary_path, 'wb') as snapshot_file:
+                pickle.dump(version_key, snapshot_file, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(holders_data, snapshot_file, protocol=pickle.HIGHEST_PROTOCOL)
+            # Replace the previous snapshot only once the new one is complete.
+            os.replace(temporary_path, snapshot_path)
+        except (OSError, pickle.PicklingError) as e:
+            Logger.warning(f'[WorldSnapshot] Unable to write world snapshot: {e}')
+            return
+
+        Logger.success(f'[WorldSnapshot] Saved world data to {snapshot_path}.')
+
+    # Identifies the databases contents a snapshot was built from, based on their applied updates.
+    @staticmethod
+    def get_version_key():
+        updates_hash = hashlib.sha256()
+        updates_hash.update(repr(sorted(WorldDatabaseManager.applied_updates_get_all())).encode())
+        updates_hash.update(repr(sorted(WorldDatabaseManager.item_applied_updates_get_all())).encode())
+        updates_hash.update(repr(sorted(DbcDatabaseManager.applied_updates_get_all())).encode())
+        return (SNAPSHOT_FORMAT_VERSION, config.Server.Settings.load_gameobjects,
+                config.Server.Settings.load_creatures, updates_hash.hexdigest())
+
+    @staticmethod
+    def _get_holders():
+        holders = {}
+        for manager in (WorldDatabaseManager, DbcDatabaseManager):
+            for name, value in vars(manager).items():
+                if isinstance(value, type) and name.endswith('Holder'):
+                    holders[f'{manager.__name__}.{name}'] = value
+        return holders
+
+    # Fills the existing containers instead of replacing them, in case any module kept a reference to them.
+    @staticmethod
+    def _restore_attribute(holder, attribute, value):
+        current_value = getattr(holder, attribute, None)
+        if isinstance(current_value, dict) and isinstance(value, dict):
+            current_value.clear()
+            current_value.update(value)
+        elif isinstance(current_value, (list, bytearray)) and isinstance(value, type(current_value)):
+            current_value[:] = value
+        else:
+            setattr(holder, attribute, value)
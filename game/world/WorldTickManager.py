@@ -0,0 +1,127 @@
+import threading
+import time
+import traceback
+
+from game.world.WorldSessionStateHandler import WorldSessionStateHandler
+from game.world.managers.maps.MapManager import MapManager
+from utils.ConfigManager import config
+from utils.Logger import Logger
+
+# Fixed world timestep, in seconds.
+TICK_INTERVAL = 0.1
+# Minimum seconds between two overrun warnings.
+OVERRUN_WARNING_INTERVAL = 10.0
+
+
+class WorldTickPhase:
+    def __init__(self, name, function, interval):
+        self.name = name
+        self.function = function
+        self.interval = interval
+        self.next_run = 0
+        self.runs = 0
+        self.last_duration = 0
+        self.max_duration = 0
+        self.total_duration = 0
+
+    def is_due(self, now):
+        return now >= self.next_run
+
+    # noinspection PyBroadException
+    def run(self, now):
+        # Keep the phase cadence aligned to its interval unless we fell behind a whole period.
+        self.next_run = self.next_run + self.interval if now - self.next_run < self.interval else now + self.interval
+        start = time.perf_counter()
+        try:
+            self.function()
+        except:
+            Logger.error(f'Error on world tick phase {self.name}:\n{traceback.format_exc()}')
+        duration = time.perf_counter() - start
+        self.runs += 1
+        self.last_duration = duration
+        self.max_duration = max(self.max_duration, duration)
+        self.total_duration += duration
+        return duration
+
+    def get_average_duration(self):
+        return self.total_duration / self.runs if self.runs else 0
+
+
+# Phases run sequentially and always in this order within a tick, each one at its own interval.
+PHASES = [
+    WorldTickPhase('players', WorldSessionStateHandler.update_players, 0.1),
+    WorldTickPhase('known_objects', WorldSessionStateHandler.update_known_players_objects, 0.5),
+    WorldTickPhase('creatures', MapManager.update_creatures, 0.2),
+    WorldTickPhase('gameobjects', MapManager.update_gameobjects, 1.0),
+    WorldTickPhase('dynobjects', MapManager.update_dynobjects, 1.0),
+    WorldTickPhase('spawns', MapManager.update_spawns, 1.0),
+    WorldTickPhase('corpses', MapManager.update_corpses, 10.0),
+    WorldTickPhase('map_events', MapManager.update_map_events, 1.0),
+    WorldTickPhase('cell_deactivation', MapManager.deactivate_cells, 120.0),
+    WorldTickPhase('character_saving', WorldSessionStateHandler.save_characters,
+                   config.Server.Settings.realm_saving_interval_seconds),
+]
+
+
+class WorldTickManager:
+    TICKS = 0
+    OVERRUNS = 0
+    LAST_TICK_DURATION = 0
+    MAX_TICK_DURATION = 0
+    LAST_OVERRUN_WARNING = 0
+
+    @staticmethod
+    def start():
+        tick_thread = threading.Thread(target=WorldTickManager._run, name='World tick')
+        tick_thread.daemon = True
+        tick_thread.start()
+
+    @staticmethod
+    def _run():
+        from game.world import WorldManager
+        next_tick = time.time()
+        while WorldManager.WORLD_ON:
+            WorldTickManager.tick(time.time())
+
+            next_tick += TICK_INTERVAL
+            now = time.time()
+            # We are more than a whole tick behind, resynchronize instead of trying to catch up.
+            if now - next_tick > TICK_INTERVAL:
+                next_tick = now
+            elif next_tick > now:
+                time.sleep(next_tick - now)
+
+    @staticmethod
+    def tick(now):
+        start = time.perf_counter()
+        for phase in PHASES:
+            if phase.is_due(now):
+                phase.run(now)
+        duration = time.perf_counter() - start
+
+        WorldTickManager.TICKS += 1
+        WorldTickManager.LAST_TICK_DURATION = duration
+        WorldTickManager.MAX_TICK_DURATION = max(WorldTickManager.MAX_TICK_DURATION, duration)
+        if duration > TICK_INTERVAL:
+            WorldTickManager.OVERRUNS += 1
+            WorldTickManager._warn_overrun(now, duration)
+
+    @staticmethod
+    def _warn_overrun(now, duration):
+        if now - WorldTickManager.LAST_OVERRUN_WARNING < OVERRUN_WARNING_INTERVAL:
+            return
+        WorldTickManager.LAST_OVERRUN_WARNING = now
+        phases = ', '.join(f'{phase.name}: {phase.last_duration * 1000:.1f}ms' for phase in PHASES
+                           if phase.last_duration)
+        Logger.warning(f'World tick overrun, took {duration * 1000:.1f}ms '
+                       f'(budget {TICK_INTERVAL * 1000:.0f}ms). Last phase timings: {phases}.')
+
+    @staticmethod
+    def get_stats_message():
+        message = f'Ticks: {WorldTickManager.TICKS}, Overruns: {WorldTickManager.OVERRUNS}, ' \
+                  f'Last: {WorldTickManager.LAST_TICK_DURATION * 1000:.1f}ms, ' \
+                  f'Max: {WorldTickManager.MAX_TICK_DURATION * 1000:.1f}ms.'
+        for phase in PHASES:
+            message += f'\n{phase.name}: avg {phase.get_average_duration() * 1000:.1f}ms, ' \
+                       f'max {phase.max_duration * 1000:.1f}ms, runs {phase.runs}.'
+        return message
@@ -843,6 +843,33 @@ class CommandManager(object):
 
         return 0, message
 
+    @staticmethod
+    def netstats(world_session, args):
+        if args and args.strip() == 'all':
+            sessions = WorldSessionStateHandler.get_world_sessions()
+            label = f'{len(sessions)} sessions'
+        else:
+            player_mgr = CommandManager._target_or_self(world_session, only_players=True)
+            sessions = [player_mgr.session]
+            label = player_mgr.get_name()
+
+        flushes, packets, bytes_ = 0, 0, 0
+        for session in sessions:
+            session_flushes, session_packets, session_bytes = session.get_outgoing_stats()
+            flushes += session_flushes
+            packets += session_packets
+            bytes_ += session_bytes
+
+        avg_packets = packets / flushes if flushes else 0
+        avg_bytes = bytes_ / flushes if flushes else 0
+        return 0, f'[{label}] Flushes: {flushes}, Packets: {packets} ({avg_packets:.2f} per flush), ' \
+                  f'Bytes: {bytes_} ({avg_bytes:.2f} per flush).'
+
+    @staticmethod
+    def tickinfo(world_session, args):
+        from game.world.WorldTickManager import WorldTickManager
+        return 0, WorldTickManager.get_stats_message()
+
     @staticmethod
     def createmonster(world_session, args):
         try:
@@ -964,6 +991,8 @@ GM_COMMAND_DEFINITIONS = {
     'die': [CommandManager.die, 'kills target or yourself if no target is selected'],
     'los': [CommandManager.los, 'check unit line of sight'],
     'kick': [CommandManager.kick, 'kick your target from the server'],
+    'tickinfo': [CommandManager.tickinfo, 'print world tick timings for each update phase'],
+    'netstats': [CommandManager.netstats, 'print outgoing packet batching stats for your target, or \'all\''],
     'guildcreate': [CommandManager.guildcreate, 'create and join a guild'],
     'alltaxis': [CommandManager.alltaxis, 'discover all flight paths'],
     'squest': [CommandManager.squest, 'search quests'],
@@ -45,6 +45,13 @@ class Vector(object):
             # Calculate destination Z, default Z if not possible.
             return MapManager.calculate_z(map_id, x, y, default_z)
 
+    # Batched version of calculate_z, points are (x, y, default_z) tuples.
+    @staticmethod
+    def calculate_z_batch(points, map_id) -> list:  # [(float, z_locked)]
+        if map_id == -1 or (not config.Server.Settings.use_map_tiles and not config.Server.Settings.use_nav_tiles):
+            return [(default_z, False) for x, y, default_z in points]
+        return MapManager.calculate_z_batch(map_id, points)
+
     def get_ray_vector(self, world_object=None, is_terrain=False):
         new_vector = self.copy()
         if world_object:
@@ -144,6 +151,17 @@ class Vector(object):
 
         return Vector(x, y, z, z_locked=z_locked)
 
+    # One random point per given radius, Z for all of them is resolved at once.
+    def get_random_points_in_radius(self, radiuses, map_id=-1):
+        points = []
+        for radius in radiuses:
+            r = radius * math.sqrt(random())
+            theta = random() * 2 * math.pi
+            points.append((self.x + (r * math.cos(theta)), self.y + (r * math.sin(theta)), self.z))
+
+        return [Vector(x, y, z, z_locked=z_locked)
+                for (x, y, default_z), (z, z_locked) in zip(points, Vector.calculate_z_batch(points, map_id))]
+
     def get_point_in_radius_and_angle(self, radius, angle, final_orientation=-1, map_id=-1):
         x = self.x + (radius * math.cos(self.o + angle))
         y = self.y + (radius * math.sin(self.o + angle))
@@ -1,17 +1,22 @@
+from game.world.managers.maps.helpers.CellUtils import CELL_SIZE, TOLERANCE, CellUtils
 from game.world.managers.objects.farsight.FarSightManager import FarSightManager
 from utils.constants.MiscCodes import ObjectTypeIds
 from threading import RLock
 
 
 class Cell:
-    def __init__(self, min_x=0.0, min_y=0.0, max_x=0.0, max_y=0.0, map_id=0, instance_id=0, key=''):
-        self.min_x = min_x
-        self.min_y = min_y
-        self.max_x = max_x
-        self.max_y = max_y
+    def __init__(self, cell_x=0, cell_y=0, map_id=0, instance_id=0):
+        self.cell_x = cell_x
+        self.cell_y = cell_y
+        self.max_x = cell_x * CELL_SIZE - TOLERANCE
+        self.max_y = cell_y * CELL_SIZE - TOLERANCE
+        self.min_x = self.max_x - CELL_SIZE + TOLERANCE
+        self.min_y = self.max_y - CELL_SIZE + TOLERANCE
         self.map_id = map_id
         self.instance_id = instance_id
-        self.key = key
+        self.key = CellUtils.pack_cell_key(cell_x, cell_y, map_id, instance_id)
+        # Existing cells around this one (including itself), maintained by GridManager upon cell creation.
+        self.neighbours: list[Cell] = [self]
         # Cell lock.
         self.cell_lock = RLock()
         # Instances.
@@ -20,12 +25,15 @@ class Cell:
         self.players = dict()
         self.dynamic_objects = dict()
         self.corpses = dict()
+        # Creatures able to aggro on proximity (detection range above 0), subset of creatures.
+        self.aggro_creatures = dict()
         # Spawns.
         self.creatures_spawns = dict()
         self.gameobject_spawns = dict()
 
-        if not key:
-            self.key = f'{round(self.min_x, 5)}:{round(self.min_y, 5)}:{round(self.max_x, 5)}:{round(self.max_y, 5)}:{self.map_id}:{self.instance_id}'
+    def link_neighbour(self, cell):
+        if cell is not self and cell not in self.neighbours:
+            self.neighbours.append(cell)
 
     def has_players(self):
         return len(self.players) > 0
@@ -60,6 +68,8 @@ class Cell:
             self.players[world_object.guid] = world_object
         elif world_object.get_type_id() == ObjectTypeIds.ID_UNIT:
             self.creatures[world_object.guid] = world_object
+            if world_object.creature_template and world_object.creature_template.detection_range > 0:
+                self.aggro_creatures[world_object.guid] = world_object
         elif world_object.get_type_id() == ObjectTypeIds.ID_GAMEOBJECT:
             self.gameobjects[world_object.guid] = world_object
         elif world_object.get_type_id() == ObjectTypeIds.ID_DYNAMICOBJECT:
@@ -71,6 +81,41 @@ class Cell:
         if camera:
             FarSightManager.update_camera_cell_placement(world_object, self)
 
+    # Appends to candidates the aggressive creatures of this cell whose detection radius reaches any of the given
+    # locations. Distances are compared squared, with a small margin since Vector.distance() rounds its result.
+    def get_aggro_candidates(self, locations, candidates):
+        for creature in list(self.aggro_creatures.values()):
+            radius = creature.creature_template.detection_range + 0.001
+            radius_sqrd = radius * radius
+            creature_location = creature.location
+            for location in locations:
+                d_x = creature_location.x - location.x
+                d_y = creature_location.y - location.y
+                d_z = creature_location.z - location.z
+                if d_x * d_x + d_y * d_y + d_z * d_z <= radius_sqrd:
+                    candidates.append(creature)
+                    break
+        return candidates
+
+    # Build the world objects of spawns that were never instantiated or were released while idle.
+    def materialize_spawns(self):
+        for spawn_creature in list(self.creatures_spawns.values()):
+            spawn_creature.materialize()
+        for spawn_gameobject in list(self.gameobject_spawns.values()):
+            spawn_gameobject.materialize()
+
+    # Release the world objects of spawns still standing in this cell, active_cell_keys is used to skip the ones
+    # that wandered into an active cell.
+    def dematerialize_spawns(self, active_cell_keys):
+        for spawn_creature in list(self.creatures_spawns.values()):
+            creature = spawn_creature.creature_instance
+            if creature and creature.current_cell not in active_cell_keys:
+                spawn_creature.dematerialize()
+        for spawn_gameobject in list(self.gameobject_spawns.values()):
+            gameobject = spawn_gameobject.gameobject_instance
+            if gameobject and gameobject.current_cell not in active_cell_keys:
+                spawn_gameobject.dematerialize()
+
     def update_creatures(self, now):
         with self.cell_lock:
             # Update creature instances.
@@ -137,6 +182,7 @@ class Cell:
             return True
         elif world_object.get_type_id() == ObjectTypeIds.ID_UNIT and guid in self.creatures:
             self.creatures.pop(world_object.guid, None)
+            self.aggro_creatures.pop(world_object.guid, None)
             return True
         elif world_object.get_type_id() == ObjectTypeIds.ID_GAMEOBJECT and guid in self.gameobjects:
             self.gameobjects.pop(world_object.guid, None)
@@ -149,10 +195,13 @@ class Cell:
             return True
         return False
 
-    def send_all(self, packet, source, include_source=False, exclude=None, use_ignore=False):
-        players_reached = set()
+    # Returns the guids of the players who received the packet, a set can be provided in order to share it between
+    # multiple cells, players already in it are skipped.
+    def send_all(self, packet, source, include_source=False, exclude=None, use_ignore=False, players_reached=None):
+        if players_reached is None:
+            players_reached = set()
         for guid, player_mgr in list(self.players.items()):
-            if player_mgr.online:
+            if player_mgr.online and guid not in players_reached:
                 if not include_source and player_mgr.guid == source.guid:
                     continue
                 if exclude and player_mgr.guid in exclude:
@@ -169,12 +218,19 @@ class Cell:
         for camera in FarSightManager.get_cell_cameras(self):
             camera.broadcast_packet(packet, exclude=players_reached)
 
-    def send_all_in_range(self, packet, range_, source, include_source=True, exclude=None, use_ignore=False):
+        return players_reached
+
+    def send_all_in_range(self, packet, range_, source, include_source=True, exclude=None, use_ignore=False,
+                          players_reached=None):
         if range_ <= 0:
-            self.send_all(packet, source, exclude)
+            return self.send_all(packet, source, include_source=include_source, exclude=exclude,
+                                 use_ignore=use_ignore, players_reached=players_reached)
         else:
-            players_reached = set()
+            if players_reached is None:
+                players_reached = set()
             for guid, player_mgr in list(self.players.items()):
+                if guid in players_reached:
+                    continue
                 if player_mgr.online and player_mgr.location.distance(source.location) <= range_:
                     if not include_source and player_mgr.guid == source.guid:
                         continue
@@ -189,3 +245,5 @@ class Cell:
             # If this cell has cameras, route packets.
             for camera in FarSightManager.get_cell_cameras(self):
                 camera.broadcast_packet(packet, exclude=players_reached)
+
+            return players_reached
@@ -3,8 +3,9 @@ from threading import RLock
 import time
 
 from game.world.managers.maps.Cell import Cell
-from game.world.managers.maps.helpers.CellUtils import CELL_SIZE, CellUtils
+from game.world.managers.maps.helpers.CellUtils import CellUtils
 from game.world.managers.objects.farsight.FarSightManager import FarSightManager
+from utils.ConfigManager import config
 from utils.Logger import Logger
 from utils.constants.MiscCodes import ObjectTypeIds
 
@@ -14,8 +15,10 @@ class GridManager:
         self.map_id = map_id
         self.grid_lock = RLock()
         self.instance_id = instance_id
-        self.active_cell_keys: set[str] = set()
-        self.cells: dict[str, Cell] = {}
+        self.active_cell_keys: set[int] = set()
+        # Deactivation timestamps of cells whose spawns are still instantiated.
+        self.idle_cell_keys: dict[int, float] = {}
+        self.cells: dict[int, Cell] = {}
         self.active_cell_callback = active_cell_callback
 
     def spawn_object(self, world_object_spawn=None, world_object_instance=None):
@@ -56,7 +59,8 @@ class GridManager:
         if current_cell_key != source_cell_key:
             if current_cell_key not in self.active_cell_keys:
                 self._activate_cell_by_world_object(world_object)
-                Logger.warning(f'Unit {world_object.get_name()} triggered inactive cell {current_cell_key}')
+                Logger.warning(f'Unit {world_object.get_name()} triggered inactive cell '
+                               f'{CellUtils.cell_key_to_str(current_cell_key)}')
             world_object.on_cell_change()
 
     # Remove a world_object from its cell and notify surrounding players if required.
@@ -67,7 +71,7 @@ class GridManager:
 
     def unit_should_relocate(self, world_object, destination, destination_map, destination_instance):
         destination_cells = self._get_surrounding_cells_by_location(destination.x, destination.y, destination_map, destination_instance)
-        current_cell = self.get_cells()[world_object.current_cell]
+        current_cell = self.cells.get(world_object.current_cell)
         return current_cell in destination_cells
 
     def is_active_cell(self, cell_key):
@@ -79,10 +83,12 @@ class GridManager:
 
     # TODO: Should cleanup loaded tiles for deactivated cells.
     def deactivate_cells(self):
+        now = time.time()
+        unload_idle_seconds = config.Server.Settings.unload_idle_cells_seconds
         with self.grid_lock:
             for cell_key in list(self.active_cell_keys):
                 players_near = False
-                for cell in self._get_surrounding_cells_by_cell(self.cells[cell_key]):
+                for cell in self.cells[cell_key].neighbours:
                     if cell.has_players() or cell.has_cameras():
                         players_near = True
                         break
@@ -91,8 +97,20 @@ class GridManager:
                 if not players_near:
                     cell = self.cells[cell_key]
                     self.active_cell_keys.discard(cell_key)
+                    self.idle_cell_keys[cell_key] = now
                     cell.stop_movement()
 
+            idle_cells = []
+            if unload_idle_seconds > 0:
+                for cell_key, deactivation_time in list(self.idle_cell_keys.items()):
+                    if now - deactivation_time >= unload_idle_seconds:
+                        del self.idle_cell_keys[cell_key]
+                        idle_cells.append(self.cells[cell_key])
+
+        # Release spawned world objects of cells nobody visited for a long time.
+        for cell in idle_cells:
+            cell.dematerialize_spawns(self.active_cell_keys)
+
     def _add_world_object_spawn(self, world_object_spawn):
         cell = self._get_create_cell(world_object_spawn.location, world_object_spawn.map_id, world_object_spawn.instance_id)
         cell.add_world_object_spawn(world_object_spawn)
@@ -127,16 +145,27 @@ class GridManager:
         self._activate_cells(affected_cells)
 
     def _activate_cells(self, cells: list[Cell]):
+        activated_cells = []
         with self.grid_lock:
             for cell in cells:
                 if cell.key not in self.active_cell_keys:
                     self.active_cell_keys.add(cell.key)
+                    self.idle_cell_keys.pop(cell.key, None)
+                    activated_cells.append(cell)
+
+        # Spawns are only instantiated once their cell is activated.
+        for cell in activated_cells:
+            cell.materialize_spawns()
 
     def _load_maps_for_cells(self, cells):
         for cell in cells:
             if cell.key not in self.active_cell_keys:
                 for creature in list(cell.creatures.values()):
                     self.active_cell_callback(creature)
+                # Spawns about to be instantiated.
+                for spawn in list(cell.creatures_spawns.values()):
+                    if not spawn.materialized:
+                        self.active_cell_callback(spawn)
 
     def _update_players_surroundings(self, cell_key, exclude_cells=None, world_object=None, has_changes=False, has_inventory_changes=False):
         # Avoid update calls if no players are present.
@@ -148,7 +177,7 @@ class GridManager:
         affected_cells = set()
         source_cell = self.cells.get(cell_key)
         if source_cell:
-            for cell in self._get_surrounding_cells_by_cell(source_cell):
+            for cell in source_cell.neighbours:
                 if cell not in exclude_cells:
                     cell.update_players_surroundings(world_object=world_object, has_changes=has_changes,
                                                      has_inventory_changes=has_inventory_changes)
@@ -156,10 +185,9 @@ class GridManager:
 
         return affected_cells
 
+    # Returned lists are shared with the cells themselves, callers must not modify them.
     def _get_surrounding_cells_by_cell(self, cell):
-        mid_x = (cell.min_x + cell.max_x) / 2
-        mid_y = (cell.min_y + cell.max_y) / 2
-        return self._get_surrounding_cells_by_location(mid_x, mid_y, cell.map_id, cell.instance_id)
+        return cell.neighbours
 
     def _get_surrounding_cells_by_object(self, world_object, x_s=-1, x_m=1, y_s=-1, y_m=1):
         vector = world_object.location
@@ -167,29 +195,43 @@ class GridManager:
                                                        x_s=x_s, x_m=x_m, y_s=y_s, y_m=y_m)
 
     def _get_surrounding_cells_by_location(self, x, y, map_, instance_id, x_s=-1, x_m=1, y_s=-1, y_m=1):
-        near_cells = set()
+        cell_x, cell_y = CellUtils.get_cell_coords(x, y)
+
+        # Default 3x3 area, use the precomputed neighbours of the cell containing this location if it exists.
+        if x_s == -1 and x_m == 1 and y_s == -1 and y_m == 1:
+            cell = self.cells.get(CellUtils.pack_cell_key(cell_x, cell_y, map_, instance_id))
+            if cell:
+                return cell.neighbours
 
-        for x2 in range(x_s, x_m + 1):
-            for y2 in range(y_s, y_m + 1):
-                cell_coords = CellUtils.get_cell_key(x + (x2 * CELL_SIZE), y + (y2 * CELL_SIZE), map_, instance_id)
-                if cell_coords in self.cells:
-                    near_cells.add(self.cells[cell_coords])
+        near_cells = []
+        for x2 in range(cell_x + x_s, cell_x + x_m + 1):
+            for y2 in range(cell_y + y_s, cell_y + y_m + 1):
+                cell = self.cells.get(CellUtils.pack_cell_key(x2, y2, map_, instance_id))
+                if cell:
+                    near_cells.append(cell)
 
         return near_cells
 
+    # The same packet buffer is shared by all recipients, returns how many players received it.
     def send_surrounding(self, packet, world_object, include_self=True, exclude=None, use_ignore=False):
+        players_reached = set()
         if world_object.current_cell:
             for cell in self._get_surrounding_cells_by_object(world_object):
-                cell.send_all(packet, world_object, include_source=include_self, exclude=exclude, use_ignore=use_ignore)
+                cell.send_all(packet, world_object, include_source=include_self, exclude=exclude,
+                              use_ignore=use_ignore, players_reached=players_reached)
         # This player has no current cell, send the message directly.
         elif world_object.get_type_id() == ObjectTypeIds.ID_PLAYER and include_self:
             world_object.enqueue_packet(packet)
+            players_reached.add(world_object.guid)
+        return len(players_reached)
 
     def send_surrounding_in_range(self, packet, world_object, range_, include_self=True, exclude=None,
                                   use_ignore=False):
+        players_reached = set()
         for cell in self._get_surrounding_cells_by_object(world_object):
-            cell.send_all_in_range(
-                packet, range_, world_object, include_self, exclude, use_ignore)
+            cell.send_all_in_range(packet, range_, world_object, include_self, exclude, use_ignore,
+                                   players_reached=players_reached)
+        return len(players_reached)
 
     def get_surrounding_objects(self, world_object, object_types):
         surrounding_objects = []
@@ -214,7 +256,7 @@ class GridManager:
                 corpse_index = index
 
         # Original surrounding cells for requester.
-        cells = self._get_surrounding_cells_by_object(world_object)
+        cells = set(self._get_surrounding_cells_by_object(world_object))
 
         # Handle Far Sight.
         if world_object.get_type_id() == ObjectTypeIds.ID_PLAYER:
@@ -248,6 +290,13 @@ class GridManager:
         else:
             return res[0]
 
+    # Aggressive creatures around the object whose detection radius reaches any of the given locations.
+    def get_surrounding_aggro_creatures(self, world_object, locations):
+        candidates = []
+        for cell in self._get_surrounding_cells_by_object(world_object):
+            cell.get_aggro_candidates(locations, candidates)
+        return candidates
+
     def get_creature_spawn_by_id(self, spawn_id):
         for cell in set(self.cells.values()):
             spawn_found = cell.creatures_spawns.get(spawn_id)
@@ -327,10 +376,11 @@ class GridManager:
 
     def get_surrounding_creature_spawn_by_spawn_id(self, world_object, spawn_id):
         surrounding_units_spawns = self._get_surrounding_creature_spawns(world_object)
-        try:
-            return surrounding_units_spawns[spawn_id]
-        except KeyError:
-            return None
+        spawn = surrounding_units_spawns.get(spawn_id)
+        # Spawns of cells never activated (or unloaded while idle) have no instance yet.
+        if spawn:
+            spawn.materialize()
+        return spawn
 
     def get_surrounding_gameobject_by_guid(self, world_object, guid):
         surrounding_gameobjects = self.get_surrounding_gameobjects(world_object)
@@ -341,20 +391,34 @@ class GridManager:
 
     def get_surrounding_gameobject_spawn_by_spawn_id(self, world_object, spawn_id_):
         surrounding_gameobjects_spawns = self._get_surrounding_gameobjects_spawns(world_object)
-        try:
-            return surrounding_gameobjects_spawns[spawn_id_]
-        except KeyError:
-            return None
+        spawn = surrounding_gameobjects_spawns.get(spawn_id_)
+        # Spawns of cells never activated (or unloaded while idle) have no instance yet.
+        if spawn:
+            spawn.materialize()
+        return spawn
 
     def _get_create_cell(self, vector, map_, instance_id) -> Cell:
-        cell_key = CellUtils.get_cell_key(vector.x, vector.y, map_, instance_id)
+        cell_x, cell_y = CellUtils.get_cell_coords(vector.x, vector.y)
+        cell_key = CellUtils.pack_cell_key(cell_x, cell_y, map_, instance_id)
         cell = self.cells.get(cell_key)
         if not cell:
-            min_x, min_y, max_x, max_y = CellUtils.generate_coord_data(vector.x, vector.y)
-            cell = Cell(min_x, min_y, max_x, max_y, map_, instance_id)
-            self.cells[cell.key] = cell
+            with self.grid_lock:
+                cell = self.cells.get(cell_key)
+                if not cell:
+                    cell = Cell(cell_x, cell_y, map_, instance_id)
+                    self._link_neighbour_cells(cell)
+                    self.cells[cell.key] = cell
         return cell
 
+    # Link the new cell with its already existent neighbours and vice versa.
+    def _link_neighbour_cells(self, cell):
+        for x in range(cell.cell_x - 1, cell.cell_x + 2):
+            for y in range(cell.cell_y - 1, cell.cell_y + 2):
+                neighbour = self.cells.get(CellUtils.pack_cell_key(x, y, cell.map_id, cell.instance_id))
+                if neighbour:
+                    cell.link_neighbour(neighbour)
+                    neighbour.link_neighbour(cell)
+
     def get_cells(self):
         return self.cells
 
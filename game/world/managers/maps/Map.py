@@ -31,10 +31,10 @@ class Map:
         count = 0
         length = len(creature_spawns)
         for creature_spawn in creature_spawns:
-            creature_spawn = CreatureSpawn(creature_spawn, instance_id=self.instance_id)
-            creature_spawn.spawn_creature()
+            # Creature instances are built upon cell activation.
+            self.spawn_object(world_object_spawn=CreatureSpawn(creature_spawn, instance_id=self.instance_id))
             count += 1
-            Logger.progress(f'Loading creatures for Map {self.name}, Instance {self.instance_id}...', count, length)
+            Logger.progress(f'Loading creature spawns for Map {self.name}, Instance {self.instance_id}...', count, length)
 
     def _load_map_gameobjects(self):
         if not config.Server.Settings.load_gameobjects:
@@ -46,10 +46,10 @@ class Map:
         count = 0
         length = len(gobject_spawns)
         for gobject_spawn in gobject_spawns:
-            gameobject_spawn = GameObjectSpawn(gobject_spawn, instance_id=self.instance_id)
-            gameobject_spawn.spawn()
+            # Gameobject instances are built upon cell activation.
+            self.spawn_object(world_object_spawn=GameObjectSpawn(gobject_spawn, instance_id=self.instance_id))
             count += 1
-            Logger.progress(f'Loading gameobjects Map {self.name}, Instance {self.instance_id}...', count, length)
+            Logger.progress(f'Loading gameobject spawns for Map {self.name}, Instance {self.instance_id}...', count, length)
 
     def is_dungeon(self):
         return self.dbc_map.IsInMap == MapType.INSTANCE
@@ -77,10 +77,11 @@ class Map:
         return self.grid_manager.unit_should_relocate(world_object, destination, destination_map, destination_instance)
 
     def send_surrounding(self, packet, world_object, include_self=True, exclude=None, use_ignore=False):
-        self.grid_manager.send_surrounding(packet, world_object, include_self, exclude, use_ignore)
+        return self.grid_manager.send_surrounding(packet, world_object, include_self, exclude, use_ignore)
 
     def send_surrounding_in_range(self, packet, world_object, range_, include_self=True, exclude=None, use_ignore=False):
-        self.grid_manager.send_surrounding_in_range(packet, world_object, range_, include_self, exclude, use_ignore)
+        return self.grid_manager.send_surrounding_in_range(packet, world_object, range_, include_self, exclude,
+                                                           use_ignore)
 
     def get_surrounding_objects(self, world_object, object_types):
         return self.grid_manager.get_surrounding_objects(world_object, object_types)
@@ -91,6 +92,9 @@ class Map:
     def get_surrounding_units(self, world_object, include_players=False):
         return self.grid_manager.get_surrounding_units(world_object, include_players)
 
+    def get_surrounding_aggro_creatures(self, world_object, locations):
+        return self.grid_manager.get_surrounding_aggro_creatures(world_object, locations)
+
     def get_creature_spawn_by_id(self, spawn_id):
         return self.grid_manager.get_creature_spawn_by_id(spawn_id)
 
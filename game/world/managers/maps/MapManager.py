@@ -15,6 +15,7 @@ from game.world.managers.maps.Map import Map, MapType
 from game.world.managers.maps.MapTile import MapTile, MapTileStates
 from game.world.managers.maps.helpers.Namigator import Namigator
 from game.world.managers.objects.farsight.FarSightManager import FarSightManager
+from network.packet.PacketWriter import PacketWriter
 from utils.ConfigManager import config
 from utils.Logger import Logger
 from utils.PathManager import PathManager
@@ -43,7 +44,11 @@ class MapManager:
 
     @staticmethod
     def initialize_world_and_pvp_maps():
+        from game.world.MapShardManager import MapShardManager
         for map_id in MAP_LIST:
+            # Served by another map shard process.
+            if not MapShardManager.is_local_map(map_id):
+                continue
             dbc_map = DbcDatabaseManager.map_get_by_id(map_id)
             # Initialize common and PvP maps. (We handle PvP maps as common)
             if dbc_map.IsInMap != MapType.COMMON and dbc_map.PVP != 1:
@@ -412,6 +417,11 @@ class MapManager:
         if map_id not in MAP_LIST:
             return False
 
+        # Tiles of maps served by another map shard process are not loaded here.
+        from game.world.MapShardManager import MapShardManager
+        if not MapShardManager.is_local_map(map_id):
+            return True
+
         # Some instances don't have tiles, only WMOs; always allow teleporting inside one.
         if map_id > 1:
             return True
@@ -459,11 +469,54 @@ class MapManager:
                 return calculated_z, False
             except:
                 tile = MAPS_TILES[map_id][map_tile_x][map_tile_y]
-                return tile.z_height_map[tile_local_x][tile_local_x], False
+                return tile.get_z_at(tile_local_x, tile_local_y), False
         except:
             Logger.error(traceback.format_exc())
             return current_z if current_z else 0.0, False
 
+    # Same as calculate_z for a list of (x, y, current_z) points of a single map, returns a list of (z, z_locked).
+    # Tile lookups are done once per tile and, if numpy is available, heights are interpolated in one pass per tile.
+    # noinspection PyBroadException
+    @staticmethod
+    def calculate_z_batch(map_id, points) -> list:
+        results = [(current_z, False) for x, y, current_z in points]
+        if not config.Server.Settings.use_nav_tiles and not config.Server.Settings.use_map_tiles:
+            return results
+        try:
+            # Group point indexes by tile.
+            points_by_tile = {}
+            resolution = RESOLUTION_ZMAP - 1
+            for index, (x, y, current_z) in enumerate(points):
+                map_tile_x, map_tile_y, tile_local_x, tile_local_y = MapManager.calculate_tile(x, y, resolution)
+                points_by_tile.setdefault((map_tile_x, map_tile_y), []).append(index)
+
+            for (map_tile_x, map_tile_y), indexes in points_by_tile.items():
+                first_x, first_y = points[indexes[0]][0], points[indexes[0]][1]
+                # No tile data available or busy loading.
+                if MapManager._check_tile_load(map_id, first_x, first_y, map_tile_x, map_tile_y) \
+                        != MapTileStates.READY:
+                    continue
+
+                # No map files enabled but namigator enabled.
+                if not config.Server.Settings.use_map_tiles:
+                    for index in indexes:
+                        x, y, current_z = points[index]
+                        results[index] = MapManager.calculate_nav_z(map_id, x, y, current_z)
+                    continue
+
+                tile = MAPS_TILES[map_id][map_tile_x][map_tile_y]
+                heights = tile.get_interpolated_heights([points[index] for index in indexes])
+                for index, calculated_z in zip(indexes, heights):
+                    x, y, current_z = points[index]
+                    # If maps Z is quite different, cascade into nav Z, if that also fails, current Z will be returned.
+                    if math.fabs(current_z - calculated_z) >= 1.0 and current_z:
+                        results[index] = MapManager.calculate_nav_z(map_id, x, y, current_z)
+                    else:
+                        results[index] = (calculated_z, False)
+        except:
+            Logger.error(traceback.format_exc())
+        return results
+
     @staticmethod
     def get_area_information(map_id, x, y):
         try:
@@ -624,20 +677,36 @@ class MapManager:
         MapManager.get_map_by_object(world_object).remove_object(world_object)
         FarSightManager.remove_camera(world_object)
 
+    # Returns how many players received the packet.
     @staticmethod
     def send_surrounding(packet, world_object, include_self=True, exclude=None, use_ignore=False):
         # Send direct message if not yet in a Cell, includes self and is player.
         if not world_object.current_cell and include_self and world_object.get_type_id() == ObjectTypeIds.ID_PLAYER:
             world_object.enqueue_packet(packet)
+            return 1
         elif world_object.current_cell:
-            MapManager.get_map_by_object(world_object).send_surrounding(
+            return MapManager.get_map_by_object(world_object).send_surrounding(
                 packet, world_object, include_self, exclude, use_ignore)
+        return 0
 
     @staticmethod
     def send_surrounding_in_range(packet, world_object, range_, include_self=True, exclude=None, use_ignore=False):
         return MapManager.get_map_by_object(world_object).send_surrounding_in_range(
             packet, world_object, range_, include_self, exclude, use_ignore)
 
+    # Builds (and compresses, if needed) the packet once and fans the same buffer out to every surrounding player.
+    # Returns how many players received the encoded packet.
+    @staticmethod
+    def broadcast_surrounding(opcode, data, world_object, include_self=True, exclude=None, use_ignore=False):
+        packet = PacketWriter.get_packet(opcode, data)
+        return MapManager.send_surrounding(packet, world_object, include_self, exclude, use_ignore)
+
+    @staticmethod
+    def broadcast_surrounding_in_range(opcode, data, world_object, range_, include_self=True, exclude=None,
+                                       use_ignore=False):
+        packet = PacketWriter.get_packet(opcode, data)
+        return MapManager.send_surrounding_in_range(packet, world_object, range_, include_self, exclude, use_ignore)
+
     @staticmethod
     def get_surrounding_objects(world_object, object_types):
         return MapManager.get_map_by_object(world_object).get_surrounding_objects(world_object, object_types)
@@ -650,6 +719,10 @@ class MapManager:
     def get_surrounding_units(world_object, include_players=False):
         return MapManager.get_map_by_object(world_object).get_surrounding_units(world_object, include_players)
 
+    @staticmethod
+    def get_surrounding_aggro_creatures(world_object, locations):
+        return MapManager.get_map_by_object(world_object).get_surrounding_aggro_creatures(world_object, locations)
+
     @staticmethod
     def get_creature_spawn_by_id(map_id, instance_id, spawn_id):
         return MapManager.get_map(map_id, instance_id).get_creature_spawn_by_id(spawn_id)
@@ -1,17 +1,25 @@
 import os
+import sys
 import traceback
+from array import array
 from enum import IntEnum
 from os import path
-from struct import unpack
+from struct import unpack, calcsize
 
 from game.world.managers.maps.helpers.AreaInformation import AreaInformation
-from game.world.managers.maps.helpers.Constants import RESOLUTION_ZMAP, RESOLUTION_LIQUIDS, RESOLUTION_AREA_INFO
+from game.world.managers.maps.helpers.Constants import RESOLUTION_ZMAP, RESOLUTION_LIQUIDS, RESOLUTION_AREA_INFO, \
+    MAP_FILE_HEADER_FORMAT, MAP_FILE_HEADER_SIZE, ADT_SIZE
 from game.world.managers.maps.helpers.LiquidInformation import LiquidInformation
 from network.packet.PacketReader import PacketReader
 from utils.ConfigManager import config
 from utils.Logger import Logger
 from utils.PathManager import PathManager
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class MapTileStates(IntEnum):
     READY = 0
@@ -20,7 +28,7 @@ class MapTileStates(IntEnum):
 
 
 class MapTile(object):
-    EXPECTED_VERSION = 'ACMAP_1.40'
+    EXPECTED_VERSION = 'ACMAP_2.00'
 
     def __init__(self, map_id, adt_x, adt_y):
         self.initialized = False
@@ -30,25 +38,84 @@ class MapTile(object):
         self.adt_x = adt_x
         self.adt_y = adt_y
         self.cell_map = map_id
-        self.area_information = None
-        self.liquid_information = None
+        # Views over the .map file contents, indexed as [cell_x][cell_y].
         self.z_height_map = None
+        self.area_zone_ids = None
+        self.area_numbers = None
+        self.area_explore_bits = None
+        self.area_flags = None
+        self.area_levels = None
+        self.area_faction_masks = None
+        self.liquid_types = None
+        self.liquid_heights = None
+        self.wmo_liquid_types = None
+        self.wmo_liquid_heights = None
 
     def can_use(self):
         return self.initialized and self.ready and (self.has_maps or self.has_navigation)
 
     def get_liquids_at(self, cell_x, cell_y):
-        if not self.has_maps or not self.liquid_information:
+        if not self.has_maps:
+            return None
+        liquid_type = int(self.liquid_types[cell_x][cell_y])
+        if liquid_type != -1:
+            return LiquidInformation(liquid_type, float(self.liquid_heights[cell_x][cell_y]))
+        # Fallback to liquids defined by WMOs, if any.
+        if self.wmo_liquid_types is None:
+            return None
+        liquid_type = int(self.wmo_liquid_types[cell_x][cell_y])
+        if liquid_type == -1:
             return None
-        return self.liquid_information[cell_x][cell_y]
+        return LiquidInformation(liquid_type, float(self.wmo_liquid_heights[cell_x][cell_y]))
 
     def get_area_at(self, cell_x, cell_y):
-        if not self.has_maps or not self.area_information:
+        if not self.has_maps:
             return None
-        return self.area_information[cell_x][cell_y]
+        zone_id = int(self.area_zone_ids[cell_x][cell_y])
+        if zone_id == -1:  # No area information.
+            return None
+        return AreaInformation(zone_id, int(self.area_numbers[cell_x][cell_y]), int(self.area_flags[cell_x][cell_y]),
+                               int(self.area_levels[cell_x][cell_y]), int(self.area_explore_bits[cell_x][cell_y]),
+                               int(self.area_faction_masks[cell_x][cell_y]))
 
     def get_z_at(self, cell_x, cell_y):
-        return self.z_height_map[cell_x][cell_y]
+        return float(self.z_height_map[cell_x][cell_y])
+
+    # Bilinear interpolated heights for a list of (x, y, ...) world coordinates that belong to this tile.
+    def get_interpolated_heights(self, points):
+        resolution = RESOLUTION_ZMAP - 1
+        max_coord = 32.0 * ADT_SIZE
+        if numpy:
+            coords = numpy.array([(point[0], point[1]) for point in points], dtype=numpy.float64).reshape(-1, 2)
+            coords = numpy.clip(coords, -max_coord, max_coord)
+            fx = resolution * (32.0 - coords[:, 0] / ADT_SIZE - self.adt_x)
+            fy = resolution * (32.0 - coords[:, 1] / ADT_SIZE - self.adt_y)
+            cell_x = fx.astype(numpy.int64)
+            cell_y = fy.astype(numpy.int64)
+            next_x = numpy.minimum(cell_x + 1, resolution)
+            next_y = numpy.minimum(cell_y + 1, resolution)
+            x_normalized = fx - cell_x
+            y_normalized = fy - cell_y
+            heights = self.z_height_map
+            top = heights[cell_x, cell_y] + (heights[next_x, cell_y] - heights[cell_x, cell_y]) * x_normalized
+            bottom = heights[cell_x, next_y] + (heights[next_x, next_y] - heights[cell_x, next_y]) * x_normalized
+            return (top + (bottom - top) * y_normalized).tolist()
+
+        results = []
+        heights = self.z_height_map
+        for point in points:
+            fx = resolution * (32.0 - min(max(point[0], -max_coord), max_coord) / ADT_SIZE - self.adt_x)
+            fy = resolution * (32.0 - min(max(point[1], -max_coord), max_coord) / ADT_SIZE - self.adt_y)
+            cell_x = int(fx)
+            cell_y = int(fy)
+            next_x = min(cell_x + 1, resolution)
+            next_y = min(cell_y + 1, resolution)
+            x_normalized = fx - cell_x
+            y_normalized = fy - cell_y
+            top = heights[cell_x][cell_y] + (heights[next_x][cell_y] - heights[cell_x][cell_y]) * x_normalized
+            bottom = heights[cell_x][next_y] + (heights[next_x][next_y] - heights[cell_x][next_y]) * x_normalized
+            results.append(top + (bottom - top) * y_normalized)
+        return results
 
     def is_initialized(self):
         return self.initialized
@@ -92,45 +159,49 @@ class MapTile(object):
             Logger.warning(f'[Maps] Unable to locate map file: {filename}, '
                            f'Map:{self.cell_map} Tile:{self.adt_x},{self.adt_y}')
             return False
-        else:
-            self.area_information = [[None for r in range(RESOLUTION_AREA_INFO)] for c in range(RESOLUTION_AREA_INFO)]
-            self.liquid_information = [[None for r in range(RESOLUTION_LIQUIDS)] for c in range(RESOLUTION_LIQUIDS)]
-            self.z_height_map = [[0 for r in range(RESOLUTION_ZMAP)] for c in range(RESOLUTION_ZMAP)]
-
-            with open(maps_path, "rb") as map_tiles:
-                version = PacketReader.read_string(map_tiles.read(10), 0)
-                if version != MapTile.EXPECTED_VERSION:
-                    Logger.error(f'[Maps] Unexpected map version. Expected "{MapTile.EXPECTED_VERSION}", found "{version}".')
-                    return False
-
-                # Height Map
-                for x in range(RESOLUTION_ZMAP):
-                    for y in range(RESOLUTION_ZMAP):
-                        self.z_height_map[x][y] = unpack('<f', map_tiles.read(4))[0]
-
-                # ZoneID, AreaNumber, AreaFlags, AreaLevel, AreaExploreFlag(Bit), AreaFactionMask
-                for x in range(RESOLUTION_AREA_INFO):
-                    for y in range(RESOLUTION_AREA_INFO):
-                        zone_id = unpack('<i', map_tiles.read(4))[0]
-                        if zone_id == -1:  # No area information.
-                            continue
-                        area_number = unpack('<I', map_tiles.read(4))[0]
-                        area_flags = unpack('<B', map_tiles.read(1))[0]
-                        area_level = unpack('<B', map_tiles.read(1))[0]
-                        area_explore_bit = unpack('<H', map_tiles.read(2))[0]
-                        area_faction_mask = unpack('<B', map_tiles.read(1))[0]
-                        # noinspection PyTypeChecker
-                        self.area_information[x][y] = AreaInformation(zone_id, area_number, area_flags, area_level, area_explore_bit, area_faction_mask)
-
-                # Liquids
-                for x in range(RESOLUTION_LIQUIDS):
-                    for y in range(RESOLUTION_LIQUIDS):
-                        liquid_type = unpack('<b', map_tiles.read(1))[0]
-                        if liquid_type == -1:  # No liquid information / not rendered.
-                            continue
-                        height = unpack('<f', map_tiles.read(4))[0]
-                        # noinspection PyTypeChecker
-                        self.liquid_information[x][y] = LiquidInformation(liquid_type, height)
+
+        # Read into an owned buffer instead of keeping a mapping per tile, each one would hold a file descriptor for as
+        # long as the tile is loaded.
+        with open(maps_path, 'rb') as map_tiles:
+            map_file = map_tiles.read()
+        if len(map_file) < MAP_FILE_HEADER_SIZE:
+            Logger.error(f'[Maps] Invalid map file: {filename}.')
+            return False
+
+        version, z_resolution, liquids_resolution = unpack(MAP_FILE_HEADER_FORMAT, map_file[:MAP_FILE_HEADER_SIZE])
+        version = PacketReader.read_string(version, 0)
+        if version != MapTile.EXPECTED_VERSION:
+            Logger.error(f'[Maps] Unexpected map version. Expected "{MapTile.EXPECTED_VERSION}", found "{version}".')
+            return False
+
+        if z_resolution != RESOLUTION_ZMAP or liquids_resolution != RESOLUTION_LIQUIDS:
+            Logger.error(f'[Maps] Unexpected resolution in map file {filename}, expected Z {RESOLUTION_ZMAP} and '
+                         f'liquids {RESOLUTION_LIQUIDS}, found Z {z_resolution} and liquids {liquids_resolution}.')
+            return False
+
+        # Every section has a fixed size, so they are just views over the file contents at known offsets.
+        reader = MapSectionReader(map_file, MAP_FILE_HEADER_SIZE)
+        wmo_liquid_types, wmo_liquid_heights = None, None
+        try:
+            z_height_map = reader.read('f', RESOLUTION_ZMAP)
+            area_sections = [reader.read(type_code, RESOLUTION_AREA_INFO) for type_code in 'iIHBBB']
+            liquid_types = reader.read('b', RESOLUTION_LIQUIDS)
+            liquid_heights = reader.read('f', RESOLUTION_LIQUIDS)
+            # Optional WMO liquids section.
+            if reader.read_flag():
+                wmo_liquid_types = reader.read('b', RESOLUTION_LIQUIDS)
+                wmo_liquid_heights = reader.read('f', RESOLUTION_LIQUIDS)
+        except ValueError:
+            Logger.error(f'[Maps] Truncated map file: {filename}.')
+            return False
+
+        self.z_height_map = z_height_map
+        self.area_zone_ids, self.area_numbers, self.area_explore_bits, self.area_flags, self.area_levels, \
+            self.area_faction_masks = area_sections
+        self.liquid_types = liquid_types
+        self.liquid_heights = liquid_heights
+        self.wmo_liquid_types = wmo_liquid_types
+        self.wmo_liquid_heights = wmo_liquid_heights
         return True
 
     @staticmethod
@@ -148,8 +219,42 @@ class MapTile(object):
             return False
 
         with open(maps_path, "rb") as map_tiles:
-            version = PacketReader.read_string(map_tiles.read(10), 0)
+            version = PacketReader.read_string(map_tiles.read(MAP_FILE_HEADER_SIZE), 0)
             if version != MapTile.EXPECTED_VERSION:
                 return False
 
         return True
+
+
+# Builds [x][y] views over consecutive square sections of a .map file contents, without copying nor boxing values.
+class MapSectionReader(object):
+    def __init__(self, map_file, offset):
+        self.map_file = map_file
+        self.view = memoryview(map_file)
+        self.offset = offset
+
+    def read(self, type_code, resolution):
+        count = resolution * resolution
+        size = count * calcsize(type_code)
+        if self.offset + size > len(self.view):
+            raise ValueError('Truncated map file.')
+        if numpy:
+            values = numpy.frombuffer(self.map_file, dtype=f'<{type_code}', count=count, offset=self.offset)
+            self.offset += size
+            return values.reshape(resolution, resolution)
+        values = self.view[self.offset:self.offset + size]
+        self.offset += size
+        if sys.byteorder == 'little':
+            values = values.cast(type_code)
+        # Files are little endian, big endian hosts need their own (swapped) copy.
+        else:
+            values = array(type_code, values.tobytes())
+            values.byteswap()
+        return [values[row * resolution:(row + 1) * resolution] for row in range(resolution)]
+
+    def read_flag(self):
+        if self.offset + 4 > len(self.view):
+            return False
+        flag = unpack('<I', self.view[self.offset:self.offset + 4])[0]
+        self.offset += 4
+        return flag != 0
@@ -4,6 +4,8 @@ from utils.ConfigManager import config
 
 TOLERANCE = 0.00001
 CELL_SIZE = config.Server.Settings.cell_size
+# Offset applied to cell coordinates so they can be packed as unsigned 16 bit values.
+CELL_COORD_OFFSET = 0x8000
 
 
 class CellUtils:
@@ -20,16 +22,36 @@ class CellUtils:
 
         return min_x, min_y, max_x, max_y
 
+    @staticmethod
+    def get_cell_coords(x, y):
+        return math.ceil(x / CELL_SIZE), math.ceil(y / CELL_SIZE)
+
+    # Packs cell coordinates, map and instance into a single integer.
+    # Lower 32 bits hold the offset cell x/y, upper bits hold the map id (16 bits) and the instance id.
+    # The offset guarantees the resulting key is never 0, so it can be used as a truthy value.
+    @staticmethod
+    def pack_cell_key(cell_x, cell_y, map_, instance_id):
+        return ((((instance_id << 16) | map_) << 32) | ((cell_x + CELL_COORD_OFFSET) << 16)
+                | (cell_y + CELL_COORD_OFFSET))
+
+    @staticmethod
+    def unpack_cell_key(cell_key):
+        cell_x = ((cell_key >> 16) & 0xFFFF) - CELL_COORD_OFFSET
+        cell_y = (cell_key & 0xFFFF) - CELL_COORD_OFFSET
+        map_ = (cell_key >> 32) & 0xFFFF
+        instance_id = cell_key >> 48
+        return cell_x, cell_y, map_, instance_id
+
     @staticmethod
     def get_cell_key(x, y, map_, instance_id):
-        min_x, min_y, max_x, max_y = CellUtils.generate_coord_data(x, y)
-        key = f'{round(min_x, 5)}:{round(min_y, 5)}:{round(max_x, 5)}:{round(max_y, 5)}:{map_}:{instance_id}'
-        return key
+        return CellUtils.pack_cell_key(math.ceil(x / CELL_SIZE), math.ceil(y / CELL_SIZE), map_, instance_id)
 
     @staticmethod
     def get_cell_key_for_object(world_object):
-        x = world_object.location.x
-        y = world_object.location.y
-        map_id = world_object.map_id
-        instance_id = world_object.instance_id
-        return CellUtils.get_cell_key(x, y, map_id, instance_id)
+        location = world_object.location
+        return CellUtils.get_cell_key(location.x, location.y, world_object.map_id, world_object.instance_id)
+
+    @staticmethod
+    def cell_key_to_str(cell_key):
+        cell_x, cell_y, map_, instance_id = CellUtils.unpack_cell_key(cell_key)
+        return f'{cell_x}:{cell_y}:{map_}:{instance_id}'
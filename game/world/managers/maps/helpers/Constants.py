@@ -5,6 +5,9 @@ RESOLUTION_ZMAP = int(config.Server.Settings.z_resolution)
 RESOLUTION_LIQUIDS = 128
 RESOLUTION_AREA_INFO = 16
 ADT_SIZE = 533.3333
+# .map files header: version string (null terminated, padded to 12 bytes), Z resolution and liquids resolution.
+MAP_FILE_HEADER_FORMAT = '<12s2H'
+MAP_FILE_HEADER_SIZE = 16
 
 
 class MapType(IntEnum):
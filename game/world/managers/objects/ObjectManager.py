@@ -66,7 +66,7 @@ class ObjectManager:
         self.is_default = True
         self.summoner = None
         self.charmer = None
-        self.current_cell = ''
+        self.current_cell = None  # Packed cell key, see CellUtils.pack_cell_key.
         self.last_tick = 0
         self.movement_spline = None
         self.object_ai = None
@@ -100,6 +100,10 @@ class ObjectManager:
         if not self.initialized:
             self.initialize_field_values()
 
+        # Observers other than the owner get the exact same bytes, so the packet is built once and shared.
+        return self.update_packet_factory.get_partial_packet(requester, self._build_partial_packet)
+
+    def _build_partial_packet(self, requester):
         return UpdatePacketFactory.compress_if_needed(PacketWriter.get_packet(
             OpCode.SMSG_UPDATE_OBJECT,
             self.get_partial_update_bytes(requester)))
@@ -272,9 +276,11 @@ class ObjectManager:
 
     def _get_fields_update(self, is_create, requester):
         data = b''
-        mask = self.update_packet_factory.update_mask.copy()
-        for field_index in range(self.update_packet_factory.update_mask.field_count):
-            # Partial packets only care for fields that had changes.
+        update_mask = self.update_packet_factory.update_mask
+        mask = update_mask.copy()
+        # Partial packets only care for fields that had changes.
+        field_indexes = range(update_mask.field_count) if is_create else update_mask.get_set_indexes()
+        for field_index in field_indexes:
             if not is_create and mask[field_index] == 0:
                 continue
             # Check for encapsulation, turn off the bit if requester has no read access.
@@ -472,40 +478,16 @@ class ObjectManager:
         return self if include_self else None
 
     def _allegiance_status_checker(self, target) -> UnitReaction:
-        own_faction = DbcDatabaseManager.FactionTemplateHolder.faction_template_get_by_id(self.faction)
-        target_faction = DbcDatabaseManager.FactionTemplateHolder.faction_template_get_by_id(target.faction)
+        # TODO: Reputation standing checks first, they depend on the player so they must be applied on top of the
+        #  shared template reactions.
+        reaction = DbcDatabaseManager.FactionTemplateHolder.get_reaction(self.faction, target.faction)
+        if reaction is not None:
+            return reaction
 
-        if not own_faction:
+        if not DbcDatabaseManager.FactionTemplateHolder.faction_template_get_by_id(self.faction):
             Logger.warning(f'Invalid faction template: {self.faction}.')
-            return UnitReaction.UNIT_REACTION_NEUTRAL
-
-        if not target_faction:
+        else:
             Logger.warning(f'Invalid faction template: {target.faction}.')
-            return UnitReaction.UNIT_REACTION_NEUTRAL
-
-        # TODO: Reputation standing checks first.
-
-        if target_faction.FactionGroup & own_faction.EnemyGroup != 0:
-            return UnitReaction.UNIT_REACTION_HOSTILE
-
-        own_enemies = {own_faction.Enemies_1, own_faction.Enemies_2, own_faction.Enemies_3, own_faction.Enemies_4}
-        if target_faction.Faction > 0 and target_faction.Faction in own_enemies:
-            return UnitReaction.UNIT_REACTION_HOSTILE
-
-        if target_faction.FactionGroup & own_faction.FriendGroup != 0:
-            return UnitReaction.UNIT_REACTION_FRIENDLY
-
-        own_friends = {own_faction.Friend_1, own_faction.Friend_2, own_faction.Friend_3, own_faction.Friend_4}
-        if target_faction.Faction > 0 and target_faction.Faction in own_friends:
-            return UnitReaction.UNIT_REACTION_FRIENDLY
-
-        if target_faction.FriendGroup & own_faction.FactionGroup != 0:
-            return UnitReaction.UNIT_REACTION_FRIENDLY
-
-        other_friends = {target_faction.Friend_1, target_faction.Friend_2, target_faction.Friend_3, target_faction.Friend_4}
-        if own_faction.Faction > 0 and own_faction.Faction in other_friends:
-            return UnitReaction.UNIT_REACTION_FRIENDLY
-
         return UnitReaction.UNIT_REACTION_NEUTRAL
 
     def is_friendly_to(self, target):
@@ -7,6 +7,7 @@ class Camera:
         self.cell_key = world_object.current_cell
         self.players = dict()  # Subscribed players.
 
+    # Players reached are added to the given exclude set, if any.
     def broadcast_packet(self, packet, exclude=None):
         for player_mgr in list(self.players.values()):
             # Player went offline/crashed, pop.
@@ -20,6 +21,8 @@ class Camera:
             if exclude and player_mgr.guid in exclude:
                 continue
             player_mgr.enqueue_packet(packet)
+            if exclude is not None:
+                exclude.add(player_mgr.guid)
 
     def update_camera_on_players(self):
         for player_mgr in list(self.players.values()):
@@ -3,7 +3,7 @@ from multiprocessing import RLock
 from game.world.managers.objects.farsight.Camera import Camera
 
 CAMERAS_BY_SOURCE_OBJECT = dict()
-CAMERAS_BY_CELL = dict()
+CAMERAS_BY_CELL = dict()  # Packed cell key -> set of cameras.
 
 
 class FarSightManager:
@@ -56,6 +56,8 @@ class GameObjectManager(ObjectManager):
         self.state = 0
 
         self.update_packet_factory.init_values(self.guid, GameObjectFields)
+        # Dynamic flags are generated for each requester.
+        self.update_packet_factory.cache_partial_packets = False
 
         self.time_to_live_timer = 0
         self.loot_manager = None  # Optional.
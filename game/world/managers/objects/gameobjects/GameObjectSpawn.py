@@ -21,8 +21,13 @@ class GameObjectSpawn:
         self.respawn_time = 0
         self.last_tick = 0
         self.is_default = self._is_default()
+        # Spawns are loaded as plain records, the gameobject instance is only built once its cell is activated.
+        self.materialized = False
 
     def update(self, now):
+        if not self.materialized:
+            self.materialize()
+
         if now > self.last_tick > 0:
             elapsed = now - self.last_tick
             gameobject = self.gameobject_instance
@@ -34,7 +39,23 @@ class GameObjectSpawn:
 
         self.last_tick = now
 
+    def materialize(self):
+        if not self.materialized:
+            self.spawn()
+
+    # Release the gameobject instance of an idle default spawn, it will be built again upon cell activation.
+    def dematerialize(self):
+        gameobject = self.gameobject_instance
+        if not self.is_default or not gameobject or not gameobject.is_spawned:
+            return False
+        # Default instances are removed from the map by despawn.
+        gameobject.despawn()
+        self.gameobject_instance = None
+        self.materialized = False
+        return True
+
     def spawn(self, ttl=0):
+        self.materialized = True
         # New instance for default objects.
         if self.is_default:
             self.gameobject_instance = self._generate_gameobject_instance()
@@ -1,6 +1,7 @@
 from struct import pack
 
 from network.packet.PacketWriter import PacketWriter
+from network.packet.QueryResponseCache import QueryResponseCache
 from utils.constants.OpCodes import OpCode
 
 
@@ -9,12 +10,18 @@ class GoQueryUtils:
     @staticmethod
     def query_details(gobject_template=None, gameobject_mgr=None):
         go_template = gameobject_mgr.gobject_template if gameobject_mgr else gobject_template
+        display_id = gameobject_mgr.current_display_id if gameobject_mgr else go_template.display_id
+        return QueryResponseCache.get(OpCode.SMSG_GAMEOBJECT_QUERY_RESPONSE, (go_template.entry, display_id),
+                                      lambda: GoQueryUtils._build_query_details(go_template, display_id))
+
+    @staticmethod
+    def _build_query_details(go_template, display_id):
         name_bytes = PacketWriter.string_to_bytes(go_template.name)
         data = pack(
             f'<3I{len(name_bytes)}ssss10I',
             go_template.entry,
             go_template.type,
-            gameobject_mgr.current_display_id if gameobject_mgr else go_template.display_id,
+            display_id,
             name_bytes, b'\x00', b'\x00', b'\x00',
             go_template.data0,
             go_template.data1,
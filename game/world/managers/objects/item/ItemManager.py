@@ -11,6 +11,7 @@ from game.world.managers.objects.item.EnchantmentHolder import EnchantmentHolder
 from game.world.managers.objects.item.Stats import DamageStat, Stat, SpellStat
 from game.world.managers.objects.units.player.EnchantmentManager import MAX_ENCHANTMENTS
 from network.packet.PacketWriter import PacketWriter, OpCode
+from network.packet.QueryResponseCache import QueryResponseCache
 from game.world.managers.objects.item.ItemLootManager import ItemLootManager
 from utils.ByteUtils import ByteUtils
 from utils.constants.ItemCodes import InventoryTypes, InventorySlots, ItemDynFlags, ItemClasses, ItemFlags
@@ -232,8 +233,7 @@ class ItemManager(ObjectManager):
         return None
 
     def query_details_packet(self):
-        data = self.query_details_data()
-        return PacketWriter.get_packet(OpCode.SMSG_ITEM_QUERY_SINGLE_RESPONSE, data)
+        return ItemManager.get_query_details_packet(self.item_template)
 
     def query_details_data(self):
         data = ItemManager.generate_query_details_data(
@@ -241,6 +241,14 @@ class ItemManager(ObjectManager):
         )
         return data
 
+    # Item query responses only depend on the template, build them once.
+    @staticmethod
+    def get_query_details_packet(item_template):
+        return QueryResponseCache.get(OpCode.SMSG_ITEM_QUERY_SINGLE_RESPONSE, (item_template.entry,),
+                                      lambda: PacketWriter.get_packet(
+                                          OpCode.SMSG_ITEM_QUERY_SINGLE_RESPONSE,
+                                          ItemManager.generate_query_details_data(item_template)))
+
     @staticmethod
     def generate_query_details_data(item_template):
         # Initialize stat values if none are supplied.
@@ -508,29 +516,29 @@ class ItemManager(ObjectManager):
         # Attempting to optimize packet size by sending only unique items
         # leads to some items not having an icon (in bank only? Only case noticed when testing).
 
-        query_data = b''
-        written_items = 0
+        # Cached responses are concatenated as they are, without the single response header.
+        query_buffers = []
+        query_length = 0
         while item_templates:
             item = item_templates.pop()
-            item_bytes = ItemManager.generate_query_details_data(item)
+            item_bytes = memoryview(ItemManager.get_query_details_packet(item))[PacketWriter.HEADER_SIZE:]
 
             # Normal packet header + uint32 (written_items) + length of the total query + length of the current query.
-            exceeds_max_length = PacketWriter.HEADER_SIZE + 4 + len(query_data) + len(item_bytes) > PacketWriter.MAX_PACKET_SIZE
+            exceeds_max_length = PacketWriter.HEADER_SIZE + 4 + query_length + len(item_bytes) > PacketWriter.MAX_PACKET_SIZE
             if exceeds_max_length or not item_templates:
                 if exceeds_max_length:
                     item_templates.append(item)
                 else:
                     # Last item to send.
-                    query_data += item_bytes
-                    written_items += 1
+                    query_buffers.append(item_bytes)
 
-                packet = pack(f'<I{len(query_data)}s', written_items, query_data)
+                packet = pack('<I', len(query_buffers)) + b''.join(query_buffers)
                 packets.append(PacketWriter.get_packet(OpCode.SMSG_ITEM_QUERY_MULTIPLE_RESPONSE, packet))
-                query_data = b''
-                written_items = 0
+                query_buffers = []
+                query_length = 0
                 continue
 
-            query_data += item_bytes
-            written_items += 1
+            query_buffers.append(item_bytes)
+            query_length += len(item_bytes)
 
         return packets
@@ -496,7 +496,7 @@ class ScriptHandler:
         provided_spawn_id = command.datalong
         if provided_spawn_id:
             gobject_spawn = MapManager.get_surrounding_gameobject_spawn_by_spawn_id(command.source, provided_spawn_id)
-            if not gobject_spawn:
+            if not gobject_spawn or not gobject_spawn.gameobject_instance:
                 Logger.warning(f'ScriptHandler: Aborting {command.get_info()}, '
                                f'Gameobject with Spawn ID {provided_spawn_id} not found.')
                 return
@@ -523,7 +523,7 @@ class ScriptHandler:
         provided_spawn_id = command.datalong
         if provided_spawn_id:
             gobject_spawn = MapManager.get_surrounding_gameobject_spawn_by_spawn_id(command.source, provided_spawn_id)
-            if not gobject_spawn:
+            if not gobject_spawn or not gobject_spawn.gameobject_instance:
                 Logger.warning(f'ScriptHandler: Aborting {command.get_info()}, '
                                f'Gameobject with Spawn ID {provided_spawn_id} not found.')
                 return
@@ -1345,7 +1345,7 @@ class ScriptHandler:
             Logger.warning(f'ScriptHandler: Invalid object type (needs to be gameobject) for {command.get_info()}')
             return
 
-        command.source.gameobject_instance.set_ready()
+        command.source.set_ready()
 
     @staticmethod
     def handle_script_command_set_command_state(command):
@@ -16,7 +16,6 @@ from game.world.managers.objects.spell.ExtendedSpellData import TotemHelpers
 from game.world.managers.objects.units.DamageInfoHolder import DamageInfoHolder
 from game.world.managers.objects.units.player.StatManager import UnitStats
 from game.world.managers.objects.spell.SpellEffect import SpellEffect
-from network.packet.PacketWriter import PacketWriter
 from utils.constants.ItemCodes import ItemClasses, ItemSubClasses
 from utils.constants.MiscCodes import ObjectTypeFlags, AttackTypes, HitInfo, ObjectTypeIds
 from utils.constants.OpCodes import OpCode
@@ -601,5 +600,5 @@ class CastingSpell:
         else:
             return
 
-        MapManager.send_surrounding(PacketWriter.get_packet(final_opcode, data), self.spell_caster,
-                                    include_self=self.spell_caster.get_type_id() == ObjectTypeIds.ID_PLAYER)
+        MapManager.broadcast_surrounding(final_opcode, data, self.spell_caster,
+                                         include_self=self.spell_caster.get_type_id() == ObjectTypeIds.ID_PLAYER)
@@ -612,22 +612,30 @@ class SpellEffectHandler:
         duration = 120 if duration == 0 else (duration / 1000)
         amount = effect.get_effect_simple_points()
 
+        # Resolve all random spawn locations at once.
+        is_dest_location = casting_spell.spell_target_mask & SpellTargetMask.DEST_LOCATION
+        random_locations = []
+        if is_dest_location or radius > 0.0:
+            random_amount = amount - 1 if is_dest_location else amount
+            random_locations = caster.location.get_random_points_in_radius([radius] * max(random_amount, 0),
+                                                                           caster.map_id)
+
         for count in range(amount):
-            if casting_spell.spell_target_mask & SpellTargetMask.DEST_LOCATION:
+            if is_dest_location:
                 if count == 0:
                     px = target.x
                     py = target.y
                     pz = target.z
                 else:
-                    location = caster.location.get_random_point_in_radius(radius, caster.map_id)
+                    location = random_locations[count - 1]
                     px = location.x
-                    py = location.Y
+                    py = location.y
                     pz = location.z
             else:
                 if radius > 0.0:
-                    location = caster.location.get_random_point_in_radius(radius, caster.map_id)
+                    location = random_locations[count]
                     px = location.x
-                    py = location.Y
+                    py = location.y
                     pz = location.z
                 else:
                     location = target if isinstance(target, Vector) else target.location
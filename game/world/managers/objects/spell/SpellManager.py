@@ -37,8 +37,8 @@ class SpellManager:
         self.cooldowns: dict[int, CooldownEntry] = {}
         self.casting_spells: list[CastingSpell] = []
 
-    def load_spells(self):
-        for spell in RealmDatabaseManager.character_get_spells(self.caster.guid):
+    def load_spells(self, character_spells):
+        for spell in character_spells:
             self.spells[spell.spell] = spell
 
     def can_learn_spell(self, spell_id):
@@ -893,8 +893,8 @@ class SpellManager:
             data.append(casting_spell.used_ranged_attack_item.item_template.inventory_type)
 
         is_player = self.caster.get_type_id() == ObjectTypeIds.ID_PLAYER
-        packet = PacketWriter.get_packet(OpCode.SMSG_SPELL_GO, pack(signature, *data))
-        MapManager.send_surrounding(packet, self.caster, include_self=is_player)
+        MapManager.broadcast_surrounding(OpCode.SMSG_SPELL_GO, pack(signature, *data), self.caster,
+                                         include_self=is_player)
 
     def flush_cooldowns(self):
         for spell_id, cooldown_entry in list(self.cooldowns.items()):
@@ -15,7 +15,7 @@ from game.world.managers.objects.units.DamageInfoHolder import DamageInfoHolder
 from game.world.managers.objects.units.movement.MovementInfo import MovementInfo
 from game.world.managers.objects.units.movement.MovementManager import MovementManager
 from game.world.managers.objects.units.player.StatManager import StatManager, UnitStats
-from network.packet.PacketWriter import PacketWriter, OpCode
+from utils.constants.OpCodes import OpCode
 from utils.ByteUtils import ByteUtils
 from utils.ConfigManager import config
 from utils.Formulas import UnitFormulas
@@ -298,14 +298,14 @@ class UnitManager(ObjectManager):
 
     def send_attack_start(self, victim_guid):
         data = pack('<2Q', self.guid, victim_guid)
-        MapManager.send_surrounding(PacketWriter.get_packet(OpCode.SMSG_ATTACKSTART, data), self)
+        MapManager.broadcast_surrounding(OpCode.SMSG_ATTACKSTART, data, self)
 
     def send_attack_stop(self, victim_guid):
         # Last uint32 is "deceased"; can be either 1 (self is dead), or 0, (self is alive).
         # Forces the unit to face the corpse and disables clientside
         # turning (UnitFlags.DisableMovement) CGUnit_C::OnAttackStop
         data = pack('<2QI', self.guid, victim_guid, 0 if self.is_alive else 1)
-        MapManager.send_surrounding(PacketWriter.get_packet(OpCode.SMSG_ATTACKSTOP, data), self)
+        MapManager.broadcast_surrounding(OpCode.SMSG_ATTACKSTOP, data, self)
 
     def attack_update(self, elapsed):
         # Don't update melee swing timers while casting, stunned, pacified or fleeing..
@@ -1177,8 +1177,8 @@ class UnitManager(ObjectManager):
     def play_emote(self, emote):
         if emote != 0:
             data = pack('<IQ', emote, self.guid)
-            MapManager.send_surrounding_in_range(PacketWriter.get_packet(OpCode.SMSG_EMOTE, data),
-                                                 self, config.World.Chat.ChatRange.emote_range)
+            MapManager.broadcast_surrounding_in_range(OpCode.SMSG_EMOTE, data, self,
+                                                      config.World.Chat.ChatRange.emote_range)
 
     def summon_mount(self, creature_entry):
         creature_template = WorldDatabaseManager.CreatureTemplateHolder.creature_get_by_entry(creature_entry)
@@ -26,8 +26,13 @@ class CreatureSpawn:
         self.respawn_time = 0
         self.last_tick = 0
         self.borrowed = False
+        # Spawns are loaded as plain records, the creature instance is only built once its cell is activated.
+        self.materialized = False
 
     def update(self, now):
+        if not self.materialized:
+            self.materialize()
+
         if now > self.last_tick > 0:
             # Skip update if creature instance is charmed.
             if not self.borrowed:
@@ -63,7 +68,25 @@ class CreatureSpawn:
                 return True
         return False
 
+    def materialize(self):
+        if not self.materialized:
+            self.spawn_creature()
+
+    # Release the creature instance of an idle spawn, it will be built again upon cell activation. Grouped creatures
+    # are kept, group members are only released upon death.
+    def dematerialize(self):
+        creature = self.creature_instance
+        if self.borrowed or not creature or not creature.is_alive or not creature.is_spawned or creature.in_combat \
+                or creature.creature_group:
+            return False
+        # Default instances are removed from the map by despawn.
+        creature.despawn()
+        self.creature_instance = None
+        self.materialized = False
+        return True
+
     def spawn_creature(self):
+        self.materialized = True
         creature_template_id = self._get_creature_entry()
 
         if not creature_template_id:
@@ -90,12 +90,8 @@ class TrainerUtils:
 
         # Send item query details first if needed. (Needs to be SMSG_ITEM_QUERY_SINGLE_RESPONSE)
         if item_templates:
-            packets = []
-            for item_template in item_templates:
-                query_data = ItemManager.generate_query_details_data(item_template)
-                query_packet = PacketWriter.get_packet(OpCode.SMSG_ITEM_QUERY_SINGLE_RESPONSE, query_data)
-                packets.append(query_packet)
-            player_mgr.enqueue_packets(packets)
+            player_mgr.enqueue_packets([ItemManager.get_query_details_packet(item_template)
+                                        for item_template in item_templates])
 
         data_header = pack('<Q2I', creature_mgr.guid, trainer_type, train_spell_count)
         data = data_header + train_spell_bytes + greeting_bytes_packed
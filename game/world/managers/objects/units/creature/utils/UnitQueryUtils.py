@@ -1,6 +1,7 @@
 from struct import pack
 
 from network.packet.PacketWriter import PacketWriter
+from network.packet.QueryResponseCache import QueryResponseCache
 from utils.constants.OpCodes import OpCode
 
 
@@ -9,15 +10,22 @@ class UnitQueryUtils:
     @staticmethod
     def query_details(creature_template=None, creature_mgr=None):
         template = creature_mgr.creature_template if creature_mgr else creature_template
+        entry = creature_mgr.entry if creature_mgr else template.entry
+        creature_type = creature_mgr.creature_type if creature_mgr else template.type
+        return QueryResponseCache.get(OpCode.SMSG_CREATURE_QUERY_RESPONSE, (entry, creature_type),
+                                      lambda: UnitQueryUtils._build_query_details(template, entry, creature_type))
+
+    @staticmethod
+    def _build_query_details(template, entry, creature_type):
         name_bytes = PacketWriter.string_to_bytes(template.name)
         subname_bytes = PacketWriter.string_to_bytes(template.subname)
         data = pack(
             f'<I{len(name_bytes)}ssss{len(subname_bytes)}s3I',
-            creature_mgr.entry if creature_mgr else template.entry,
+            entry,
             name_bytes, b'\x00', b'\x00', b'\x00',
             subname_bytes,
             template.static_flags,
-            creature_mgr.creature_type if creature_mgr else template.type,
+            creature_type,
             template.beast_family
         )
         return PacketWriter.get_packet(OpCode.SMSG_CREATURE_QUERY_RESPONSE, data)
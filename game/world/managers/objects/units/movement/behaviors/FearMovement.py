@@ -75,8 +75,9 @@ class FearMovement(BaseMovement):
     def _get_path(self, fear_point):
         if not config.Server.Settings.use_nav_tiles:
             return [fear_point]
-        for search_range in range(0, int(SEARCH_RANDOM_RADIUS)):
-            destination = fear_point.get_random_point_in_radius(search_range, self.unit.map_id)
+        # Resolve every candidate destination Z at once, the first one with a valid path wins.
+        destinations = fear_point.get_random_points_in_radius(range(0, int(SEARCH_RANDOM_RADIUS)), self.unit.map_id)
+        for destination in destinations:
             failed, in_place, path = MapManager.calculate_path(self.unit.map_id, self.unit.location, destination)
             if not failed:
                 return path
@@ -7,6 +7,9 @@ from utils.ConfigManager import config
 from utils.constants.MiscCodes import MoveType
 from game.world.managers.objects.units.movement.behaviors.BaseMovement import BaseMovement
 
+# Random destinations evaluated per wander attempt.
+WANDER_CANDIDATES = 3
+
 
 # TODO: Namigator: FindRandomPointAroundCircle (Detour)
 class WanderingMovement(BaseMovement):
@@ -49,13 +52,18 @@ class WanderingMovement(BaseMovement):
 
     def _get_wandering_point(self):
         start_point = self.unit.location
-        random_point = start_point.get_random_point_in_radius(self.wandering_distance, map_id=self.unit.map_id)
-        failed, in_place, path = MapManager.calculate_path(self.unit.map_id, start_point, random_point)
-        if failed or len(path) > 1 or in_place:
+        map_ = MapManager.get_map(self.unit.map_id, self.unit.instance_id)
+        # Resolve a few candidates Z at once and keep the one in an active cell with the smallest height difference,
+        # only that one is pathfinded.
+        random_points = start_point.get_random_points_in_radius([self.wandering_distance] * WANDER_CANDIDATES,
+                                                                map_id=self.unit.map_id)
+        candidates = [point for point in random_points if map_.is_active_cell_for_location(point)]
+        if not candidates:
             return start_point
 
-        map_ = MapManager.get_map(self.unit.map_id, self.unit.instance_id)
-        if not map_.is_active_cell_for_location(random_point):
+        random_point = min(candidates, key=lambda point: abs(point.z - start_point.z))
+        failed, in_place, path = MapManager.calculate_path(self.unit.map_id, start_point, random_point)
+        if failed or len(path) > 1 or in_place:
             return start_point
 
         return random_point
@@ -40,7 +40,13 @@ class PetData:
 
         self.action_bar = action_bar if action_bar else self.get_default_action_bar_values()
 
-        self._dirty = pet_id == -1
+        # Changes made so far and changes known to be persisted, the pet is dirty while both differ.
+        self._changes = 1 if pet_id == -1 else 0
+        self._saved_changes = 0
+
+    @property
+    def _dirty(self):
+        return self._changes != self._saved_changes
 
     def save(self, creature_instance=None):
         if not self.permanent or not self._dirty or not self._is_player_owned():
@@ -57,7 +63,19 @@ class PetData:
         else:
             RealmDatabaseManager.character_update_pet(character_pet)
 
-        self._dirty = False
+        self._saved_changes = self._changes
+
+    # Update mapping of a dirty, already persisted pet for bulk saving, as (mapping, changes). The dirty state is only
+    # cleared by mark_saved once the mapping is committed, so failed writes are retried on the next save.
+    def get_save_mapping(self):
+        if not self.permanent or not self._dirty or not self._is_player_owned() or self.pet_id == -1:
+            return None, 0
+        return RealmDatabaseManager.get_row_mapping(self._get_character_pet()), self._changes
+
+    # Called from the character writer thread. Changes made after the mapping was built keep the pet dirty.
+    def mark_saved(self, changes):
+        if changes > self._saved_changes:
+            self._saved_changes = changes
 
     def delete(self):
         if not self.permanent or not self._is_player_owned():
@@ -65,7 +83,7 @@ class PetData:
         RealmDatabaseManager.character_delete_pet(self.pet_id)
 
     def set_dirty(self):
-        self._dirty = True
+        self._changes += 1
 
     def _get_character_pet(self, health=-1, mana=-1) -> CharacterPet:
         # TODO Stats shouldn't be directly from creature data.
@@ -29,13 +29,12 @@ class PetManager:
         self.permanent_pets: list[PetData] = []
         self.active_pets: dict[PetSlot, ActivePet] = {}
 
-    def load_pets(self):
+    # Pet spells are given as spell ids by pet id.
+    def load_pets(self, character_pets, pet_spells):
         if self.owner.get_type_id() != ObjectTypeIds.ID_PLAYER:
             return
 
-        character_pets = RealmDatabaseManager.character_get_pets(self.owner.guid)
         for character_pet in character_pets:
-            spells = RealmDatabaseManager.character_get_pet_spells(self.owner.guid, character_pet.pet_id)
             self.permanent_pets.append(PetData(
                 character_pet.pet_id,
                 character_pet.name,
@@ -46,13 +45,28 @@ class PetManager:
                 character_pet.xp,
                 character_pet.created_by_spell,
                 permanent=True,
-                spells=[spell.spell_id for spell in spells],
+                spells=pet_spells.get(character_pet.pet_id, []),
                 action_bar=list(unpack('10I', character_pet.action_bar)),
                 is_active=character_pet.is_active))
 
     def save(self):
         [pet.save() for pet in self.permanent_pets]
 
+    # Pets not yet in db are saved right away since their id comes from the insert, the rest are returned as bulk
+    # update mappings.
+    # saved_pets is filled with the (pet, changes) to confirm through mark_saved once the mappings are committed.
+    def get_save_mappings(self, saved_pets):
+        mappings = []
+        for pet in self.permanent_pets:
+            if pet.pet_id == -1:
+                pet.save()
+                continue
+            mapping, changes = pet.get_save_mapping()
+            if mapping:
+                mappings.append(mapping)
+                saved_pets.append((pet, changes))
+        return mappings
+
     def set_creature_as_pet(self, creature: CreatureManager, summon_spell_id: int, pet_slot: PetSlot,
                             pet_level=-1, pet_index=-1, is_permanent=False) -> Optional[ActivePet]:
         if self.active_pets.get(pet_slot):
@@ -0,0 +1,122 @@
+from struct import pack
+from threading import RLock
+from typing import Optional
+
+from database.realm.RealmDatabaseManager import RealmDatabaseManager
+from network.packet.PacketWriter import PacketWriter
+from utils.ConfigManager import config
+from utils.constants.MiscCodes import HighGuid
+from utils.constants.OpCodes import OpCode
+
+# Maximum guids requested per db query when filling the cache.
+DB_BATCH_SIZE = 500
+
+
+class CharacterName:
+    __slots__ = ('guid', 'name', 'race', 'gender', 'class_', 'realm_id', '_query_response')
+
+    def __init__(self, guid, name, race, gender, class_, realm_id):
+        self.guid = guid
+        self.name = name
+        self.race = race
+        self.gender = gender
+        self.class_ = class_
+        self.realm_id = realm_id
+        self._query_response = None
+
+    def matches(self, character):
+        return self.name == character.name and self.race == character.race and self.gender == character.gender \
+            and self.class_ == character.class_
+
+    # SMSG_NAME_QUERY_RESPONSE, built on first use.
+    @property
+    def query_response(self) -> bytes:
+        if not self._query_response:
+            name_bytes = PacketWriter.string_to_bytes(self.name)
+            data = pack(
+                f'<Q{len(name_bytes)}s3I',
+                self.guid,
+                name_bytes,
+                self.race,
+                self.gender,
+                self.class_
+            )
+            self._query_response = PacketWriter.get_packet(OpCode.SMSG_NAME_QUERY_RESPONSE, data)
+        return self._query_response
+
+
+# Known characters by low guid and by lowercase name (local realm only).
+NAMES_BY_GUID: dict[int, CharacterName] = {}
+NAMES_BY_NAME: dict[str, CharacterName] = {}
+CACHE_LOCK = RLock()
+
+
+class CharacterNameCache:
+
+    # Adds or refreshes a character (anything with guid, name, race, gender, class_ and realm_id, e.g. a Character
+    # row), returns its cache entry.
+    @staticmethod
+    def add(character) -> CharacterName:
+        guid = character.guid & ~HighGuid.HIGHGUID_PLAYER
+        with CACHE_LOCK:
+            entry = NAMES_BY_GUID.get(guid)
+            if entry and entry.matches(character):
+                return entry
+            if entry:
+                CharacterNameCache.remove(guid)
+
+            entry = CharacterName(character.guid, character.name, character.race, character.gender,
+                                  character.class_, character.realm_id)
+            NAMES_BY_GUID[guid] = entry
+            if entry.realm_id == config.Server.Connection.Realm.local_realm_id:
+                NAMES_BY_NAME[entry.name.lower()] = entry
+            return entry
+
+    # Must be called upon character deletion or rename.
+    @staticmethod
+    def remove(guid):
+        with CACHE_LOCK:
+            entry = NAMES_BY_GUID.pop(guid & ~HighGuid.HIGHGUID_PLAYER, None)
+            if entry and NAMES_BY_NAME.get(entry.name.lower()) is entry:
+                del NAMES_BY_NAME[entry.name.lower()]
+
+    # Same as add, also updating the caches of the other processes (map shards). Meant for authoritative character
+    # data, e.g. upon creation or login.
+    @staticmethod
+    def add_shared(character) -> CharacterName:
+        entry = CharacterNameCache.add(character)
+        from game.world.MapShardManager import MapShardManager
+        MapShardManager.share_state(('name_add', 0, (entry.guid, entry.name, entry.race, entry.gender, entry.class_,
+                                                     entry.realm_id)))
+        return entry
+
+    # Same as remove, also updating the caches of the other processes (map shards).
+    @staticmethod
+    def remove_shared(guid):
+        CharacterNameCache.remove(guid)
+        from game.world.MapShardManager import MapShardManager
+        MapShardManager.share_state(('name_remove', 0, guid))
+
+    @staticmethod
+    def get_by_guid(guid, from_db=True) -> Optional[CharacterName]:
+        entry = NAMES_BY_GUID.get(guid & ~HighGuid.HIGHGUID_PLAYER)
+        if entry or not from_db:
+            return entry
+        CharacterNameCache.preload([guid])
+        return NAMES_BY_GUID.get(guid & ~HighGuid.HIGHGUID_PLAYER)
+
+    @staticmethod
+    def get_by_name(name) -> Optional[CharacterName]:
+        entry = NAMES_BY_NAME.get(name.lower())
+        if entry:
+            return entry
+        character = RealmDatabaseManager.character_get_by_name(name)
+        return CharacterNameCache.add(character) if character else None
+
+    # Fills the cache for the given guids not yet known, using as few db queries as possible.
+    @staticmethod
+    def preload(guids):
+        missing_guids = list({guid & ~HighGuid.HIGHGUID_PLAYER for guid in guids} - NAMES_BY_GUID.keys())
+        for index in range(0, len(missing_guids), DB_BATCH_SIZE):
+            for character in RealmDatabaseManager.character_get_names(missing_guids[index:index + DB_BATCH_SIZE]):
+                CharacterNameCache.add(character)
@@ -2,6 +2,7 @@ from struct import pack
 
 from database.realm.RealmDatabaseManager import RealmDatabaseManager
 from database.realm.RealmModels import CharacterSocial
+from game.world.managers.objects.units.player.CharacterNameCache import CharacterNameCache
 from game.world.WorldSessionStateHandler import WorldSessionStateHandler
 from game.world.managers.maps.MapManager import MapManager
 from game.world.opcode_handling.handlers.player.NameQueryHandler import NameQueryHandler
@@ -29,9 +30,9 @@ class FriendsManager(object):
         target_guid = 0
         target_team = 0
 
-        # Try to pull the character from DB.
+        # Try to pull the character from cache or DB.
         if not online_player:
-            offline_player = RealmDatabaseManager.character_get_by_name(target_name)
+            offline_player = CharacterNameCache.get_by_name(target_name)
             if offline_player:
                 target_guid = offline_player.guid
                 from game.world.managers.objects.units.player.PlayerManager import PlayerManager
@@ -114,9 +115,9 @@ class FriendsManager(object):
         online_player = WorldSessionStateHandler.find_player_by_name(target_name)
         target_guid = 0
 
-        # Try to pull the character from DB.
+        # Try to pull the character from cache or DB.
         if not online_player:
-            offline_player = RealmDatabaseManager.character_get_by_name(target_name)
+            offline_player = CharacterNameCache.get_by_name(target_name)
             if offline_player:
                 target_guid = offline_player.guid
                 status = FriendResults.FRIEND_IGNORE_ADDED
@@ -2,6 +2,7 @@ from struct import pack
 
 from database.realm.RealmDatabaseManager import RealmDatabaseManager
 from database.realm.RealmModels import Group, GroupMember
+from game.world.managers.objects.units.player.CharacterNameCache import CharacterNameCache
 from game.world.WorldSessionStateHandler import WorldSessionStateHandler
 from game.world.managers.maps.MapManager import MapManager
 from game.world.opcode_handling.handlers.player.NameQueryHandler import NameQueryHandler
@@ -29,9 +30,10 @@ class GroupManager(object):
 
     def load_group_members(self):
         members = RealmDatabaseManager.group_get_members(self.group)
+        CharacterNameCache.preload([member.guid for member in members])
         for member in members:
             # If this member is no longer available on the database, remove it.
-            if not RealmDatabaseManager.character_get_by_guid(member.guid):
+            if not CharacterNameCache.get_by_guid(member.guid, from_db=False):
                 RealmDatabaseManager.group_remove_member(member)
             else:
                 self.members[member.guid] = member
@@ -481,8 +483,7 @@ class GroupManager(object):
             GROUPS[raw_group.group_id] = group_manager
 
     @staticmethod
-    def set_character_group(player_mgr):
-        group_id = RealmDatabaseManager.character_get_group_id(player_mgr.player)
+    def set_character_group(player_mgr, group_id):
         if group_id >= 0 and group_id in GROUPS:
             player_mgr.group_manager = GROUPS[group_id]
 
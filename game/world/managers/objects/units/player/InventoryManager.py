@@ -28,8 +28,7 @@ class InventoryManager(object):
             InventorySlots.SLOT_BAG4: None
         }
 
-    def load_items(self):
-        character_inventory = RealmDatabaseManager.character_get_inventory(self.owner.guid)
+    def load_items(self, character_inventory):
 
         # First load bags
         for item_instance in character_inventory:
@@ -931,6 +930,4 @@ class InventoryManager(object):
 
     # noinspection PyMethodMayBeStatic
     def _get_single_item_partial_update_packet(self, item, requester):
-        update_packet = UpdatePacketFactory.compress_if_needed(PacketWriter.get_packet(
-            OpCode.SMSG_UPDATE_OBJECT, item.get_partial_update_bytes(requester)))
-        return update_packet
+        return item.generate_partial_packet(requester)
@@ -0,0 +1,62 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from database.realm.RealmDatabaseManager import RealmDatabaseManager
+from utils.constants.MiscCodes import HighGuid
+
+# Maximum concurrent login queries, shared by every session logging in.
+MAX_LOGIN_DB_WORKERS = 4
+LOGIN_DB_EXECUTOR = ThreadPoolExecutor(max_workers=MAX_LOGIN_DB_WORKERS, thread_name_prefix='Login loader')
+
+
+# Every per-character row needed to put a player in world, fetched concurrently so login time no longer adds up the
+# latency of each table. Managers are initialized from it on the session thread.
+class PlayerLoginData:
+    __slots__ = ('character', 'skills', 'spells', 'pets', 'pet_spells', 'deathbind', 'social', 'buttons',
+                 'inventory', 'quests', 'reputations', 'guild', 'group_id')
+
+    def __init__(self):
+        self.character = None
+        self.skills = []
+        self.spells = []
+        self.pets = []
+        self.pet_spells = {}
+        self.deathbind = None
+        self.social = []
+        self.buttons = {}
+        self.inventory = []
+        self.quests = []
+        self.reputations = []
+        self.guild = None
+        self.group_id = -1
+
+    # Returns None if the character does not exist.
+    @staticmethod
+    def load(guid):
+        guid = guid & ~HighGuid.HIGHGUID_PLAYER
+        submit = LOGIN_DB_EXECUTOR.submit
+        character = submit(RealmDatabaseManager.character_get_by_guid, guid)
+        futures = {
+            'skills': submit(RealmDatabaseManager.character_get_skills, guid),
+            'spells': submit(RealmDatabaseManager.character_get_spells, guid),
+            'pets': submit(RealmDatabaseManager.character_get_pets, guid),
+            'pet_spells': submit(RealmDatabaseManager.character_get_all_pet_spells, guid),
+            'deathbind': submit(RealmDatabaseManager.character_get_deathbind, guid),
+            'social': submit(RealmDatabaseManager.character_get_social, guid),
+            'buttons': submit(RealmDatabaseManager.character_get_buttons, guid),
+            'inventory': submit(RealmDatabaseManager.character_get_inventory, guid),
+            'quests': submit(RealmDatabaseManager.character_get_quests, guid),
+            'reputations': submit(RealmDatabaseManager.character_get_reputations, guid),
+        }
+
+        login_data = PlayerLoginData()
+        login_data.character = character.result()
+        if login_data.character:
+            # Guild and group lookups take the character row.
+            futures['guild'] = submit(RealmDatabaseManager.character_get_guild, login_data.character)
+            futures['group_id'] = submit(RealmDatabaseManager.character_get_group_id, login_data.character)
+
+        # Wait for every query even for an unknown character, so their errors are not silently dropped.
+        for attribute, future in futures.items():
+            setattr(login_data, attribute, future.result())
+
+        return login_data if login_data.character else None
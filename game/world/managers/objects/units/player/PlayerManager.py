@@ -18,6 +18,7 @@ from game.world.managers.objects.units.player.ChannelManager import ChannelManag
 from game.world.managers.objects.units.player.EnchantmentManager import EnchantmentManager
 from game.world.managers.objects.units.player.SkillManager import SkillManager
 from game.world.managers.objects.units.player.TalentManager import TalentManager
+from game.world.managers.objects.units.player.WhoManager import WhoManager
 from game.world.managers.objects.units.player.trade.TradeManager import TradeManager
 from game.world.managers.objects.units.player.quest.QuestManager import QuestManager
 from game.world.managers.objects.units.UnitManager import UnitManager
@@ -336,9 +337,10 @@ class PlayerManager(UnitManager):
         return PacketWriter.get_packet(OpCode.SMSG_TUTORIAL_FLAGS, pack('<18I', 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
                                                                         0, 0, 0, 0, 0))
 
-    def get_action_buttons(self):
+    def get_action_buttons(self, player_buttons=None):
         data = b''
-        player_buttons = RealmDatabaseManager.character_get_buttons(self.player.guid)
+        if player_buttons is None:
+            player_buttons = RealmDatabaseManager.character_get_buttons(self.player.guid)
         for x in range(MAX_ACTION_BUTTONS):
             if player_buttons and x in player_buttons:
                 data += pack('<i', player_buttons[x])
@@ -1128,6 +1130,7 @@ class PlayerManager(UnitManager):
                 self.level = level
                 self.set_uint32(UnitFields.UNIT_FIELD_LEVEL, self.level)
                 self.player.leveltime = 0
+                WhoManager.update_player(self)
 
                 self.skill_manager.update_skills_max_value()
                 self.skill_manager.build_update()
@@ -1184,6 +1187,7 @@ class PlayerManager(UnitManager):
     def on_zone_change(self, new_zone):
         # Update player zone.
         self.zone = new_zone
+        WhoManager.update_player(self)
         # Update friends and group.
         self.friends_manager.send_update_to_friends()
         if self.group_manager:
@@ -1883,7 +1887,15 @@ class PlayerManager(UnitManager):
             self.stealth_detect_timer = 0
 
     def _on_relocation(self):
-        for guid, unit in MapManager.get_surrounding_units(self).items():
+        # Creatures ignore beast masters.
+        if self.beast_master:
+            return
+        # Only creatures whose detection radius reaches us or our active pet can react to this move.
+        locations = [self.location]
+        active_pet = self.pet_manager.get_active_controlled_pet()
+        if active_pet:
+            locations.append(active_pet.creature.location)
+        for unit in MapManager.get_surrounding_aggro_creatures(self, locations):
             # Skip notify if the unit is already in combat with self, not alive or not spawned.
             if not unit.threat_manager.has_aggro_from(self) and unit.is_alive and unit.is_spawned:
                 unit.notify_moved_in_line_of_sight(self)
@@ -237,8 +237,8 @@ class SkillManager(object):
         # Used to determine which talents should be excluded from the player (ie. 2H talents from rogues).
         self.full_proficiency_masks = {}
 
-    def load_skills(self):
-        for skill in RealmDatabaseManager.character_get_skills(self.player_mgr.guid):
+    def load_skills(self, character_skills):
+        for skill in character_skills:
             self.skills[skill.skill] = skill
         self.update_skills_max_value()
 
@@ -0,0 +1,249 @@
+import threading
+
+from utils.Logger import Logger
+
+# Online players by guid, and the same guids bucketed by every WHO search criteria, kept up to date upon login, logout,
+# zone and level changes so searches are set intersections without any db access.
+ONLINE_PLAYERS = {}
+GUIDS_BY_AREA: dict[int, set[int]] = {}
+GUIDS_BY_LEVEL: dict[int, set[int]] = {}
+GUIDS_BY_RACE: dict[int, set[int]] = {}
+GUIDS_BY_CLASS: dict[int, set[int]] = {}
+# Indexed values of each player as (area ids, level), needed to remove it from the right buckets later on.
+INDEXED_VALUES: dict[int, tuple[tuple, int]] = {}
+# Area ids (zone and its parent area) by (zone, map_id).
+AREAS_BY_ZONE: dict[tuple[int, int], tuple] = {}
+INDEX_LOCK = threading.RLock()
+
+MAX_WHO_RESULTS = 49
+
+
+# WHO relevant values of a player online on a map shard worker, as known by the world process.
+class RemotePlayer:
+    __slots__ = ('guid', 'name', 'race', 'class_', 'level', 'zone', 'map_id', 'group_status', 'shard_id')
+
+    def __init__(self, guid, name, race, class_, level, zone, map_id, group_status, shard_id):
+        self.guid = guid
+        self.name = name
+        self.race = race
+        self.class_ = class_
+        self.level = level
+        self.zone = zone
+        self.map_id = map_id
+        self.group_status = group_status
+        self.shard_id = shard_id
+
+    @staticmethod
+    def from_player(player_mgr, shard_id):
+        return RemotePlayer(player_mgr.guid, player_mgr.get_name(), player_mgr.race, player_mgr.class_,
+                            player_mgr.level, player_mgr.zone, player_mgr.map_id, player_mgr.group_status, shard_id)
+
+    @property
+    def online(self):
+        return True
+
+    @property
+    def guild_manager(self):
+        from game.world.managers.objects.units.player.guild.GuildManager import GuildManager
+        for guild_manager in list(GuildManager.GUILDS.values()):
+            if self.guid in guild_manager.members:
+                return guild_manager
+        return None
+
+    def get_name(self):
+        return self.name
+
+
+class WhoManager:
+
+    @staticmethod
+    def add_player(player_mgr):
+        WhoManager._add(player_mgr)
+        WhoManager._notify_world('who_add', player_mgr)
+
+    @staticmethod
+    def remove_player(player_mgr):
+        if WhoManager._remove(player_mgr.guid):
+            WhoManager._notify_world('who_remove', player_mgr)
+
+    # Must be called whenever the player zone, map or level changes.
+    @staticmethod
+    def update_player(player_mgr):
+        with INDEX_LOCK:
+            if player_mgr.guid not in ONLINE_PLAYERS:
+                return
+            if INDEXED_VALUES.get(player_mgr.guid) == (WhoManager._get_area_ids(player_mgr), player_mgr.level):
+                return
+            WhoManager._unindex_values(player_mgr.guid)
+            WhoManager._index_values(player_mgr)
+        WhoManager._notify_world('who_add', player_mgr)
+
+    @staticmethod
+    def get_player(guid):
+        return ONLINE_PLAYERS.get(guid)
+
+    # World process, players online on map shard workers. Players in world on this process take precedence, a late
+    # message from the shard a player just left must not drop it.
+
+    @staticmethod
+    def add_remote_player(remote_player):
+        with INDEX_LOCK:
+            current_player = ONLINE_PLAYERS.get(remote_player.guid)
+            if current_player and not isinstance(current_player, RemotePlayer):
+                return
+            WhoManager._add(remote_player)
+
+    @staticmethod
+    def remove_remote_player(remote_player):
+        with INDEX_LOCK:
+            if isinstance(ONLINE_PLAYERS.get(remote_player.guid), RemotePlayer):
+                WhoManager._remove(remote_player.guid)
+
+    # The given shard is gone.
+    @staticmethod
+    def remove_remote_players(shard_id):
+        with INDEX_LOCK:
+            for guid, player in list(ONLINE_PLAYERS.items()):
+                if isinstance(player, RemotePlayer) and player.shard_id == shard_id:
+                    WhoManager._remove(guid)
+
+    @staticmethod
+    def _add(player):
+        with INDEX_LOCK:
+            WhoManager._remove(player.guid)
+            ONLINE_PLAYERS[player.guid] = player
+            WhoManager._add_to_bucket(GUIDS_BY_RACE, player.race, player.guid)
+            WhoManager._add_to_bucket(GUIDS_BY_CLASS, player.class_, player.guid)
+            WhoManager._index_values(player)
+
+    @staticmethod
+    def _remove(guid):
+        with INDEX_LOCK:
+            player = ONLINE_PLAYERS.pop(guid, None)
+            if not player:
+                return False
+            WhoManager._remove_from_bucket(GUIDS_BY_RACE, player.race, guid)
+            WhoManager._remove_from_bucket(GUIDS_BY_CLASS, player.class_, guid)
+            WhoManager._unindex_values(guid)
+            return True
+
+    # Map shard workers forward their players to the world process, which is the one answering WHO requests.
+    @staticmethod
+    def _notify_world(action, player_mgr):
+        from game.world.MapShardManager import MapShardManager
+        if MapShardManager.is_worker():
+            MapShardManager.notify_world((action, 0, RemotePlayer.from_player(player_mgr,
+                                                                              MapShardManager.get_local_shard())))
+
+    # Returns the total of online players and up to MAX_WHO_RESULTS player managers matching the search.
+    @staticmethod
+    def search(level_min, level_max, player_name, guild_name, race_mask, class_mask, zones, user_strings):
+        with INDEX_LOCK:
+            online_count = len(ONLINE_PLAYERS)
+            candidates = [
+                WhoManager._get_bucket_union(GUIDS_BY_LEVEL, lambda level: level_min <= level <= level_max),
+            ]
+            if race_mask != 0xFFFFFFFF:
+                candidates.append(WhoManager._get_bucket_union(GUIDS_BY_RACE, lambda race: race_mask & 1 << race - 1))
+            if class_mask != 0xFFFFFFFF:
+                candidates.append(WhoManager._get_bucket_union(GUIDS_BY_CLASS,
+                                                               lambda class_: class_mask & 1 << class_ - 1))
+            if zones:
+                candidates.append(WhoManager._get_bucket_union(GUIDS_BY_AREA, lambda area_id: area_id in zones))
+            if guild_name:
+                candidates.append(WhoManager._get_guild_members(guild_name.lower()))
+
+            # Intersect starting from the smallest set.
+            candidates.sort(key=len)
+            guids = candidates[0].intersection(*candidates[1:])
+            players = [ONLINE_PLAYERS[guid] for guid in guids]
+
+        player_name = player_name.lower()
+        user_strings = [string.lower() for string in user_strings]
+        results = []
+        for player_mgr in players:
+            if not player_mgr.online:
+                continue
+            name = player_mgr.get_name().lower()
+            if player_name and player_name not in name:
+                continue
+            if user_strings and not any(string in name for string in user_strings):
+                continue
+            results.append(player_mgr)
+            if len(results) == MAX_WHO_RESULTS:
+                break
+
+        return online_count, results
+
+    @staticmethod
+    def _index_values(player_mgr):
+        area_ids = WhoManager._get_area_ids(player_mgr)
+        for area_id in area_ids:
+            WhoManager._add_to_bucket(GUIDS_BY_AREA, area_id, player_mgr.guid)
+        WhoManager._add_to_bucket(GUIDS_BY_LEVEL, player_mgr.level, player_mgr.guid)
+        INDEXED_VALUES[player_mgr.guid] = (area_ids, player_mgr.level)
+
+    @staticmethod
+    def _unindex_values(guid):
+        indexed_values = INDEXED_VALUES.pop(guid, None)
+        if not indexed_values:
+            return
+        area_ids, level = indexed_values
+        for area_id in area_ids:
+            WhoManager._remove_from_bucket(GUIDS_BY_AREA, area_id, guid)
+        WhoManager._remove_from_bucket(GUIDS_BY_LEVEL, level, guid)
+
+    # Player zone plus its parent area if any, resolved once per zone.
+    @staticmethod
+    def _get_area_ids(player_mgr):
+        key = (player_mgr.zone, player_mgr.map_id)
+        area_ids = AREAS_BY_ZONE.get(key)
+        if area_ids is not None:
+            return area_ids
+
+        from database.dbc.DbcDatabaseManager import DbcDatabaseManager
+        current_areas = [DbcDatabaseManager.area_get_by_id_and_map_id(player_mgr.zone, player_mgr.map_id)]
+        # If the current zone has a parent zone, look for it and add it.
+        if current_areas[0] and current_areas[0].ParentAreaNum > 0:
+            current_areas.append(DbcDatabaseManager.area_get_by_area_number(current_areas[0].ParentAreaNum,
+                                                                            player_mgr.map_id))
+        area_ids = tuple(area.ID for area in current_areas if area)
+        if not area_ids:
+            Logger.warning(f'[WhoManager] Unable to resolve zone {player_mgr.zone} on map {player_mgr.map_id}.')
+        AREAS_BY_ZONE[key] = area_ids
+        return area_ids
+
+    # Online members of every guild whose name contains the given text.
+    @staticmethod
+    def _get_guild_members(guild_name):
+        from game.world.managers.objects.units.player.guild.GuildManager import GuildManager
+        guids = set()
+        for name, guild_manager in list(GuildManager.GUILDS.items()):
+            if guild_name in name.lower():
+                guids.update(guid for guid in list(guild_manager.members.keys()) if guid in ONLINE_PLAYERS)
+        return guids
+
+    @staticmethod
+    def _get_bucket_union(buckets, key_filter):
+        guids = set()
+        for key, bucket in buckets.items():
+            if key_filter(key):
+                guids.update(bucket)
+        return guids
+
+    @staticmethod
+    def _add_to_bucket(buckets, key, guid):
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = set()
+            buckets[key] = bucket
+        bucket.add(guid)
+
+    @staticmethod
+    def _remove_from_bucket(buckets, key, guid):
+        bucket = buckets.get(key)
+        if bucket is None:
+            return
+        bucket.discard(guid)
+        if not bucket:
+            del buckets[key]
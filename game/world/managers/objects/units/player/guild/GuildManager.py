@@ -5,6 +5,7 @@ from database.realm.RealmDatabaseManager import RealmDatabaseManager, Guild, Gui
 from game.world.WorldSessionStateHandler import WorldSessionStateHandler
 from game.world.managers.maps.MapManager import MapManager
 from game.world.managers.objects.units.player.guild.GuildPendingInvite import GuildPendingInvite
+from game.world.opcode_handling.handlers.interface.CharEnumHandler import CharEnumHandler
 from network.packet.PacketWriter import PacketWriter, OpCode
 from utils.ConfigManager import config
 from utils.TextUtils import TextChecker
@@ -145,6 +146,7 @@ class GuildManager(object):
 
         # Pop it at the end, so he gets the above message.
         RealmDatabaseManager.guild_remove_member(member)
+        CharEnumHandler.invalidate_character(player_guid)
         player_mgr = WorldSessionStateHandler.find_player_by_guid(player_guid)
         self.members.pop(player_guid)
 
@@ -166,6 +168,7 @@ class GuildManager(object):
         self.send_message_to_guild(packet, GuildChatMessageTypes.G_MSGTYPE_ALL)
 
         RealmDatabaseManager.guild_remove_member(member)
+        CharEnumHandler.invalidate_character(player_guid)
         self.members.pop(player_guid)
         player_mgr = WorldSessionStateHandler.find_player_by_guid(player_guid)
         if player_mgr:
@@ -184,6 +187,7 @@ class GuildManager(object):
         self.send_message_to_guild(packet, GuildChatMessageTypes.G_MSGTYPE_ALL)
 
         for member in self.members.values():
+            CharEnumHandler.invalidate_character(member.guid)
             player_mgr = WorldSessionStateHandler.find_player_by_guid(member.guid)
             if player_mgr:
                 self.build_update(player_mgr, unset=True)
@@ -339,6 +343,7 @@ class GuildManager(object):
         member.rank = int(rank)
         member.guid = player_guid
         RealmDatabaseManager.guild_add_member(member)
+        CharEnumHandler.invalidate_character(player_guid)
 
         if rank == int(GuildRank.GUILDRANK_GUILD_MASTER):
             self.guild_master = member
@@ -391,8 +396,7 @@ class GuildManager(object):
         return True
 
     @staticmethod
-    def set_character_guild(player_mgr):
-        guild = RealmDatabaseManager.character_get_guild(player_mgr.player)
+    def set_character_guild(player_mgr, guild):
         if guild and guild.name in GuildManager.GUILDS:
             player_mgr.guild_manager = GuildManager.GUILDS[guild.name]
 
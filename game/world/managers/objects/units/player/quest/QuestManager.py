@@ -12,6 +12,7 @@ from game.world.managers.objects.units.player.quest.ActiveQuest import ActiveQue
 from game.world.managers.objects.units.player.quest.QuestHelpers import QuestHelpers
 from game.world.managers.objects.units.player.quest.QuestMenu import QuestMenu
 from network.packet.PacketWriter import PacketWriter, OpCode
+from network.packet.QueryResponseCache import QueryResponseCache
 from utils.ConfigManager import config
 from utils.GuidUtils import GuidUtils
 from utils.Logger import Logger
@@ -36,8 +37,7 @@ class QuestManager(object):
         self.active_quests = {}
         self.completed_quests = set()
 
-    def load_quests(self):
-        quest_db_states = RealmDatabaseManager.character_get_quests(self.player_mgr.guid)
+    def load_quests(self, quest_db_states):
         for quest_db_state in quest_db_states:
             if quest_db_state.rewarded > 0:
                 self.completed_quests.add(quest_db_state.quest)
@@ -466,8 +466,7 @@ class QuestManager(object):
         display_id = 0
         if item_template:
             display_id = item_template.display_id
-            query_data = ItemManager.generate_query_details_data(item_template)
-            self.player_mgr.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_ITEM_QUERY_SINGLE_RESPONSE, query_data))
+            self.player_mgr.enqueue_packet(ItemManager.get_query_details_packet(item_template))
 
         item_data = pack(
             '<3I',
@@ -561,6 +560,23 @@ class QuestManager(object):
         self.player_mgr.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_QUESTGIVER_QUEST_DETAILS, data))
 
     def send_quest_query_response(self, quest):
+        # Send query details for gameobjects and creatures in case they are out of range.
+        for creature_or_go in QuestHelpers.generate_req_creature_or_go_list(quest):
+            if creature_or_go < 0:
+                go_template = WorldDatabaseManager.GameobjectTemplateHolder.gameobject_get_by_entry(-creature_or_go)
+                if go_template:
+                    self.player_mgr.enqueue_packet(GoQueryUtils.query_details(gobject_template=go_template))
+            elif creature_or_go > 0:
+                creature_template = WorldDatabaseManager.CreatureTemplateHolder.creature_get_by_entry(creature_or_go)
+                if creature_template:
+                    self.player_mgr.enqueue_packet(UnitQueryUtils.query_details(creature_template))
+
+        self.player_mgr.enqueue_packet(QueryResponseCache.get(OpCode.SMSG_QUEST_QUERY_RESPONSE, (quest.entry,),
+                                                              lambda: QuestManager._build_quest_query_response(quest)))
+
+    # Quest query responses only depend on the quest template.
+    @staticmethod
+    def _build_quest_query_response(quest):
         data = pack(
             f'<3Ii4I',
             quest.entry,
@@ -616,16 +632,6 @@ class QuestManager(object):
                 0x0  # Unknown, if missing, multiple objective quests will not display properly.
             )
 
-            # Send query details for gameobjects and creatures in case they are out of range.
-            if creature_or_go < 0:
-                go_template = WorldDatabaseManager.GameobjectTemplateHolder.gameobject_get_by_entry(-creature_or_go)
-                if go_template:
-                    self.player_mgr.enqueue_packet(GoQueryUtils.query_details(gobject_template=go_template))
-            elif creature_or_go > 0:
-                creature_template = WorldDatabaseManager.CreatureTemplateHolder.creature_get_by_entry(creature_or_go)
-                if creature_template:
-                    self.player_mgr.enqueue_packet(UnitQueryUtils.query_details(creature_template))
-
         # Objective texts.
         req_objective_text_list = QuestHelpers.generate_objective_text_list(quest)
         for index, objective_text in enumerate(req_objective_text_list):
@@ -635,7 +641,7 @@ class QuestManager(object):
                 req_objective_text_bytes
             )
 
-        self.player_mgr.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_QUEST_QUERY_RESPONSE, data))
+        return PacketWriter.get_packet(OpCode.SMSG_QUEST_QUERY_RESPONSE, data)
 
     def send_quest_giver_request_items(self, quest, quest_giver_id, close_on_cancel):
         # We can always call to RequestItems, but this packet only goes out if there are actually
@@ -1201,6 +1207,10 @@ class QuestManager(object):
     def save(self):
         [quest.save() for quest in list(self.active_quests.values())]
 
+    # Update mappings of the active quests for bulk saving.
+    def get_save_mappings(self):
+        return [RealmDatabaseManager.get_row_mapping(quest.db_state) for quest in list(self.active_quests.values())]
+
     def _create_db_quest_status(self, quest):
         db_quest_status = CharacterQuestState()
         db_quest_status.guid = self.player_mgr.guid
@@ -1,4 +1,4 @@
-from database.realm.RealmDatabaseManager import RealmDatabaseManager
+from game.world.managers.objects.units.player.CharacterNameCache import CharacterNameCache
 from game.world.managers.objects.units.player.GroupManager import GroupManager
 from network.packet.PacketReader import *
 from utils.constants.GroupCodes import PartyOperations, PartyResults
@@ -10,7 +10,7 @@ class GroupUnInviteGuidHandler(object):
     def handle(world_session, socket, reader):
         if len(reader.data) >= 8:  # Avoid handling empty group uninvite guid packet.
             guid = unpack('<Q', reader.data[:8])[0]
-            target_player_mgr = RealmDatabaseManager.character_get_by_guid(guid)
+            target_player_mgr = CharacterNameCache.get_by_guid(guid)
 
             if not world_session.player_mgr.group_manager:
                 GroupManager.send_group_operation_result(world_session.player_mgr, PartyOperations.PARTY_OP_LEAVE, '',
@@ -1,4 +1,5 @@
 from database.realm.RealmDatabaseManager import RealmDatabaseManager
+from game.world.managers.objects.units.player.CharacterNameCache import CharacterNameCache
 from game.world.managers.objects.units.player.GroupManager import GroupManager
 from network.packet.PacketReader import *
 from utils.constants.GroupCodes import PartyOperations, PartyResults
@@ -10,7 +11,7 @@ class GroupUnInviteHandler(object):
     def handle(world_session, socket, reader):
         if len(reader.data) > 1:  # Avoid handling empty Group Uninvite packet.
             target_name = PacketReader.read_string(reader.data, 0).strip()
-            target_player_mgr = RealmDatabaseManager.character_get_by_name(target_name)
+            target_player_mgr = CharacterNameCache.get_by_name(target_name)
 
             if not world_session.player_mgr.group_manager:
                 GroupManager.send_group_operation_result(world_session.player_mgr, PartyOperations.PARTY_OP_LEAVE, '',
@@ -1,4 +1,5 @@
 from database.realm.RealmDatabaseManager import RealmDatabaseManager
+from game.world.managers.objects.units.player.CharacterNameCache import CharacterNameCache
 from game.world.managers.objects.units.player.guild.GuildManager import GuildManager
 from network.packet.PacketReader import *
 from utils.constants.MiscCodes import GuildCommandResults, GuildTypeCommand, GuildRank
@@ -10,7 +11,7 @@ class GuildLeaderHandler(object):
     def handle(world_session, socket, reader):
         if len(reader.data) > 1:  # Avoid handling empty Guild Demote packet.
             target_name = PacketReader.read_string(reader.data, 0).strip()
-            target_player_mgr = RealmDatabaseManager.character_get_by_name(target_name)
+            target_player_mgr = CharacterNameCache.get_by_name(target_name)
             player_mgr = world_session.player_mgr
 
             if not player_mgr.guild_manager:
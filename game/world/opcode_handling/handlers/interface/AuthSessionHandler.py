@@ -42,7 +42,6 @@ class AuthSessionHandler(object):
         WorldSessionStateHandler.add(world_session)
 
         data = pack('<B', auth_code)
-        # We directly send this through the socket, skipping queue model.
-        world_session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_AUTH_RESPONSE, data))
+        world_session.send_auth_response(PacketWriter.get_packet(OpCode.SMSG_AUTH_RESPONSE, data))
 
         return 0 if auth_code == AuthCode.AUTH_OK else -1
@@ -1,9 +1,11 @@
 from database.dbc.DbcDatabaseManager import DbcDatabaseManager
 from database.realm.RealmDatabaseManager import *
 from database.world.WorldDatabaseManager import *
+from game.world.managers.objects.units.player.CharacterNameCache import CharacterNameCache
 from game.world.managers.objects.item.ItemManager import ItemManager
 from game.world.managers.objects.units.player.ReputationManager import ReputationManager
 from game.world.managers.objects.units.player.SkillManager import SkillManager
+from game.world.opcode_handling.handlers.interface.CharEnumHandler import CharEnumHandler
 from network.packet.PacketReader import *
 from network.packet.PacketWriter import *
 from utils import TextUtils
@@ -77,6 +79,7 @@ class CharCreateHandler(object):
                                   power4=100 if class_ == Classes.CLASS_ROGUE else 0,
                                   level=config.Unit.Player.Defaults.starting_level)
             RealmDatabaseManager.character_create(character)
+            CharacterNameCache.add_shared(character)
             CharCreateHandler.generate_starting_reputations(character.guid)
             CharCreateHandler.generate_starting_spells(character.guid, race, class_, character.level)
             CharCreateHandler.generate_starting_spells_skills(character.guid, race, class_, character.level)
@@ -94,6 +97,7 @@ class CharCreateHandler(object):
                 deathbind_position_z=z
             )
             RealmDatabaseManager.character_add_deathbind(default_deathbind)
+            CharEnumHandler.invalidate(world_session.account_mgr.account.id)
 
         data = pack('<B', result)
         world_session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_CHAR_CREATE, data))
@@ -1,7 +1,9 @@
 from struct import unpack
 
 from database.realm.RealmDatabaseManager import *
+from game.world.managers.objects.units.player.CharacterNameCache import CharacterNameCache
 from game.world.WorldSessionStateHandler import WorldSessionStateHandler
+from game.world.opcode_handling.handlers.interface.CharEnumHandler import CharEnumHandler
 from network.packet.PacketWriter import *
 from utils.Logger import Logger
 from utils.constants.CharCodes import *
@@ -42,6 +44,8 @@ class CharDeleteHandler(object):
 
         # Check if the whole group needs to be erased while all members were offline.
         if res != CharDelete.CHAR_DELETE_FAILED:
+            CharacterNameCache.remove_shared(guid)
+            CharEnumHandler.invalidate(world_session.account_mgr.account.id)
             if not disbanded and party_group and not online_party_members:
                 # Group might've been destroyed on cascade event by now, try to retrieve again.
                 group = RealmDatabaseManager.group_by_id(party_group.group_id)
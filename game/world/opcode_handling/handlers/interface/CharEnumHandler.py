@@ -2,26 +2,64 @@ from database.realm.RealmDatabaseManager import *
 from database.world.WorldDatabaseManager import WorldDatabaseManager
 from network.packet.PacketWriter import *
 
+# Ready to send SMSG_CHAR_ENUM packets by account id, must be invalidated whenever any of the account characters is
+# created, deleted, leaves the world or changes guild.
+CHAR_ENUM_PACKETS: dict[int, bytes] = {}
+# Account id of the characters of every cached packet, by character guid.
+ACCOUNT_BY_GUID: dict[int, int] = {}
+
 
 class CharEnumHandler(object):
 
     @staticmethod
     def handle(world_session, socket, reader):
-        characters = RealmDatabaseManager.account_get_characters(world_session.account_mgr.account.id)
-        count = len(characters)
-
-        data = pack('<B', count)
-        for character in characters:
-            data += CharEnumHandler.get_char_packet(world_session, character)
-        world_session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_CHAR_ENUM, data))
+        account_id = world_session.account_mgr.account.id
+        packet = CHAR_ENUM_PACKETS.get(account_id)
+        if not packet:
+            packet = CharEnumHandler.get_char_enum_packet(account_id)
+            CHAR_ENUM_PACKETS[account_id] = packet
+        world_session.enqueue_packet(packet)
 
         return 0
 
+    # Character lists are only served by the world process, map shard workers forward their invalidations.
+    @staticmethod
+    def invalidate(account_id):
+        CHAR_ENUM_PACKETS.pop(account_id, None)
+        from game.world.MapShardManager import MapShardManager
+        MapShardManager.notify_world(('char_enum_invalidate', 0, account_id))
+
     @staticmethod
-    def get_char_packet(world_session, character):
-        guild = RealmDatabaseManager.character_get_guild(character)
-        pet_info = CharEnumHandler._get_pet_info(character.guid)
+    def invalidate_character(guid):
+        account_id = ACCOUNT_BY_GUID.get(guid & ~HighGuid.HIGHGUID_PLAYER)
+        if account_id is not None:
+            CHAR_ENUM_PACKETS.pop(account_id, None)
+        from game.world.MapShardManager import MapShardManager
+        MapShardManager.notify_world(('char_enum_invalidate_character', 0, guid))
+
+    @staticmethod
+    def get_char_enum_packet(account_id):
+        characters, equipment = RealmDatabaseManager.account_get_characters_enum_data(account_id)
+
+        items_by_owner = {}
+        for owner, slot, item_entry in equipment:
+            items_by_owner.setdefault(owner, {})[slot] = item_entry
 
+        char_packets = {}
+        for character, guild_id, pet_creature_id, pet_level in characters:
+            # A character could be joined with more than one active pet, keep the first one as before.
+            if character.guid in char_packets:
+                continue
+            ACCOUNT_BY_GUID[character.guid] = account_id
+            char_packets[character.guid] = CharEnumHandler.get_char_packet(
+                character, guild_id, CharEnumHandler._get_pet_info(pet_creature_id, pet_level),
+                items_by_owner.get(character.guid, {}))
+
+        data = pack('<B', len(char_packets)) + b''.join(char_packets.values())
+        return PacketWriter.get_packet(OpCode.SMSG_CHAR_ENUM, data)
+
+    @staticmethod
+    def get_char_packet(character, guild_id, pet_info, equipped_items):
         name_bytes = PacketWriter.string_to_bytes(character.name)
         char_fmt = f'<Q{len(name_bytes)}s9B2I3f4I'
         char_packet = pack(
@@ -42,17 +80,17 @@ class CharEnumHandler(object):
             character.position_x,
             character.position_y,
             character.position_z,
-            guild.guild_id if guild else 0,
+            guild_id if guild_id else 0,
             *pet_info
         )
 
         for slot in range(InventorySlots.SLOT_HEAD, InventorySlots.SLOT_BAG2):
-            item = RealmDatabaseManager.character_get_item_by_slot(character.guid, slot)
+            item_entry = equipped_items.get(slot)
             display_id = 0
             inventory_type = 0
 
-            if item:
-                item_template = WorldDatabaseManager.ItemTemplateHolder.item_template_get_by_entry(item.item_template)
+            if item_entry:
+                item_template = WorldDatabaseManager.ItemTemplateHolder.item_template_get_by_entry(item_entry)
                 if item_template:
                     display_id = item_template.display_id
                     inventory_type = item_template.inventory_type
@@ -61,17 +99,12 @@ class CharEnumHandler(object):
         return char_packet
 
     @staticmethod
-    def _get_pet_info(character_guid):
-        pets = RealmDatabaseManager.character_get_pets(character_guid)
-        for pet in pets:
-            if not pet.is_active:
-                continue
-
-            pet_creature_template = WorldDatabaseManager.CreatureTemplateHolder.creature_get_by_entry(pet.creature_id)
-            # TODO tamed variant display id? Affects two tamable creatures (8933, 9696).
-            pet_display_id = pet_creature_template.display_id1
-            pet_level = pet.level
-            pet_family = pet_creature_template.beast_family
-            return [pet_display_id, pet_level, pet_family]
+    def _get_pet_info(pet_creature_id, pet_level):
+        if not pet_creature_id:
+            return [0, 0, 0]
 
-        return [0, 0, 0]
+        pet_creature_template = WorldDatabaseManager.CreatureTemplateHolder.creature_get_by_entry(pet_creature_id)
+        # TODO tamed variant display id? Affects two tamable creatures (8933, 9696).
+        pet_display_id = pet_creature_template.display_id1
+        pet_family = pet_creature_template.beast_family
+        return [pet_display_id, pet_level, pet_family]
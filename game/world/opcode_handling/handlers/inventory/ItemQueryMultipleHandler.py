@@ -12,7 +12,10 @@ class ItemQueryMultipleHandler(object):
             if requested_item_count:
                 item_templates = []
                 for requested_item in range(requested_item_count):
-                    entry = unpack('<I', reader.data[4 + (requested_item_count * 4):4])[0]
+                    offset = 4 + requested_item * 4
+                    if len(reader.data) < offset + 4:
+                        break
+                    entry = unpack('<I', reader.data[offset:offset + 4])[0]
                     item_template = WorldDatabaseManager.ItemTemplateHolder.item_template_get_by_entry(entry)
                     if item_template:
                         item_templates.append(item_template)
@@ -50,8 +50,8 @@ class MovementHandler:
                         player_mgr.set_stand_state(StandState.UNIT_STANDING)
 
                 # Broadcast unit mover movement to surroundings.
-                movement_packet = PacketWriter.get_packet(OpCode(reader.opcode), move_info.get_bytes())
-                MapManager.send_surrounding(movement_packet, unit_mover, include_self=False)
+                MapManager.broadcast_surrounding(OpCode(reader.opcode), move_info.get_bytes(), unit_mover,
+                                                 include_self=False)
 
             except (AttributeError, error):
                 Logger.error(f'Error while handling {reader.opcode_str()}, skipping. Data: {reader.data}')
@@ -1,11 +1,8 @@
-from struct import pack, unpack
+from struct import unpack
 
-from database.realm.RealmDatabaseManager import RealmDatabaseManager
-from game.world.managers.maps.MapManager import MapManager
+from game.world.managers.objects.units.player.CharacterNameCache import CharacterNameCache
 from game.world.opcode_handling.HandlerValidator import HandlerValidator
 from network.packet.PacketReader import PacketReader
-from network.packet.PacketWriter import PacketWriter
-from utils.constants.OpCodes import OpCode
 
 
 class NameQueryHandler(object):
@@ -19,27 +16,12 @@ class NameQueryHandler(object):
 
         if len(reader.data) >= 8:  # Avoid handling empty name query packet.
             guid = unpack('<Q', reader.data[:8])[0]
-            requested_player = MapManager.get_surrounding_player_by_guid(world_session.player_mgr, guid)
-
-            if requested_player:
-                player = requested_player.player
-            else:
-                player = RealmDatabaseManager.character_get_by_guid(guid)
-
-            if player:
-                player_mgr.enqueue_packet(NameQueryHandler.get_query_details(player))
+            character_name = CharacterNameCache.get_by_guid(guid)
+            if character_name:
+                player_mgr.enqueue_packet(character_name.query_response)
 
         return 0
 
     @staticmethod
     def get_query_details(player) -> bytes:
-        name_bytes = PacketWriter.string_to_bytes(player.name)
-        player_data = pack(
-            f'<Q{len(name_bytes)}s3I',
-            player.guid,
-            name_bytes,
-            player.race,
-            player.gender,
-            player.class_
-        )
-        return PacketWriter.get_packet(OpCode.SMSG_NAME_QUERY_RESPONSE, player_data)
+        return CharacterNameCache.add(player).query_response
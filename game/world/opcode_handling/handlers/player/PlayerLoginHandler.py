@@ -8,6 +8,7 @@ from database.realm.RealmDatabaseManager import *
 from game.world.WorldSessionStateHandler import WorldSessionStateHandler
 from game.world.managers.objects.units.ChatManager import ChatManager
 from game.world.managers.objects.units.player.GroupManager import GroupManager
+from game.world.managers.objects.units.player.PlayerLoginData import PlayerLoginData
 from game.world.managers.objects.units.player.PlayerManager import PlayerManager
 from network.packet.PacketWriter import *
 from utils.ConfigManager import config
@@ -23,16 +24,17 @@ class PlayerLoginHandler(object):
             return -1
 
         guid = unpack('<Q', reader.data[:8])[0]
+        # Rows of this character might have been written by another process since we last saved them.
+        RealmDatabaseManager.forget_fingerprints(guid)
 
-        world_session.player_mgr = PlayerManager(
-            RealmDatabaseManager.character_get_by_guid(guid), world_session)
-        player_mgr = world_session.player_mgr
-
-        if not world_session.player_mgr.player:
+        login_data = PlayerLoginData.load(guid)
+        if not login_data:
             Logger.anticheat(f'Character with wrong guid ({guid}) tried to login.')
             return -1
-        else:
-            WorldSessionStateHandler.push_active_player_session(world_session)
+
+        world_session.player_mgr = PlayerManager(login_data.character, world_session)
+        player_mgr = world_session.player_mgr
+        WorldSessionStateHandler.push_active_player_session(world_session)
 
         # Disabled race & class checks (only if not a GM).
         if not world_session.account_mgr.is_gm():
@@ -57,13 +59,13 @@ class PlayerLoginHandler(object):
                                                           PlayerLoginHandler._get_login_timespeed()))
 
         player_mgr.skill_manager.load_proficiencies()
-        player_mgr.skill_manager.load_skills()
-        player_mgr.spell_manager.load_spells()
+        player_mgr.skill_manager.load_skills(login_data.skills)
+        player_mgr.spell_manager.load_spells(login_data.spells)
         player_mgr.skill_manager.update_skills_max_value()  # Can depend on learned spells.
-        player_mgr.pet_manager.load_pets()
+        player_mgr.pet_manager.load_pets(login_data.pets, login_data.pet_spells)
 
-        player_mgr.deathbind = RealmDatabaseManager.character_get_deathbind(player_mgr.guid)
-        player_mgr.friends_manager.load_from_db(RealmDatabaseManager.character_get_social(player_mgr.guid))
+        player_mgr.deathbind = login_data.deathbind
+        player_mgr.friends_manager.load_from_db(login_data.social)
 
         # Only send the deathbind packet if it's a Binder NPC what bound the player.
         if player_mgr.deathbind.creature_binder_guid > 0:
@@ -71,12 +73,12 @@ class PlayerLoginHandler(object):
         # Tutorials aren't implemented in 0.5.3.
         # world_session.enqueue_packet(world_session.player_mgr.get_tutorial_packet())
         player_mgr.enqueue_packet(player_mgr.spell_manager.get_initial_spells())
-        player_mgr.enqueue_packet(player_mgr.get_action_buttons())
+        player_mgr.enqueue_packet(player_mgr.get_action_buttons(login_data.buttons))
 
         # MotD.
         ChatManager.send_system_message(world_session, config.Server.General.motd)
 
-        player_mgr.inventory.load_items()
+        player_mgr.inventory.load_items(login_data.inventory)
 
         # Initialize stats first to have existing base stats for further calculations.
         player_mgr.stat_manager.init_stats()
@@ -87,10 +89,10 @@ class PlayerLoginHandler(object):
         player_mgr.spell_manager.apply_cast_when_learned_spells()
         player_mgr.skill_manager.init_proficiencies()
 
-        player_mgr.quest_manager.load_quests()
-        player_mgr.reputation_manager.load_reputations()
-        GuildManager.set_character_guild(player_mgr)
-        GroupManager.set_character_group(player_mgr)
+        player_mgr.quest_manager.load_quests(login_data.quests)
+        player_mgr.reputation_manager.load_reputations(login_data.reputations)
+        GuildManager.set_character_guild(player_mgr, login_data.guild)
+        GroupManager.set_character_group(player_mgr, login_data.group_id)
 
         first_login = player_mgr.player.totaltime == 0
         # Send cinematic.
@@ -35,8 +35,8 @@ class TextEmoteHandler(object):
                 else:
                     data += pack('<B', 0)
 
-                MapManager.send_surrounding_in_range(PacketWriter.get_packet(OpCode.SMSG_TEXT_EMOTE, data),
-                                                     world_session.player_mgr, config.World.Chat.ChatRange.emote_range)
+                MapManager.broadcast_surrounding_in_range(OpCode.SMSG_TEXT_EMOTE, data, world_session.player_mgr,
+                                                          config.World.Chat.ChatRange.emote_range)
 
                 # Perform visual emote action if needed
 
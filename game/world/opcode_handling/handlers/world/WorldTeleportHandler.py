@@ -1,5 +1,6 @@
 from struct import unpack
 
+from game.world.MapShardManager import MapShardManager
 from game.world.managers.abstractions.Vector import Vector
 from game.world.opcode_handling.HandlerValidator import HandlerValidator
 from utils.Logger import Logger
@@ -30,6 +31,9 @@ class WorldTeleportHandler(object):
 
     @staticmethod
     def handle_ack(world_session, socket, reader):
+        # Destination map is served by another map shard process, the player is logged in there instead.
+        if MapShardManager.transfer_if_remote(world_session):
+            return 0
         if world_session.player_mgr:
             world_session.player_mgr.spawn_player_from_teleport()
         return 0
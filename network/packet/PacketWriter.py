@@ -1,5 +1,5 @@
 import zlib
-from struct import pack
+from struct import pack, unpack_from
 
 from utils.Logger import Logger
 from utils.constants.OpCodes import OpCode
@@ -8,6 +8,7 @@ from utils.constants.OpCodes import OpCode
 class PacketWriter(object):
     MAX_PACKET_SIZE = 0x8000
     HEADER_SIZE = 6
+    COMPRESSION_THRESHOLD = 100
 
     @staticmethod
     def string_to_bytes(value, encoding='latin1'):
@@ -32,10 +33,21 @@ class PacketWriter(object):
         data = pack('<I', opcode) + data
         packet = pack('>H', len(data)) + data
 
-        if opcode == OpCode.SMSG_UPDATE_OBJECT and len(packet) > 100:
-            compressed_packet_data = zlib.compress(packet[6:])
-            compressed_data = pack('<I', len(packet) - 6)
-            compressed_data += compressed_packet_data
-            packet = PacketWriter.get_packet(OpCode.SMSG_COMPRESSED_UPDATE_OBJECT, compressed_data)
+        if opcode == OpCode.SMSG_UPDATE_OBJECT:
+            packet = PacketWriter.compress_if_needed(packet)
 
         return packet
+
+    # Wraps big SMSG_UPDATE_OBJECT packets into SMSG_COMPRESSED_UPDATE_OBJECT, any other packet is returned as is.
+    # Build the packet once and share the result between recipients, compression is the most expensive step.
+    @staticmethod
+    def compress_if_needed(packet):
+        if len(packet) <= PacketWriter.COMPRESSION_THRESHOLD:
+            return packet
+        if unpack_from('<I', packet, 2)[0] != OpCode.SMSG_UPDATE_OBJECT:
+            return packet
+
+        compressed_packet_data = zlib.compress(packet[PacketWriter.HEADER_SIZE:])
+        compressed_data = pack('<I', len(packet) - PacketWriter.HEADER_SIZE)
+        compressed_data += compressed_packet_data
+        return PacketWriter.get_packet(OpCode.SMSG_COMPRESSED_UPDATE_OBJECT, compressed_data)
@@ -0,0 +1,31 @@
+from typing import Callable
+
+# Ready to send query responses built from static templates, by (opcode, key). Keys are tuples starting with the
+# template entry, followed by any instance values the response depends on (e.g. creature type or display id).
+RESPONSES: dict[tuple[int, tuple], bytes] = {}
+
+
+class QueryResponseCache:
+
+    @staticmethod
+    def get(opcode, key: tuple, builder: Callable[[], bytes]) -> bytes:
+        response = RESPONSES.get((opcode, key))
+        if response is None:
+            response = builder()
+            RESPONSES[(opcode, key)] = response
+        return response
+
+    # Drops cached responses, optionally only those of the given opcode and/or template entry. Must be called whenever
+    # templates are reloaded or modified.
+    @staticmethod
+    def invalidate(opcode=None, entry=None):
+        if opcode is None and entry is None:
+            RESPONSES.clear()
+            return
+
+        for response_opcode, key in list(RESPONSES.keys()):
+            if opcode is not None and response_opcode != opcode:
+                continue
+            if entry is not None and key[0] != entry:
+                continue
+            RESPONSES.pop((response_opcode, key), None)
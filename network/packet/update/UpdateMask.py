@@ -8,21 +8,32 @@ BLOCK_SIZE = 32
 class UpdateMask(object):
     def __init__(self):
         self.update_mask: Optional[bitarray] = None
+        # Indexes of the bits that might be set, so checks and resets cost O(changed fields) instead of O(fields).
+        # It can hold indexes whose bit was already unset, but every set bit is always present in it.
+        self.dirty_indexes = set()
         self.block_count = 0
         self.field_count = 0
         self.lock = RLock()  # Reentrant lock.
 
+    # The bit is set before the index is added and the index is removed before the bit is unset, so a set bit is always
+    # present in dirty_indexes. Both are done under the lock, resets must not interleave with a newer set.
     def set_bit(self, index):
         with self.lock:
             self.update_mask[index] = 1
+            self.dirty_indexes.add(index)
 
     def unset_bit(self, index):
         with self.lock:
+            self.dirty_indexes.discard(index)
             self.update_mask[index] = 0
 
     def is_set(self, index):
-        with self.lock:
-            return self.update_mask[index] != 0
+        return self.update_mask[index] != 0
+
+    # Sorted indexes of the currently set bits.
+    def get_set_indexes(self):
+        update_mask = self.update_mask
+        return sorted(index for index in list(self.dirty_indexes) if update_mask[index])
 
     def to_bytes(self):
         with self.lock:
@@ -34,15 +45,19 @@ class UpdateMask(object):
 
     def clear(self):
         with self.lock:
-            self.update_mask.setall(0)
+            dirty_indexes = self.dirty_indexes
+            self.dirty_indexes = set()
+            for index in dirty_indexes:
+                self.update_mask[index] = 0
 
     def is_empty(self):
-        with self.lock:
-            return self.update_mask.count() == 0
+        update_mask = self.update_mask
+        return not any(update_mask[index] for index in list(self.dirty_indexes))
 
     def set_count(self, values_count):
         with self.lock:
             self.field_count = values_count
             self.block_count = int((values_count + BLOCK_SIZE - 1) / BLOCK_SIZE)
             self.update_mask = bitarray(self.block_count * BLOCK_SIZE, endian='little')
-            self.clear()
+            self.update_mask.setall(0)
+            self.dirty_indexes = set()
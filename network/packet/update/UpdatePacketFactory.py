@@ -24,6 +24,12 @@ class UpdatePacketFactory(object):
         self.update_values_bytes = []  # Values bytes representation, used for update packets.
         self.update_values = []  # Raw values, used to compare current vs new without having to pack or unpack.
         self.update_mask = UpdateMask()
+        # Partial packets shared by all observers, keyed by whether the requester is the owner (private fields).
+        # Each entry is (update_version, packet), entries are stale once the version changes.
+        self.update_version = 0
+        self.partial_packets_cache = {}
+        # Objects whose fields depend on the requester itself (e.g. gameobject dynamic flags) must disable this.
+        self.cache_partial_packets = True
 
     def init_values(self, owner_guid, fields_type):
         self.owner_guid = owner_guid
@@ -34,6 +40,7 @@ class UpdatePacketFactory(object):
         self.update_values = [0] * self.fields_size
         self.update_mask.set_count(self.fields_size)
         self._load_encapsulation(fields_type)
+        self._invalidate_partial_packets()
 
     @staticmethod
     def _load_encapsulation(fields_type):
@@ -74,6 +81,10 @@ class UpdatePacketFactory(object):
                     # { index : encapsulation flag }
                     FIELDS_ENCAPSULATION[fields_type][update_field.value + _index] = update_field.flags
 
+    @staticmethod
+    def compress_if_needed(packet):
+        return PacketWriter.compress_if_needed(packet)
+
     def is_dynamic_field(self, index):
         if not self._validate_field_existence(index):
             return False
@@ -106,31 +117,54 @@ class UpdatePacketFactory(object):
         result = {'[PROTECTED]' if was_protected else '[ACCESSED]'}
         Logger.debug(f"{requester.get_name()} - [{update_field_info}] - {result}, Value [{self.update_values[index]}]")
 
+    # Returns the partial packet for the requester, built at most once per owner/public variant until fields change.
+    def get_partial_packet(self, requester, build_function):
+        if not self.cache_partial_packets:
+            return build_function(requester)
+
+        is_owner = requester.guid == self.owner_guid
+        version = self.update_version
+        cached = self.partial_packets_cache.get(is_owner)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        packet = build_function(requester)
+        # Only store the packet if no field changed while it was being built.
+        if version == self.update_version:
+            self.partial_packets_cache[is_owner] = (version, packet)
+        return packet
+
+    def _invalidate_partial_packets(self):
+        self.update_version += 1
+
     # Makes sure every single player gets the same mask and values.
     def generate_update_data(self, flush_current=True):
         with self.update_mask.lock:
             update_object = UpdateData(self.update_mask.copy(), self.update_values_bytes.copy())
             if flush_current:
                 self.update_mask.clear()
+                self._invalidate_partial_packets()
             return update_object
 
     def reset(self):
         self.update_mask.clear()
+        self._invalidate_partial_packets()
 
     def has_pending_updates(self):
         return not self.update_mask.is_empty()
 
+    # Only touched fields are visited, O(changed fields). Timestamp check and unset happen under the mask lock, as one
+    # step against concurrent updates.
     def reset_older_than(self, timestamp_to_compare):
         with self.update_mask.lock:
             all_clear = True
-            for index, timestamp in enumerate(self.update_timestamps):
-                if not timestamp:
-                    continue
-                if timestamp <= timestamp_to_compare:
+            for index in list(self.update_mask.dirty_indexes):
+                if self.update_timestamps[index] <= timestamp_to_compare:
                     self.update_mask.unset_bit(index)
                 else:
                     all_clear = False
 
+            self._invalidate_partial_packets()
             return all_clear
 
     # Check if the new value is different from the field known value.
@@ -147,7 +181,10 @@ class UpdatePacketFactory(object):
             self.update(index, int(value & 0xFFFFFFFF), 'I')
             self.update(index + 1, int(value >> 32), 'I')
         else:
-            self.update_timestamps[index] = time.time()
-            self.update_values[index] = value
-            self.update_values_bytes[index] = pack(f'<{value_type}', value)
-            self.update_mask.set_bit(index)
+            # Under the mask lock, so reset_older_than can't compare the previous timestamp and unset the newer bit.
+            with self.update_mask.lock:
+                self.update_timestamps[index] = time.time()
+                self.update_values[index] = value
+                self.update_values_bytes[index] = pack(f'<{value_type}', value)
+                self.update_mask.set_bit(index)
+                self._invalidate_partial_packets()
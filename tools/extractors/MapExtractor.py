@@ -1,3 +1,4 @@
+import multiprocessing
 import os
 
 
@@ -44,14 +45,24 @@ class MapExtractor:
             Logger.error(f'Unable to locate {wow_maps_folder}.')
             return
 
-        # Flush existent files.
+        # Partially written tiles from an interrupted extraction.
+        [os.remove(os.path.join(map_files_path, file)) for file in os.listdir(map_files_path) if file.endswith('.tmp')]
+
+        # Resume or flush existent files.
+        resume = False
         filelist = [f for f in os.listdir(map_files_path) if f.endswith(".map")]
         if filelist:
-            Logger.warning(f'Existent {len(filelist)} .map files will be deleted, continue? Y/N [Y]')
+            Logger.warning(f'Existent {len(filelist)} .map files found, resume extraction keeping them? Y/N [Y]')
             if input().lower() in ['y', '']:
-                [os.remove(os.path.join(map_files_path, file)) for file in filelist]
+                resume = True
             else:
-                return
+                Logger.warning(f'Existent {len(filelist)} .map files will be deleted, continue? Y/N [Y]')
+                if input().lower() in ['y', '']:
+                    [os.remove(os.path.join(map_files_path, file)) for file in filelist]
+                else:
+                    return
+
+        processes = MapExtractor._ask_processes()
 
         # Extract available maps and area tables from dbc.
         with MpqArchive(dbc_path) as archive:
@@ -107,8 +118,10 @@ class MapExtractor:
                 continue
 
             # Process wdt.
-            with MpqArchive(dbc_map.get_wdt_path(root_path=maps_path)) as wdt_reader:
-                with Wdt(dbc_map, wdt_reader, data_path, mdx_path, adt_x, adt_y) as wdt:
+            wdt_path = dbc_map.get_wdt_path(root_path=maps_path)
+            with MpqArchive(wdt_path) as wdt_reader:
+                with Wdt(dbc_map, wdt_reader, data_path, mdx_path, adt_x, adt_y, wdt_path, processes=processes,
+                         resume=resume) as wdt:
                     wdt.process()
 
         # Finished.
@@ -117,3 +130,15 @@ class MapExtractor:
             Logger.success(f'Generated {len(filelist)} .map files.')
         else:
             Logger.error('Unable to extract map files.')
+
+    @staticmethod
+    def _ask_processes():
+        available_processes = multiprocessing.cpu_count()
+        while True:
+            try:
+                processes = int(input(f'Number of processes? [1-{available_processes}]: '))
+                if processes < 1 or processes > available_processes:
+                    raise ValueError
+                return processes
+            except ValueError:
+                Logger.error(f'Invalid number of processes, value must be between 1 and {available_processes}.')
@@ -1,7 +1,9 @@
 import os
 from struct import pack
 
-from game.world.managers.maps.helpers.Constants import RESOLUTION_LIQUIDS, ADT_SIZE
+from game.world.managers.maps.MapTile import MapTile
+from game.world.managers.maps.helpers.Constants import RESOLUTION_LIQUIDS, ADT_SIZE, MAP_FILE_HEADER_FORMAT, \
+    MAP_FILE_HEADER_SIZE
 from game.world.managers.maps.helpers.MapUtils import MapUtils
 from tools.extractors.definitions.chunks.MDDF import MDDF
 from tools.extractors.definitions.chunks.MHDR import MHDR
@@ -12,10 +14,11 @@ from tools.extractors.helpers.WmoLiquidParser import WmoLiquidParser
 from tools.extractors.helpers.WmoLiquidWriter import WmoLiquidWriter
 from utils.Logger import Logger
 from utils.PathManager import PathManager
+from network.packet.PacketReader import PacketReader
 from network.packet.PacketWriter import PacketWriter
 from tools.extractors.helpers.Constants import Constants
 from tools.extractors.helpers.DataHolders import DataHolders
-from tools.extractors.helpers.HeightField import HeightField
+from tools.extractors.helpers.HeightField import HeightField, Z_RESOLUTION
 from tools.extractors.helpers.LiquidAdtWriter import LiquidAdtWriter
 from tools.extractors.definitions.chunks.TileHeader import TileHeader
 from tools.extractors.definitions.chunks.TileInformation import TileInformation
@@ -52,10 +55,27 @@ class Adt:
         filename = f'{map_id:03}{adt_x:02}{adt_y:02}.map'
         return os.path.join(PathManager.get_maps_path(), filename)
 
+    # Tiles are written to a temporary file, which is renamed once its wmo liquids are appended.
+    @staticmethod
+    def get_temporary_filepath(map_id, adt_x, adt_y):
+        return f'{Adt.get_filepath(map_id, adt_x, adt_y)}.tmp'
+
+    # A tile is complete once renamed to its final .map file with the expected version.
+    @staticmethod
+    def is_complete(map_id, adt_x, adt_y):
+        map_path = Adt.get_filepath(map_id, adt_x, adt_y)
+        if not os.path.exists(map_path):
+            return False
+
+        with open(map_path, 'rb') as map_file:
+            version = PacketReader.read_string(map_file.read(MAP_FILE_HEADER_SIZE), 0)
+        return version == MapTile.EXPECTED_VERSION
+
     def write_to_map_file(self):
-        with open(Adt.get_filepath(self.map_id, self.adt_x, self.adt_y), 'wb') as file_writer:
-            # Write version.
-            file_writer.write(PacketWriter.string_to_bytes(Constants.MAPS_VERSION))
+        with open(Adt.get_temporary_filepath(self.map_id, self.adt_x, self.adt_y), 'wb') as file_writer:
+            # Write header (version and resolutions), every following section has a fixed size.
+            file_writer.write(pack(MAP_FILE_HEADER_FORMAT, PacketWriter.string_to_bytes(Constants.MAPS_VERSION),
+                                   Z_RESOLUTION, RESOLUTION_LIQUIDS))
             # Write heightfield.
             self._write_heightfield(file_writer)
             # Write area information.
@@ -64,8 +84,11 @@ class Adt:
             self._write_liquids(file_writer)
             # Parse Wmo liquids:
             #  Wmo liquids are writen once all Wdt Adt's are parsed since liquids can overlap tiles.
-            with WmoLiquidParser(self) as wmo_liquids:
-                wmo_liquids.parse(self.wmo_liquids)
+            self.parse_wmo_liquids()
+
+    def parse_wmo_liquids(self):
+        with WmoLiquidParser(self) as wmo_liquids:
+            wmo_liquids.parse(self.wmo_liquids)
 
     def _write_heightfield(self, file_writer):
         with HeightField(self) as heightfield:
@@ -77,31 +100,50 @@ class Adt:
 
     @staticmethod
     def write_wmo_liquids(map_id, adt_x, adt_y, wmo_liquids):
-        map_path = Adt.get_filepath(map_id, adt_x, adt_y)
-        if not os.path.exists(map_path):
+        temporary_path = Adt.get_temporary_filepath(map_id, adt_x, adt_y)
+        if not os.path.exists(temporary_path):
             return
 
-        with open(Adt.get_filepath(map_id, adt_x, adt_y), 'ab') as file_writer:
-
+        with open(temporary_path, 'ab') as file_writer:
             # Has no wmo liquids, only write flag.
             if not wmo_liquids[adt_x][adt_y]:
-                file_writer.write(pack('<b', 0))
-                return
+                file_writer.write(pack('<I', 0))
+            else:
+                # Write flag and liquids.
+                file_writer.write(pack('<I', 1))
+                with WmoLiquidWriter(wmo_liquids[adt_x][adt_y]) as liquids:
+                    liquids.write_to_file(file_writer)
 
-            # Write flag and liquids.
-            file_writer.write(pack('<b', 1))
-            with WmoLiquidWriter(wmo_liquids[adt_x][adt_y]) as liquids:
-                liquids.write_to_file(file_writer)
+        os.replace(temporary_path, Adt.get_filepath(map_id, adt_x, adt_y))
 
+    # Written as separate sections per field: zone id (-1 if empty), area number, explore bit, flags, level and
+    # faction mask.
     def _write_area_information(self, file_writer):
+        zone_ids, area_numbers, explore_bits, area_flags, area_levels = [], [], [], [], []
         for cy in range(Constants.TILE_SIZE):
             for cx in range(Constants.TILE_SIZE):
                 area_table = DataHolders.get_area_table_by_area_number(self.map_id, self.tiles[cy][cx].area_number)
                 if self.map_id > 1 or not area_table or not area_table.has_exploration:
                     # Empty.
-                    file_writer.write(pack('<i', -1))
+                    zone_ids.append(-1)
+                    area_numbers.append(0)
+                    explore_bits.append(0)
+                    area_flags.append(0)
+                    area_levels.append(0)
                 else:
-                    area_table.write_to_file(file_writer)
+                    zone_ids.append(area_table.id)
+                    area_numbers.append(area_table.area_number)
+                    explore_bits.append(area_table.explore_bit)
+                    area_flags.append(area_table.area_flags)
+                    area_levels.append(area_table.area_level)
+        count = len(zone_ids)
+        file_writer.write(pack(f'<{count}i', *zone_ids))
+        file_writer.write(pack(f'<{count}I', *area_numbers))
+        file_writer.write(pack(f'<{count}H', *explore_bits))
+        file_writer.write(pack(f'<{count}B', *area_flags))
+        file_writer.write(pack(f'<{count}B', *area_levels))
+        # Faction mask, not available in this client data.
+        file_writer.write(pack(f'<{count}B', *([0] * count)))
 
     @staticmethod
     def from_reader(map_id, adt_x, adt_y, wmo_filenames, wmo_liquids, stream_reader):
@@ -1,19 +1,25 @@
-import os
+import multiprocessing
 from io import BytesIO
 
-from game.world.managers.maps.helpers.Constants import BLOCK_SIZE
 from tools.extractors.definitions.chunks.MDNM import MDMN
 from tools.extractors.definitions.chunks.MONM import MONM
 from tools.extractors.definitions.chunks.MPHD import MPHD
 from utils.Logger import Logger
 from tools.extractors.definitions.Adt import Adt
 from tools.extractors.helpers.Constants import Constants
+from tools.extractors.helpers.DataHolders import DataHolders
+from tools.extractors.pympqlib.MpqArchive import MpqArchive
+from utils.PathManager import PathManager
 from tools.extractors.definitions.chunks.TileHeader import TileHeader
 from tools.extractors.definitions.reader.StreamReader import StreamReader
 
+# Per worker process state, set by Wdt._init_worker.
+WORKER_CONTEXT = {}
+
 
 class Wdt:
-    def __init__(self, dbc_map, mpq_reader, wow_data_path, mdx_data_path, adt_x, adt_y):
+    def __init__(self, dbc_map, mpq_reader, wow_data_path, mdx_data_path, adt_x, adt_y, wdt_path, processes=1,
+                 resume=False):
         self.name = dbc_map.name
         self.mpq_reader = mpq_reader
         self.stream_reader = None
@@ -25,9 +31,13 @@ class Wdt:
         self.wow_data_path = wow_data_path
         self.mdx_data_path = mdx_data_path
         self.tile_information = [[type[TileHeader] for _ in range(64)] for _ in range(64)]
-        self.wmo_liquids = [[None for _ in range(64) for _ in range(64)] for _ in range(64) for _ in range(64)]
+        self.wmo_liquids = Wdt._get_empty_wmo_liquids()
         self.adt_x = adt_x
         self.adt_y = adt_y
+        self.wdt_path = wdt_path
+        self.processes = processes
+        # Skip tiles already extracted by a previous run.
+        self.resume = resume
 
     def __enter__(self):
         mpq_entry = self.mpq_reader.mpq_entries[0]
@@ -68,8 +78,8 @@ class Wdt:
             return
 
         # Tiles information.
-        for x in range(BLOCK_SIZE):
-            for y in range(BLOCK_SIZE):
+        for x in range(Constants.TILE_BLOCK_SIZE):
+            for y in range(Constants.TILE_BLOCK_SIZE):
                 self.tile_information[x][y] = TileHeader.from_reader(self.stream_reader)
 
 
@@ -102,31 +112,110 @@ class Wdt:
             Logger.warning(f'Map [{self.dbc_map.name}] is WMO based, skipping.')
             pass  # TODO, wmo based.
 
-        # ADT data.
-        total = Constants.TILE_BLOCK_SIZE * Constants.TILE_BLOCK_SIZE
-        current = 0
+        # ADT data, each tile is parsed and written to its .map file by a worker process.
+        tiles = []
         for x in range(Constants.TILE_BLOCK_SIZE):
             for y in range(Constants.TILE_BLOCK_SIZE):
-                current += 1
                 tile_info: TileHeader = self.tile_information[x][y]
-                Logger.progress(f'Processing ADT tiles for [{self.dbc_map.name}]...', current, total, divisions=total)
                 if not tile_info or not tile_info.size:
                     continue
 
                 if self.adt_x != -1 and x != self.adt_x or self.adt_y != -1 and y != self.adt_y:
                     continue
 
-                self.stream_reader.set_position(tile_info.offset)
-                # Parse and write .map file for this adt.
-                with Adt.from_reader(self.dbc_map.id, x, y, self.wmo_filenames, self.wmo_liquids, self.stream_reader) as adt:
-                    adt.write_to_map_file()
+                # Complete tiles are still parsed (without writing them) if others are pending, since their wmo
+                # liquids can overlap those tiles.
+                write_map = not self.resume or not Adt.is_complete(self.dbc_map.id, x, y)
+                tiles.append((x, y, tile_info.offset, write_map))
 
-        for x in range(Constants.TILE_BLOCK_SIZE):
-            for y in range(Constants.TILE_BLOCK_SIZE):
-                current += 1
-                Logger.progress(f'Processing WMO liquids for [{self.dbc_map.name}]...', current, total, divisions=total)
+        pending_tiles = [(x, y) for x, y, _, write_map in tiles if write_map]
+        if not pending_tiles:
+            Logger.info(f'ADT tiles for [{self.dbc_map.name}] already extracted, skipping.')
+            return
 
-                if self.adt_x != -1 and x != self.adt_x or self.adt_y != -1 and y != self.adt_y:
-                    continue
+        total = len(tiles)
+        current = 0
+        init_args = (PathManager.get_root_path(), DataHolders.AREA_TABLES_BY_MAP, self.dbc_map.id, self.wdt_path,
+                     self.wmo_filenames)
+        if self.processes > 1:
+            with multiprocessing.Pool(min(self.processes, total), initializer=Wdt._init_worker,
+                                      initargs=init_args) as pool:
+                # Results come back in tiles order, merging them keeps the same overwrites as a sequential run.
+                for tile_wmo_liquids in pool.imap(Wdt._process_tile, tiles):
+                    current += 1
+                    Logger.progress(f'Processing ADT tiles for [{self.dbc_map.name}]...', current, total,
+                                    divisions=total)
+                    Wdt._merge_wmo_liquids(self.wmo_liquids, tile_wmo_liquids)
+        else:
+            Wdt._init_worker(*init_args)
+            for tile in tiles:
+                current += 1
+                Logger.progress(f'Processing ADT tiles for [{self.dbc_map.name}]...', current, total, divisions=total)
+                Wdt._merge_wmo_liquids(self.wmo_liquids, Wdt._process_tile(tile))
+        Wdt._close_worker()
 
-                Adt.write_wmo_liquids(self.dbc_map.id, x, y, self.wmo_liquids)
+        total = len(pending_tiles)
+        current = 0
+        for x, y in pending_tiles:
+            current += 1
+            Logger.progress(f'Processing WMO liquids for [{self.dbc_map.name}]...', current, total, divisions=total)
+            Adt.write_wmo_liquids(self.dbc_map.id, x, y, self.wmo_liquids)
+
+    @staticmethod
+    def _get_empty_wmo_liquids():
+        return [[None for _ in range(Constants.TILE_BLOCK_SIZE)] for _ in range(Constants.TILE_BLOCK_SIZE)]
+
+    # Each worker opens its own handle over the wdt MPQ, read once and reused for every tile it processes.
+    @staticmethod
+    def _init_worker(root_path, area_tables_by_map, map_id, wdt_path, wmo_filenames):
+        PathManager.set_root_path(root_path)
+        DataHolders.AREA_TABLES_BY_MAP = area_tables_by_map
+        with MpqArchive(wdt_path) as mpq_reader:
+            wdt_bytes = mpq_reader.read_file_bytes(mpq_reader.mpq_entries[0])
+        WORKER_CONTEXT['map_id'] = map_id
+        WORKER_CONTEXT['wmo_filenames'] = wmo_filenames
+        WORKER_CONTEXT['stream_reader'] = StreamReader(BytesIO(wdt_bytes))
+
+    @staticmethod
+    def _close_worker():
+        stream_reader = WORKER_CONTEXT.pop('stream_reader', None)
+        if stream_reader:
+            stream_reader.close()
+        WORKER_CONTEXT.clear()
+
+    # Parses the given tile, writes its .map file if needed and returns the wmo liquids it placed, as a list of
+    # (adt_x, adt_y, heights).
+    @staticmethod
+    def _process_tile(tile):
+        x, y, offset, write_map = tile
+        map_id = WORKER_CONTEXT['map_id']
+        stream_reader = WORKER_CONTEXT['stream_reader']
+        wmo_liquids = Wdt._get_empty_wmo_liquids()
+
+        stream_reader.set_position(offset)
+        adt = Adt.from_reader(map_id, x, y, WORKER_CONTEXT['wmo_filenames'], wmo_liquids, stream_reader)
+        if not adt:
+            return []
+
+        with adt:
+            if write_map:
+                adt.write_to_map_file()
+            else:
+                adt.parse_wmo_liquids()
+
+        return [(liquid_x, liquid_y, wmo_liquids[liquid_x][liquid_y])
+                for liquid_x in range(Constants.TILE_BLOCK_SIZE) for liquid_y in range(Constants.TILE_BLOCK_SIZE)
+                if wmo_liquids[liquid_x][liquid_y]]
+
+    @staticmethod
+    def _merge_wmo_liquids(wmo_liquids, tile_wmo_liquids):
+        for adt_x, adt_y, heights in tile_wmo_liquids:
+            current_heights = wmo_liquids[adt_x][adt_y]
+            if not current_heights:
+                wmo_liquids[adt_x][adt_y] = heights
+                continue
+            # Cells not reached by this tile liquids keep their 0.0 initialization value.
+            for cell_x, row in enumerate(heights):
+                for cell_y, height in enumerate(row):
+                    if height:
+                        current_heights[cell_x][cell_y] = height
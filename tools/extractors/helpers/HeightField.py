@@ -1,8 +1,6 @@
 from struct import pack
-from utils.ConfigManager import config
 from game.world.managers.abstractions.Vector import Vector
 from tools.extractors.helpers.Constants import Constants
-from utils.Float16 import Float16
 
 Z_RESOLUTION = 256
 
@@ -11,7 +9,6 @@ class HeightField:
 
     def __init__(self, adt):
         self.tiles = adt.tiles
-        self.use_float_16 = config.Extractor.Maps.use_float_16
         self.v9 = [[0.0 for _ in range(129)] for _ in range(129)]
         self.v8 = [[0.0 for _ in range(128)] for _ in range(128)]
         self.p = Vector()
@@ -40,15 +37,10 @@ class HeightField:
             self.v9[128][x] = self.tiles[15][int(x / 8)].mcvt.get_v9(8, divmod(x, 8)[1])
         self.v9[128][128] = self.tiles[15][15].mcvt.get_v9(8, 8)
 
+    # Fixed size section, Z_RESOLUTION * Z_RESOLUTION 32 bit floats.
     def write_to_file(self, file_stream):
-        for cy in range(Z_RESOLUTION):
-            for cx in range(Z_RESOLUTION):
-                # 32 bit Full precision.
-                if not self.use_float_16:
-                    file_stream.write(pack('<f', self.calculate_z(cy, cx)))
-                    continue
-                # 16 bit Half precision.
-                file_stream.write(pack('>h', Float16.compress(self.calculate_z(cy, cx))))
+        heights = [self.calculate_z(cy, cx) for cy in range(Z_RESOLUTION) for cx in range(Z_RESOLUTION)]
+        file_stream.write(pack(f'<{len(heights)}f', *heights))
 
     def calculate_z(self, cy, cx):
         # Reuse vectors.
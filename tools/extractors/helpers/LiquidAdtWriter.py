@@ -1,14 +1,11 @@
 from struct import pack
 from tools.extractors.helpers.Constants import Constants
 from tools.extractors.definitions.enums.LiquidFlags import LiquidFlags
-from utils.ConfigManager import config
-from utils.Float16 import Float16
 
 
 class LiquidAdtWriter:
     def __init__(self, adt):
         self.adt = adt
-        self.use_float_16 = config.Extractor.Maps.use_float_16
         self.lq_show = [[False for _ in range(Constants.GRID_SIZE)] for _ in range(Constants.GRID_SIZE)]
         self.lq_height = [[0.0 for _ in range(Constants.GRID_SIZE + 1)] for _ in range(Constants.GRID_SIZE + 1)]
         self.lq_flags = [[0 for _ in range(Constants.GRID_SIZE + 1)] for _ in range(Constants.GRID_SIZE + 1)]
@@ -57,19 +54,16 @@ class LiquidAdtWriter:
                         else:
                             self.lq_show[cy][cx] = False
 
-        # Write to file.
+        # Write to file, liquid types (-1 for empty cells) followed by liquid heights.
+        types = []
+        heights = []
         for y in range(Constants.GRID_SIZE):
             for x in range(Constants.GRID_SIZE):
                 if self.lq_show[y][x] is True:
-                    self._write_cell_liquid(file_writer, self.lq_height[y][x], self.lq_flags[y][x])
+                    types.append(self.lq_flags[y][x])
+                    heights.append(self.lq_height[y][x])
                 else:  # Empty cell.
-                    file_writer.write(pack('<b', -1))
-
-    def _write_cell_liquid(self, file_writer, height, flag):
-        file_writer.write(pack('<b', flag))
-        # 32 bit Full precision.
-        if not self.use_float_16:
-            file_writer.write(pack('<f', height))
-            return
-        # 16 bit Half precision.
-        file_writer.write(pack('>h', Float16.compress(height)))
+                    types.append(-1)
+                    heights.append(0.0)
+        file_writer.write(pack(f'<{len(types)}b', *types))
+        file_writer.write(pack(f'<{len(heights)}f', *heights))
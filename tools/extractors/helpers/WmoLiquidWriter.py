@@ -1,13 +1,10 @@
 from struct import pack
 from tools.extractors.helpers.Constants import Constants
 from tools.extractors.definitions.enums.LiquidFlags import LiquidFlags
-from utils.ConfigManager import config
-from utils.Float16 import Float16
 
 
 class WmoLiquidWriter:
     def __init__(self, wmo_lq_height):
-        self.use_float_16 = config.Extractor.Maps.use_float_16
         self.wmo_lq_height = wmo_lq_height
 
     def __enter__(self):
@@ -17,19 +14,17 @@ class WmoLiquidWriter:
         self.wmo_lq_height.clear()
         self.wmo_lq_height = None
 
+    # Liquid types (-1 for empty cells) followed by liquid heights.
     def write_to_file(self, file_writer):
+        types = []
+        heights = []
         for y in range(Constants.GRID_SIZE):
             for x in range(Constants.GRID_SIZE):
                 if self.wmo_lq_height[y][x]:
-                    self._write_cell_liquid(file_writer, self.wmo_lq_height[y][x], LiquidFlags.FLAG_LQ_RIVER.value)
+                    types.append(LiquidFlags.FLAG_LQ_RIVER.value)
+                    heights.append(self.wmo_lq_height[y][x])
                 else:  # Empty cell.
-                    file_writer.write(pack('<b', -1))
-
-    def _write_cell_liquid(self, file_writer, height, flag):
-        file_writer.write(pack('<b', flag))
-        # 32 bit Full precision.
-        if not self.use_float_16:
-            file_writer.write(pack('<f', height))
-            return
-        # 16 bit Half precision.
-        file_writer.write(pack('>h', Float16.compress(height)))
+                    types.append(-1)
+                    heights.append(0.0)
+        file_writer.write(pack(f'<{len(types)}b', *types))
+        file_writer.write(pack(f'<{len(heights)}f', *heights))
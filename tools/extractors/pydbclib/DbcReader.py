@@ -1,76 +1,141 @@
 import os
+import sys
+from array import array
 from io import BytesIO
-from struct import unpack
 from typing import Optional
 from utils.Logger import Logger
 from tools.extractors.pydbclib.structs.DbcHeader import DbcHeader
 
+DBC_HEADER_SIZE = 20
 
+
+# Reads the whole file once, records are exposed as uint32/float views over the records block (every DBC field is 4
+# bytes wide) and strings are resolved from the strings block, each offset being decoded only once.
 class DbcReader:
     def __init__(self, filename=None, buffer=None):
         self.filename = filename
         self.buffer = buffer
-        self.reader = None
         self.header: Optional[DbcHeader] = None
+        self.data = None
+        self.int_fields = None
+        self.float_fields = None
+        self.strings_block = None
+        self.strings = {}
+        # Record fields per row.
+        self.stride = 0
+        # Index of the next field to be read by read_int32, read_float and read_string.
+        self.field_index = 0
 
     def __enter__(self):
         self.initialize()
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        if self.reader:
-            self.reader.close()
+        self.int_fields = None
+        self.float_fields = None
+        self.strings_block = None
+        self.strings.clear()
+        self.data = None
 
     def initialize(self):
         if not self.buffer and not os.path.exists(self.filename):
             return False
-        self.reader = open(self.filename, 'rb') if self.filename else BytesIO(self.buffer)
-        self.header = DbcHeader.from_bytes(self.reader)
+        if self.filename:
+            with open(self.filename, 'rb') as file:
+                self.data = file.read()
+        else:
+            self.data = bytes(self.buffer)
+
+        with BytesIO(self.data[:DBC_HEADER_SIZE]) as header_reader:
+            self.header = DbcHeader.from_bytes(header_reader)
+
+        records_size = self.header.record_count * self.header.record_size
+        records_block = memoryview(self.data)[DBC_HEADER_SIZE:DBC_HEADER_SIZE + records_size]
+        if sys.byteorder == 'little':
+            self.int_fields = records_block.cast('I')
+            self.float_fields = records_block.cast('f')
+        else:
+            self.int_fields = array('I', records_block)
+            self.int_fields.byteswap()
+            self.float_fields = array('f', records_block)
+            self.float_fields.byteswap()
+        self.strings_block = self.data[DBC_HEADER_SIZE + records_size:]
+        self.stride = self.header.record_size // 4
+        return True
 
     def get_position(self):
-        return self.reader.tell()
+        return DBC_HEADER_SIZE + self.field_index * 4
 
     def set_position(self, position):
-        self.reader.seek(position)
+        self.field_index = (position - DBC_HEADER_SIZE) // 4
 
     def move_forward(self, length):
-        self.reader.seek(self.get_position() + length)
+        self.field_index += length // 4
 
     def read_records_by_type(self, object_type):
         records = []
         file_name = f'{object_type.__name__}.dbc'
         total = self.header.record_count
         for r in range(total):
-            begin = self.reader.tell()
+            # Each record starts at its own offset, in case not everything was parsed.
+            self.field_index = r * self.stride
             records.append(self.read(object_type))
-            # Make sure we move pointer to next record in case not everything was parsed.
-            self.reader.seek(begin + self.header.record_size)
-            Logger.progress(f'{file_name} reading entries...', r + 1, total, divisions=1)
+        Logger.progress(f'{file_name} reading entries...', total, total, divisions=1)
         return records
 
     def read(self, object_type):
         return object_type.from_bytes(self)
 
     def read_int32(self):
-        return unpack('<I', self.reader.read(4))[0]
+        value = self.int_fields[self.field_index]
+        self.field_index += 1
+        return value
 
     def read_float(self):
-        return unpack('<f', self.reader.read(4))[0]
+        value = self.float_fields[self.field_index]
+        self.field_index += 1
+        return value
 
     def read_string(self, terminator='\x00'):
-        string_offset = unpack('<I', self.reader.read(4))[0]
-        current_pos = self.reader.tell()
-        string_start = self.header.record_count * self.header.record_size + 20 + string_offset
-        self.reader.seek(string_start)
-        value = self._read_string(terminator=terminator)
-        self.reader.seek(current_pos)
+        value = self.get_string(self.read_int32(), terminator=terminator)
+        return value
+
+    def get_string(self, string_offset, terminator='\x00'):
+        value = self.strings.get((string_offset, terminator))
+        if value is None:
+            end = self.strings_block.find(terminator.encode('latin-1'), string_offset)
+            value = self.strings_block[string_offset:end if end != -1 else None].decode('latin-1')
+            self.strings[(string_offset, terminator)] = value
         return value
 
-    def _read_string(self, terminator='\x00'):
-        tmp_string = ''
-        tmp_char = chr(unpack('<B', self.reader.read(1))[0])
-        while tmp_char != terminator:
-            tmp_string += tmp_char
-            tmp_char = chr(unpack('<B', self.reader.read(1))[0])
+    # Columnar access, field values of every record without building any record object.
+
+    def get_column(self, field):
+        return self.int_fields[field::self.stride]
+
+    def get_float_column(self, field):
+        return self.float_fields[field::self.stride]
+
+    def get_string_column(self, field):
+        return [self.get_string(offset) for offset in self.get_column(field)]
+
+    def get_record(self, index):
+        return DbcRecord(self, index * self.stride)
+
+
+# Lightweight view over a single record.
+class DbcRecord:
+    __slots__ = ('reader', 'offset')
+
+    def __init__(self, reader, offset):
+        self.reader = reader
+        self.offset = offset
+
+    def get_int32(self, field):
+        return self.reader.int_fields[self.offset + field]
+
+    def get_float(self, field):
+        return self.reader.float_fields[self.offset + field]
 
-        return tmp_string
+    def get_string(self, field):
+        return self.reader.get_string(self.reader.int_fields[self.offset + field])
@@ -1,4 +1,3 @@
-from struct import pack
 from dataclasses import dataclass
 from tools.extractors.pydbclib.helpers.VanillaAreaHelper import VanillaAreaHelper
 
@@ -26,10 +25,6 @@ class AreaTable:
     area_level: int
     has_exploration: bool
 
-    def write_to_file(self, file_writer):
-        data = pack('<2i2BH', self.id, self.area_number, self.area_flags, self.area_level, self.explore_bit)
-        file_writer.write(data)
-
     @staticmethod
     def from_bytes(dbc_reader):
         _id: int = dbc_reader.read_int32()
@@ -1,6 +1,8 @@
 import os
+import sys
+from array import array
 from io import BytesIO
-from struct import unpack
+from struct import iter_unpack
 from utils.Logger import Logger
 from tools.extractors.pympqlib.MpqHash import MpqHash
 from tools.extractors.pympqlib.MpqEntry import MpqEntry
@@ -8,16 +10,24 @@ from tools.extractors.pympqlib.MpqHeader import MpqHeader
 from tools.extractors.pympqlib.MpqReader import MpqReader
 
 
+# Hash table entries never used, which end the probing of a filename.
+HASH_ENTRY_EMPTY = 0xFFFFFFFF
+# Hash table entries of deleted files, probing goes on past them.
+HASH_ENTRY_DELETED = 0xFFFFFFFE
+
+
 class MpqArchive:
     def __init__(self, filename):
         self.filename = filename
         self.name = os.path.basename(filename).capitalize()
-        self.storm_buffer = list()
+        self.storm_buffer = array('I')
         self.header = None
         self.block_size = 0
         self.stream = None
         self.mpq_hashes = []
         self.mpq_entries = []
+        # Entries by lowercase filename, first entry wins on duplicated names.
+        self.entries_by_name = {}
 
     def __enter__(self):
         self.initialize()
@@ -31,6 +41,7 @@ class MpqArchive:
             self.storm_buffer.clear()
         self.mpq_entries.clear()
         self.mpq_hashes.clear()
+        self.entries_by_name.clear()
 
     def initialize(self):
         if not os.path.exists(self.filename):
@@ -48,6 +59,9 @@ class MpqArchive:
         decrypted_data = self.decrypt_block_from_bytes(entries_data, self.hash_string('(block table)', 0x300))
         self.build_mpq_entries(decrypted_data)
         self.add_list_filenames()
+        for mpq_entry in self.mpq_entries:
+            if mpq_entry.filename:
+                self.entries_by_name.setdefault(mpq_entry.filename.lower(), mpq_entry)
 
     def add_list_filenames(self):
         hash_entry = self._add_filename('(listfile)')
@@ -87,11 +101,7 @@ class MpqArchive:
         return True
 
     def find_file(self, name):
-        for entry in self.mpq_entries:
-            if entry.filename.lower() != name.lower():
-                continue
-            return entry
-        return None
+        return self.entries_by_name.get(name.lower(), None)
 
     def read_file_bytes(self, mpq_entry=None):
         mpq_entry = mpq_entry if mpq_entry else max(self.mpq_entries, key=lambda x: x.file_size)
@@ -109,21 +119,26 @@ class MpqArchive:
         self.mpq_entries[hash_entry.block_index].set_filename(filename)
         return hash_entry
 
+    # Open addressing, probe from the filename hash index until its entry or an empty one is found.
     def _try_get_hash_entry(self, filename):
-        index = self.hash_string(filename, 0)
-        index &= self.header.hash_table_size - 1
+        if not filename or not self.mpq_hashes:
+            return None
+
+        mask = len(self.mpq_hashes) - 1
+        start_index = self.hash_string(filename, 0) & mask
         name1 = self.hash_string(filename, 0x100)
         name2 = self.hash_string(filename, 0x200)
 
-        for i in range(len(self.mpq_hashes)):
-            if self.mpq_hashes[i].name_1 == name1 and self.mpq_hashes[i].name_2 == name2:
-                return self.mpq_hashes[i]
-
-        for i in range(index):
-            if self.mpq_hashes[i].name_1 == name1 and self.mpq_hashes[i].name_2 == name2:
-                return self.mpq_hashes[i]
-
-        return None
+        index = start_index
+        while True:
+            mpq_hash = self.mpq_hashes[index]
+            if mpq_hash.block_index == HASH_ENTRY_EMPTY:
+                return None
+            if mpq_hash.name_1 == name1 and mpq_hash.name_2 == name2 and mpq_hash.block_index != HASH_ENTRY_DELETED:
+                return mpq_hash
+            index = (index + 1) & mask
+            if index == start_index:
+                return None
 
     def detect_file_seed(self, value0, value1, decrypted):
         temp = ((value0 ^ decrypted) - 0xeeeeeeee) & 0xffffffff
@@ -147,9 +162,8 @@ class MpqArchive:
         return 0
 
     def build_mpq_hashes(self, data):
-        with BytesIO(data) as stream:
-            for i in range(0, self.header.hash_table_size):
-                self.mpq_hashes.append(MpqHash.from_data(stream))
+        hash_data = data[:self.header.hash_table_size * MpqHash.SIZE]
+        self.mpq_hashes = [MpqHash.from_values(*values) for values in iter_unpack('<4I', hash_data)]
 
     def build_mpq_entries(self, data):
         with BytesIO(data) as stream:
@@ -160,50 +174,49 @@ class MpqArchive:
 
     def build_storm_buffer(self):
         seed = 0x100001
-        result = [0 for _ in range(0x500)]
+        result = array('I', bytes(0x500 * 4))
         for index1 in range(0, 0x100):
             index2 = index1
             for i in range(0, 5):
-                seed = divmod(seed * 125 + 3, 0x2aaaab)[1]
+                seed = (seed * 125 + 3) % 0x2aaaab
                 temp = (seed & 0xffff) << 16
-                seed = divmod(seed * 125 + 3, 0x2aaaab)[1]
+                seed = (seed * 125 + 3) % 0x2aaaab
                 result[index2] = temp | (seed & 0xffff)
                 index2 += 0x100
         self.storm_buffer = result
 
     def hash_string(self, text, offset):
+        storm_buffer = self.storm_buffer
         seed1 = 0x7fed7fed
         seed2 = 0xeeeeeeee
 
-        for c in text:
-            val = ord(c.upper())
-            seed1 = self.storm_buffer[offset + val] ^ (seed1 + seed2) & 0xffffffff
+        for val in text.upper().encode('latin-1', errors='replace'):
+            seed1 = storm_buffer[offset + val] ^ (seed1 + seed2) & 0xffffffff
             seed2 = (val + seed1 + seed2 + (seed2 << 5) + 3) & 0xffffffff
         return seed1
 
+    # Decrypts the given list of uint32 in place. Each value depends on the previous one, so this can't be vectorized,
+    # storm buffer and seeds are kept in locals to keep the loop as tight as possible.
     def decrypt_block_from_list(self, data, seed_1):
+        storm_buffer = self.storm_buffer
         seed_2 = 0xeeeeeeee
         for i in range(0, len(data)):
-            seed_2 += self.storm_buffer[(0x400 + (seed_1 & 0xff))] & 0xffffffff
-            result = data[i]
-            result ^= (seed_1 + seed_2) & 0xffffffff
+            seed_2 = (seed_2 + storm_buffer[0x400 + (seed_1 & 0xff)]) & 0xffffffff
+            result = data[i] ^ ((seed_1 + seed_2) & 0xffffffff)
             seed_1 = (((~seed_1 << 21) + 0x11111111) | (seed_1 >> 11)) & 0xffffffff
             seed_2 = (result + seed_2 + (seed_2 << 5) + 3) & 0xffffffff
             data[i] = result
         return data
 
+    # Decrypts whole little endian uint32 words, trailing bytes are left untouched.
     def decrypt_block_from_bytes(self, data, seed_1):
-        seed_2 = 0xeeeeeeee
-        data: bytearray = bytearray(data)
-        for i in range(0, len(data) - 3, 4):
-            seed_2 = self.storm_buffer[(0x400 + (seed_1 & 0xff))] + seed_2 & 0xffffffff
-            result = unpack('<I', data[i:i + 4])[0]
-            result ^= (seed_1 + seed_2) & 0xffffffff
-            seed_1 = (((~seed_1 << 21) + 0x11111111) | (seed_1 >> 11)) & 0xffffffff
-            seed_2 = (result + seed_2 + (seed_2 << 5) + 3) & 0xffffffff
+        words_size = len(data) & ~3
+        words = array('I', data[:words_size])
+        if sys.byteorder == 'big':
+            words.byteswap()
+
+        self.decrypt_block_from_list(words, seed_1)
 
-            data[i + 0] = result & 0xff
-            data[i + 1] = (result >> 8) & 0xff
-            data[i + 2] = (result >> 16) & 0xff
-            data[i + 3] = (result >> 24) & 0xff
-        return bytes(data)
+        if sys.byteorder == 'big':
+            words.byteswap()
+        return words.tobytes() + bytes(data[words_size:])
@@ -50,10 +50,8 @@ class MpqEntry:
 
     def fill_block_information(self):
         block_pos_count = int(((self.file_size + self.mpq_archive.block_size - 1) / self.mpq_archive.block_size) + 1)
-        self.block_positions = [0 for x in range(block_pos_count)]
         self.mpq_archive.stream.seek(self.file_pos)
-        for j in range(block_pos_count):
-            self.block_positions[j] = unpack('<I', self.mpq_archive.stream.read(4))[0]
+        self.block_positions = list(unpack(f'<{block_pos_count}I', self.mpq_archive.stream.read(block_pos_count * 4)))
         self.block_position_size = int(block_pos_count) * 4
 
     @staticmethod
@@ -19,3 +19,12 @@ class MpqHash:
         mpq_hash.locale = unpack('<I', stream.read(4))[0]
         mpq_hash.block_index = unpack('<I', stream.read(4))[0]
         return mpq_hash
+
+    @staticmethod
+    def from_values(name_1, name_2, locale, block_index):
+        mpq_hash = MpqHash()
+        mpq_hash.name_1 = name_1
+        mpq_hash.name_2 = name_2
+        mpq_hash.locale = locale
+        mpq_hash.block_index = block_index
+        return mpq_hash
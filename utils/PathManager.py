@@ -28,6 +28,10 @@ class PathManager:
     # Mdx.
     MDX_RELATIVE_PATH = 'etc/mdx/'
 
+    # World data snapshot.
+    CACHE_RELATIVE_PATH = 'etc/cache/'
+    WORLD_SNAPSHOT_FILE_NAME = 'world_snapshot.bin'
+
     @staticmethod
     def set_root_path(root_path):
         PathManager.ROOT_PATH = root_path
@@ -64,6 +68,10 @@ class PathManager:
     def get_mdx_path():
         return path.join(PathManager.ROOT_PATH, PathManager.MDX_RELATIVE_PATH)
 
+    @staticmethod
+    def get_world_snapshot_path():
+        return path.join(PathManager.ROOT_PATH, PathManager.CACHE_RELATIVE_PATH, PathManager.WORLD_SNAPSHOT_FILE_NAME)
+
     @staticmethod
     def get_git_path():
         return path.join(PathManager.ROOT_PATH, PathManager.GIT_RELATIVE_PATH)